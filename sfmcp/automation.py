@@ -0,0 +1,115 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from .flow_model import RECORD_OPERATIONS, parse_flow
+
+# (SObject, field or None for the object itself, operation)
+Dependency = Tuple[str, str | None, str]
+
+
+def flow_dependencies(flow_content: str) -> Tuple[Dict[str, Any], List[Dependency]]:
+    """Parse flow XML into its model and the SObjects/fields it touches, per operation
+
+    Record elements give (object, field, create/read/update/delete), including those
+    working on $Record or a record variable; the triggering object gives "trigger" for
+    its entry filters and every $Record field the flow uses.
+    """
+    model = parse_flow(flow_content, element_types=RECORD_OPERATIONS)
+    found: Set[Dependency] = set()
+    for element in model["elements"]:
+        object_name = element.get("object")
+        if not object_name:
+            continue  # a record variable whose object could not be resolved
+        found.add((object_name, None, element["operation"]))
+        found.update((object_name, f, element["operation"]) for f in element.get("fields", []))
+    trigger_object = model["start"].get("object")
+    if trigger_object:
+        found.add((trigger_object, None, "trigger"))
+        found.update((trigger_object, f, "trigger") for f in model["start"].get("fields", []))
+    return model, sorted(found, key=lambda d: (d[0], d[1] or "", d[2]))
+
+
+@dataclass
+class IndexedFlow:
+    developer_name: str
+    version_id: str
+    dependencies: List[Dependency]
+    label: str | None = None
+    process_type: str | None = None
+    trigger_type: str | None = None
+    is_active: bool = False
+
+
+@dataclass
+class AutomationMatch:
+    flow: IndexedFlow
+    operations: Set[str] = field(default_factory=set)
+    fields: Set[str] = field(default_factory=set)
+
+
+class AutomationIndex:
+    """Reverse index from SObjects and fields to the flows that touch them
+
+    Each flow is indexed at a version id; a flow whose latest version changed is
+    re-indexed and the rest are kept. Lookups are case-insensitive dictionary reads.
+    """
+
+    def __init__(self) -> None:
+        self._flows: Dict[str, IndexedFlow] = {}
+        # object (lower) -> flow developer names
+        self._by_object: Dict[str, Set[str]] = {}
+        # flows that could not be indexed at the last refresh, with the reason
+        self.errors: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._flows)
+
+    def versions(self) -> Dict[str, str]:
+        return {name: flow.version_id for name, flow in self._flows.items()}
+
+    def get(self, developer_name: str) -> IndexedFlow | None:
+        return self._flows.get(developer_name)
+
+    def put(self, flow: IndexedFlow) -> None:
+        self.remove(flow.developer_name)
+        self._flows[flow.developer_name] = flow
+        for object_name, _, _ in flow.dependencies:
+            self._by_object.setdefault(object_name.lower(), set()).add(flow.developer_name)
+
+    def remove(self, developer_name: str) -> None:
+        flow = self._flows.pop(developer_name, None)
+        if flow is None:
+            return
+        for object_name, _, _ in flow.dependencies:
+            names = self._by_object.get(object_name.lower())
+            if names is not None:
+                names.discard(developer_name)
+                if not names:
+                    del self._by_object[object_name.lower()]
+
+    def find(
+        self,
+        object_name: str,
+        field_name: str | None = None,
+        operations: Iterable[str] | None = None,
+    ) -> List[AutomationMatch]:
+        """Flows touching an object, or one of its fields, with the given operations"""
+        wanted_field = field_name.lower() if field_name else None
+        wanted_operations = set(operations) if operations else None
+        matches = []
+        for name in sorted(self._by_object.get(object_name.lower(), ())):
+            flow = self._flows[name]
+            match = AutomationMatch(flow)
+            for dep_object, dep_field, operation in flow.dependencies:
+                if dep_object.lower() != object_name.lower():
+                    continue
+                if wanted_operations is not None and operation not in wanted_operations:
+                    continue
+                if wanted_field is not None and (dep_field or "").lower() != wanted_field:
+                    continue
+                match.operations.add(operation)
+                if dep_field:
+                    match.fields.add(dep_field)
+            if match.operations:
+                matches.append(match)
+        return matches
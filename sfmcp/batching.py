@@ -0,0 +1,161 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set, Tuple
+from .transport import Transport
+
+logger = logging.getLogger("sfmcp.batching")
+
+
+@dataclass
+class _PendingDescribe:
+    name: str
+    if_modified_since: str | None
+    future: asyncio.Future[Dict[str, Any] | None]
+    enqueued_at: float
+    # Callers awaiting the describe; once sent, the dispatch task and its whole batch
+    waiters: int = 0
+    dispatch: asyncio.Task[None] | None = None
+    batch: List[_PendingDescribe] = field(default_factory=list)
+
+
+class DescribeBatcher:
+    """Micro-batching dispatcher for SObject describes
+
+    Describes requested within `window` seconds of each other are sent together through
+    Transport.describe_sobjects: one Composite request per 25 objects on the REST
+    transport, bounded-parallel `sf` calls on the CLI. A batch is sent early once it
+    holds `max_batch` requests. Each caller gets its own result (or exception) back.
+
+    A cancelled caller stops waiting without failing the callers it shares a describe
+    or a batch with. Once every caller of a batch has gone, the dispatch is cancelled
+    too, so its `sf` processes are killed and its request dropped; a describe whose
+    callers all went before it was sent is taken out of the batch.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        *,
+        window: float = 0.005,
+        max_batch: int = 25,
+        concurrency: int = 4,
+    ):
+        self.transport = transport
+        self.window = window
+        self.max_batch = max_batch
+        self.concurrency = concurrency
+        self._pending: Dict[Tuple[str, str | None], _PendingDescribe] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._dispatching: Set[asyncio.Task[None]] = set()
+        self.requests = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self._latency_total = 0.0
+        self._latency_count = 0
+
+    async def describe(
+        self, object_name: str, *, if_modified_since: str | None = None
+    ) -> Dict[str, Any] | None:
+        self.requests += 1
+        key = (object_name.lower(), if_modified_since)
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.deduplicated += 1
+        else:
+            loop = asyncio.get_running_loop()
+            pending = _PendingDescribe(
+                name=object_name,
+                if_modified_since=if_modified_since,
+                future=loop.create_future(),
+                enqueued_at=time.monotonic(),
+            )
+            # Retrieve the outcome even when every caller has gone, so a failed batch
+            # does not log "exception was never retrieved"
+            pending.future.add_done_callback(_consume)
+            self._pending[key] = pending
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+        # The future is shared by every deduplicated caller, so none of them (the first
+        # one included) may cancel it by being cancelled itself
+        pending.waiters += 1
+        try:
+            return await asyncio.shield(pending.future)
+        finally:
+            pending.waiters -= 1
+            if pending.waiters == 0 and not pending.future.done():
+                self._abandon(key, pending)
+
+    def _abandon(self, key: Tuple[str, str | None], pending: _PendingDescribe) -> None:
+        """Give up a describe whose callers were all cancelled"""
+        if pending.dispatch is None:
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+            pending.future.cancel()
+        elif all(p.waiters == 0 for p in pending.batch):
+            logger.debug(f"Cancelling a batch of {len(pending.batch)} describes: no callers left")
+            pending.dispatch.cancel()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = list(self._pending.values())
+        self._pending.clear()
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            for pending in batch:
+                pending.dispatch = task
+                pending.batch = batch
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, batch: List[_PendingDescribe]) -> None:
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        logger.debug(f"Dispatching a batch of {len(batch)} describes")
+        try:
+            results = await self.transport.describe_sobjects(
+                [(p.name, p.if_modified_since) for p in batch], concurrency=self.concurrency
+            )
+            if len(results) != len(batch):
+                raise Exception(f"Got {len(results)} results for {len(batch)} describes")
+        except asyncio.CancelledError:
+            for pending in batch:
+                pending.future.cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(batch)
+
+        finished = time.monotonic()
+        for pending, result in zip(batch, results, strict=True):
+            self._latency_total += finished - pending.enqueued_at
+            self._latency_count += 1
+            if isinstance(result, BaseException):
+                pending.future.set_exception(result)
+            else:
+                pending.future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "deduplicated": self.deduplicated,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "mean_batch_size": round(self._latency_count / self.batches, 2) if self.batches else 0,
+            "mean_latency_ms": (
+                round(1000 * self._latency_total / self._latency_count, 2)
+                if self._latency_count
+                else 0
+            ),
+        }
+
+
+def _consume(future: asyncio.Future[Dict[str, Any] | None]) -> None:
+    if not future.cancelled():
+        future.exception()
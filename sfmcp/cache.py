@@ -0,0 +1,370 @@
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Protocol, Tuple, TypeVar
+from .soql import from_object, normalize
+
+logger = logging.getLogger("sfmcp.cache")
+
+V = TypeVar("V")
+
+
+def json_size(value: Any) -> int:
+    """Approximate the memory cost of a JSON-like value by its serialized length"""
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+@dataclass
+class CacheEntry(Generic[V]):
+    value: V
+    size: int
+    stored_at: float = field(default_factory=time.monotonic)
+    fetched_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class ByteLRU(Generic[V]):
+    """LRU mapping bounded by the total byte size of its entries rather than their count"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, CacheEntry[V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> CacheEntry[V] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def put(self, key: Hashable, value: V, size: int) -> CacheEntry[V] | None:
+        """Store a value, evicting least recently used entries to stay under budget"""
+        self.pop(key)
+        if size > self.max_bytes:
+            return None
+        entry = CacheEntry(value=value, size=size)
+        self._entries[key] = entry
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+            self.evictions += 1
+        return entry
+
+    def touch(self, key: Hashable) -> None:
+        """Mark an entry as freshly validated without replacing its value"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.stored_at = time.monotonic()
+            entry.fetched_at = datetime.now(timezone.utc)
+            self._entries.move_to_end(key)
+
+    def pop(self, key: Hashable) -> CacheEntry[V] | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+        return entry
+
+    def keys(self) -> List[Hashable]:
+        return list(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Loader for a describe: receives an If-Modified-Since value (or None) and returns the
+# describe payload, or None when Salesforce reports that it has not changed
+DescribeLoader = Callable[[str | None], Awaitable[Dict[str, Any] | None]]
+
+
+class DescribeStore(Protocol):
+    """Persistent tier behind the in-memory describe cache (see catalog.SchemaCatalog)"""
+
+    def load_describe(
+        self, org_alias: str, object_name: str
+    ) -> Tuple[Dict[str, Any], datetime] | None: ...
+
+    def save_describe(
+        self, org_alias: str, object_name: str, describe: Dict[str, Any]
+    ) -> None: ...
+
+    def touch_describe(self, org_alias: str, object_name: str) -> None: ...
+
+
+class DescribeCache:
+    """TTL + byte-bounded LRU cache of SObject describes with stale-while-revalidate
+
+    Entries younger than `ttl` are served directly. Up to `stale_ttl` seconds past that
+    they are still served, while a background conditional fetch (If-Modified-Since)
+    revalidates them. Older entries are revalidated before being returned.
+
+    With a `store`, misses are first restored from it and served as stale, so a freshly
+    started process answers from disk while the describe is revalidated behind it.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        stale_ttl: float,
+        max_bytes: int,
+        store: DescribeStore | None = None,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.store = store
+        self._lru: ByteLRU[Dict[str, Any]] = ByteLRU(max_bytes)
+        self._revalidating: Dict[Hashable, asyncio.Task[None]] = {}
+        self.restored = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def key(org_alias: str, object_name: str) -> tuple[str, str]:
+        # SObject API names are case-insensitive
+        return (org_alias, object_name.lower())
+
+    async def get_or_load(
+        self, org_alias: str, object_name: str, loader: DescribeLoader
+    ) -> Dict[str, Any]:
+        key = self.key(org_alias, object_name)
+        entry = self._lru.get(key)
+        if entry is None and self.ttl > 0 and self.store is not None:
+            entry = await self._restore(org_alias, object_name)
+        if entry is not None and self.ttl > 0:
+            if entry.age < self.ttl:
+                self.hits += 1
+                return entry.value
+            if entry.age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._revalidate_in_background(org_alias, object_name, loader)
+                return entry.value
+
+        self.misses += 1
+        return await self.revalidate(org_alias, object_name, loader)
+
+    async def _restore(
+        self, org_alias: str, object_name: str
+    ) -> CacheEntry[Dict[str, Any]] | None:
+        if self.store is None:
+            return None
+        # The store (SQLite + zlib) is blocking, so it is read off the event loop
+        stored = await asyncio.to_thread(self.store.load_describe, org_alias, object_name)
+        if stored is None:
+            return None
+        describe, fetched_at = stored
+        entry = self._lru.put(self.key(org_alias, object_name), describe, json_size(describe))
+        if entry is not None:
+            # Restored entries are always treated as stale so they get revalidated
+            entry.stored_at = time.monotonic() - self.ttl
+            entry.fetched_at = fetched_at
+            self.restored += 1
+        return entry
+
+    def _revalidate_in_background(
+        self, org_alias: str, object_name: str, loader: DescribeLoader
+    ) -> None:
+        key = self.key(org_alias, object_name)
+        if key in self._revalidating:
+            return
+
+        async def revalidate() -> None:
+            try:
+                await self.revalidate(org_alias, object_name, loader)
+            except Exception as e:
+                logger.warning(f"Background describe revalidation failed for {key}: {e}")
+            finally:
+                self._revalidating.pop(key, None)
+
+        self._revalidating[key] = asyncio.create_task(revalidate())
+
+    async def revalidate(
+        self, org_alias: str, object_name: str, loader: DescribeLoader
+    ) -> Dict[str, Any]:
+        """Fetch a describe, conditionally when a cached copy exists, and store the result"""
+        key = self.key(org_alias, object_name)
+        entry = self._lru.get(key)
+        if entry is None and self.ttl > 0 and self.store is not None:
+            entry = await self._restore(org_alias, object_name)
+        if entry is not None:
+            self.revalidations += 1
+            describe = await loader(format_datetime(entry.fetched_at, usegmt=True))
+            if describe is None:
+                self.not_modified += 1
+                self._lru.touch(key)
+                if self.store is not None:
+                    await asyncio.to_thread(self.store.touch_describe, org_alias, object_name)
+                return entry.value
+        else:
+            describe = await loader(None)
+            if describe is None:
+                raise Exception("Salesforce returned no describe for an uncached object")
+
+        if self.ttl > 0:
+            self._lru.put(key, describe, json_size(describe))
+            if self.store is not None:
+                await asyncio.to_thread(
+                    self.store.save_describe, org_alias, object_name, describe
+                )
+        return describe
+
+    def invalidate(self, org_alias: str, object_name: str) -> None:
+        self._lru.pop(self.key(org_alias, object_name))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._lru),
+            "restored": self.restored,
+            "bytes": self._lru.total_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "evictions": self._lru.evictions,
+        }
+
+
+# Returns a token that changes whenever rows of an SObject change, or None when the
+# object cannot be probed (in which case its queries are not cached)
+ChangeProbe = Callable[[str], Awaitable[str | None]]
+
+
+class QueryCache:
+    """Byte-bounded cache of query results keyed by org and normalized SOQL
+
+    Entries live for a per-SObject TTL (falling back to `default_ttl`). A cached result
+    is only served if a cheap change probe on the query's FROM object (row count and
+    MAX(SystemModstamp)) returns the same token it did when the result was fetched; a
+    changed token drops every cached query on that object. Probe results are reused for
+    `probe_interval` seconds, so bursts of repeated queries cost a single probe.
+
+    Only the FROM object is tracked: changes to related or child objects reached through
+    relationship fields or subqueries are bounded by the TTL alone.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_ttl: float,
+        max_bytes: int,
+        object_ttls: Dict[str, float] | None = None,
+        probe_interval: float = 15.0,
+    ):
+        self.default_ttl = default_ttl
+        self.object_ttls = {name.lower(): ttl for name, ttl in (object_ttls or {}).items()}
+        self.probe_interval = probe_interval
+        self._lru: ByteLRU[Tuple[List[Dict[str, Any]], str]] = ByteLRU(max_bytes)
+        self._tokens: Dict[Tuple[str, str], Tuple[str | None, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.probes = 0
+        self.invalidations = 0
+        self.uncacheable = 0
+
+    def ttl_for(self, object_name: str) -> float:
+        return self.object_ttls.get(object_name.lower(), self.default_ttl)
+
+    async def get_or_run(
+        self,
+        org_alias: str,
+        soql: str,
+        run: Callable[[], Awaitable[List[Dict[str, Any]]]],
+        probe: ChangeProbe,
+    ) -> List[Dict[str, Any]]:
+        object_name = from_object(soql)
+        if object_name is None or self.ttl_for(object_name) <= 0:
+            self.uncacheable += 1
+            return await run()
+
+        key = (org_alias, object_name.lower(), normalize(soql))
+        entry = self._lru.get(key)
+        if entry is not None and entry.age >= self.ttl_for(object_name):
+            self._lru.pop(key)
+            entry = None
+        token = await self._token(org_alias, object_name, probe)
+        if entry is not None:
+            records, cached_token = entry.value
+            if token is not None and token == cached_token:
+                self.hits += 1
+                return list(records)
+            self.invalidate_object(org_alias, object_name)
+
+        self.misses += 1
+        # The token is taken before the query runs, so a change racing the query makes
+        # the next probe differ and the result is refetched rather than served stale
+        records = await run()
+        if token is None:
+            self.uncacheable += 1
+        else:
+            self._lru.put(key, (records, token), json_size(records))
+        return list(records)
+
+    async def _token(self, org_alias: str, object_name: str, probe: ChangeProbe) -> str | None:
+        key = (org_alias, object_name.lower())
+        cached = self._tokens.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.probe_interval:
+            return cached[0]
+        self.probes += 1
+        token = await probe(object_name)
+        self._tokens[key] = (token, time.monotonic())
+        return token
+
+    def invalidate_object(self, org_alias: str, object_name: str) -> None:
+        """Drop every cached query on an SObject"""
+        self.invalidations += 1
+        self._tokens.pop((org_alias, object_name.lower()), None)
+        prefix = (org_alias, object_name.lower())
+        for key in self._lru.keys():
+            if isinstance(key, tuple) and key[:2] == prefix:
+                self._lru.pop(key)
+
+    def clear(self) -> None:
+        self._lru.clear()
+        self._tokens.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._lru),
+            "bytes": self._lru.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "probes": self.probes,
+            "invalidations": self.invalidations,
+            "uncacheable": self.uncacheable,
+            "evictions": self._lru.evictions,
+        }
@@ -0,0 +1,424 @@
+from __future__ import annotations
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+from .automation import IndexedFlow
+from .config.settings import settings
+
+logger = logging.getLogger("sfmcp.catalog")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sobject_lists (
+    org TEXT PRIMARY KEY,
+    names TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS describes (
+    org TEXT NOT NULL,
+    sobject TEXT NOT NULL,
+    name TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (org, sobject)
+);
+CREATE TABLE IF NOT EXISTS fields (
+    org TEXT NOT NULL,
+    sobject TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT,
+    label TEXT,
+    nillable INTEGER,
+    PRIMARY KEY (org, sobject, name)
+);
+CREATE TABLE IF NOT EXISTS picklist_values (
+    org TEXT NOT NULL,
+    sobject TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    label TEXT,
+    active INTEGER,
+    PRIMARY KEY (org, sobject, field, value)
+);
+CREATE TABLE IF NOT EXISTS relationships (
+    org TEXT NOT NULL,
+    sobject TEXT NOT NULL,
+    field TEXT NOT NULL,
+    relationship_name TEXT,
+    reference_to TEXT NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS relationships_by_object ON relationships (org, sobject);
+CREATE TABLE IF NOT EXISTS flows (
+    org TEXT NOT NULL,
+    definition_id TEXT NOT NULL,
+    developer_name TEXT,
+    id TEXT NOT NULL,
+    master_label TEXT,
+    status TEXT,
+    version_number INTEGER,
+    active_version_id TEXT,
+    latest_version_id TEXT,
+    PRIMARY KEY (org, definition_id)
+);
+CREATE TABLE IF NOT EXISTS flow_metadata (
+    org TEXT NOT NULL,
+    version_id TEXT NOT NULL,
+    developer_name TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (org, version_id)
+);
+CREATE TABLE IF NOT EXISTS flow_syncs (
+    org TEXT PRIMARY KEY,
+    high_water TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS flow_index (
+    org TEXT NOT NULL,
+    developer_name TEXT NOT NULL,
+    version_id TEXT NOT NULL,
+    label TEXT,
+    process_type TEXT,
+    trigger_type TEXT,
+    PRIMARY KEY (org, developer_name)
+);
+CREATE TABLE IF NOT EXISTS flow_dependencies (
+    org TEXT NOT NULL,
+    developer_name TEXT NOT NULL,
+    sobject TEXT NOT NULL,
+    field TEXT,
+    operation TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flow_dependencies_by_flow ON flow_dependencies (org, developer_name);
+"""
+
+# Bumped whenever flow dependencies are derived differently: stored flow indexes of an
+# older version are dropped, so every flow is re-indexed (kept in PRAGMA user_version)
+_FLOW_INDEX_VERSION = 2
+
+# Columns of the flows table and the keys of the flow dicts returned by list_flows
+_FLOW_COLUMNS = {
+    "definition_id": "definitionId",
+    "developer_name": "developerName",
+    "id": "id",
+    "master_label": "masterLabel",
+    "status": "status",
+    "version_number": "versionNumber",
+    "active_version_id": "activeVersionId",
+    "latest_version_id": "latestVersionId",
+}
+
+
+class SchemaCatalog:
+    """Persistent SQLite catalog of org schema: object lists, SObject describes and flows
+
+    Describes are stored whole (zlib-compressed JSON) so they can be served without a
+    round trip, and are also broken out into fields, picklist values and relationships
+    tables for lookups that should not decode a full describe. Flows are stored as the
+    latest version of each flow definition, with the LastModifiedDate high-water mark of
+    the last sync so the next one only has to fetch what changed since. Retrieved flow
+    XML is kept per flow version id, since a version's metadata never changes, and so
+    are the SObject/field dependencies of the indexed version of each flow.
+
+    Every method blocks on SQLite (and zlib), so async callers run them through
+    asyncio.to_thread; the lock serializes those threads on the one connection.
+    """
+
+    def __init__(self, path: str | Path):
+        # ":memory:" is accepted for tests; sqlite keeps that database in memory
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        (index_version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if index_version < _FLOW_INDEX_VERSION:
+            with self._conn:
+                self._conn.execute("DELETE FROM flow_index")
+                self._conn.execute("DELETE FROM flow_dependencies")
+            self._conn.execute(f"PRAGMA user_version = {_FLOW_INDEX_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def list_objects(self, org_alias: str) -> Tuple[List[str], float] | None:
+        """Return the stored object names of an org and when they were fetched"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT names, fetched_at FROM sobject_lists WHERE org = ?", (org_alias,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def save_objects(self, org_alias: str, names: List[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sobject_lists (org, names, fetched_at) VALUES (?, ?, ?)",
+                (org_alias, json.dumps(names), time.time()),
+            )
+
+    def load_describe(
+        self, org_alias: str, object_name: str
+    ) -> Tuple[Dict[str, Any], datetime] | None:
+        """Return a stored describe and the time it was fetched from Salesforce"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM describes WHERE org = ? AND sobject = ?",
+                (org_alias, object_name.lower()),
+            ).fetchone()
+        if row is None:
+            return None
+        describe = json.loads(zlib.decompress(row[0]))
+        return describe, datetime.fromtimestamp(row[1], timezone.utc)
+
+    def save_describe(self, org_alias: str, object_name: str, describe: Dict[str, Any]) -> None:
+        sobject = object_name.lower()
+        payload = zlib.compress(json.dumps(describe, separators=(",", ":")).encode())
+        fields = describe.get("fields", [])
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO describes (org, sobject, name, payload, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (org_alias, sobject, describe.get("name", object_name), payload, time.time()),
+            )
+            for table in ("fields", "picklist_values", "relationships"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE org = ? AND sobject = ?", (org_alias, sobject)
+                )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fields (org, sobject, name, type, label, nillable) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (org_alias, sobject, f.get("name"), f.get("type"), f.get("label"),
+                     f.get("nillable"))
+                    for f in fields
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO picklist_values "
+                "(org, sobject, field, value, label, active) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (org_alias, sobject, f.get("name"), pv.get("value"), pv.get("label"),
+                     pv.get("active"))
+                    for f in fields
+                    for pv in f.get("picklistValues") or []
+                    if pv.get("value") is not None
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO relationships "
+                "(org, sobject, field, relationship_name, reference_to, kind) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                _relationship_rows(org_alias, sobject, describe),
+            )
+
+    def touch_describe(self, org_alias: str, object_name: str) -> None:
+        """Record that a stored describe was revalidated without changes"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE describes SET fetched_at = ? WHERE org = ? AND sobject = ?",
+                (time.time(), org_alias, object_name.lower()),
+            )
+
+    def describe_names(self, org_alias: str, *, older_than: float | None = None) -> List[str]:
+        """Names of stored describes, optionally only those fetched before `older_than`"""
+        query = "SELECT name FROM describes WHERE org = ?"
+        params: Tuple[Any, ...] = (org_alias,)
+        if older_than is not None:
+            query += " AND fetched_at < ?"
+            params += (older_than,)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, params)]
+
+    def flow_sync(self, org_alias: str) -> Tuple[str | None, float] | None:
+        """Return the LastModifiedDate high-water mark and time of an org's last flow sync"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water, synced_at FROM flow_syncs WHERE org = ?", (org_alias,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def load_flows(self, org_alias: str) -> List[Dict[str, Any]]:
+        columns = ", ".join(_FLOW_COLUMNS)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM flows WHERE org = ?", (org_alias,)
+            ).fetchall()
+        flows = []
+        for row in rows:
+            flow = dict(zip(_FLOW_COLUMNS.values(), row, strict=True))
+            flow["isActive"] = flow["latestVersionId"] == flow["activeVersionId"]
+            flows.append(flow)
+        return flows
+
+    def save_flows(
+        self,
+        org_alias: str,
+        flows: Iterable[Dict[str, Any]],
+        *,
+        high_water: str | None,
+        keep: Iterable[str] | None = None,
+        replace: bool = False,
+    ) -> None:
+        """Upsert flows and record a sync
+
+        With `replace` every stored flow of the org is dropped first; with `keep` only
+        flow definitions whose ids are in it are kept (the rest were deleted in the org).
+        """
+        columns = ", ".join(_FLOW_COLUMNS)
+        placeholders = ", ".join("?" for _ in _FLOW_COLUMNS)
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM flows WHERE org = ?", (org_alias,))
+            elif keep is not None:
+                kept = set(keep)
+                stored = self._conn.execute(
+                    "SELECT definition_id FROM flows WHERE org = ?", (org_alias,)
+                ).fetchall()
+                self._conn.executemany(
+                    "DELETE FROM flows WHERE org = ? AND definition_id = ?",
+                    ((org_alias, row[0]) for row in stored if row[0] not in kept),
+                )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO flows (org, {columns}) VALUES (?, {placeholders})",
+                ((org_alias, *(flow.get(key) for key in _FLOW_COLUMNS.values())) for flow in flows),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO flow_syncs (org, high_water, synced_at) VALUES (?, ?, ?)",
+                (org_alias, high_water, time.time()),
+            )
+
+    def load_flow_metadata(self, org_alias: str, version_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM flow_metadata WHERE org = ? AND version_id = ?",
+                (org_alias, version_id),
+            ).fetchone()
+        return zlib.decompress(row[0]).decode() if row else None
+
+    def save_flow_metadata(
+        self, org_alias: str, version_id: str, developer_name: str, xml: str
+    ) -> None:
+        """Store the XML of a flow version, replacing older versions of the same flow"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM flow_metadata WHERE org = ? AND developer_name = ?",
+                (org_alias, developer_name),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO flow_metadata "
+                "(org, version_id, developer_name, payload, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (org_alias, version_id, developer_name, zlib.compress(xml.encode()), time.time()),
+            )
+
+    def load_flow_index(self, org_alias: str) -> List[IndexedFlow]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT developer_name, version_id, label, process_type, trigger_type "
+                "FROM flow_index WHERE org = ?",
+                (org_alias,),
+            ).fetchall()
+            dependencies: Dict[str, List[Tuple[str, str | None, str]]] = {}
+            for name, sobject, field, operation in self._conn.execute(
+                "SELECT developer_name, sobject, field, operation FROM flow_dependencies "
+                "WHERE org = ?",
+                (org_alias,),
+            ):
+                dependencies.setdefault(name, []).append((sobject, field, operation))
+        return [
+            IndexedFlow(
+                developer_name=name,
+                version_id=version_id,
+                dependencies=dependencies.get(name, []),
+                label=label,
+                process_type=process_type,
+                trigger_type=trigger_type,
+            )
+            for name, version_id, label, process_type, trigger_type in rows
+        ]
+
+    def save_flow_index(
+        self, org_alias: str, flows: Iterable[IndexedFlow], *, keep: Iterable[str]
+    ) -> None:
+        """Store indexed flows, dropping those whose developer names are not in `keep`"""
+        flows = list(flows)
+        kept = set(keep)
+        with self._lock, self._conn:
+            stored = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT developer_name FROM flow_index WHERE org = ?", (org_alias,)
+                )
+            ]
+            replaced = [(org_alias, name) for name in stored if name not in kept]
+            replaced.extend((org_alias, flow.developer_name) for flow in flows)
+            self._conn.executemany(
+                "DELETE FROM flow_index WHERE org = ? AND developer_name = ?", replaced
+            )
+            self._conn.executemany(
+                "DELETE FROM flow_dependencies WHERE org = ? AND developer_name = ?", replaced
+            )
+            self._conn.executemany(
+                "INSERT INTO flow_index "
+                "(org, developer_name, version_id, label, process_type, trigger_type) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (org_alias, f.developer_name, f.version_id, f.label, f.process_type,
+                     f.trigger_type)
+                    for f in flows
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO flow_dependencies (org, developer_name, sobject, field, operation) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (org_alias, f.developer_name, *dependency)
+                    for f in flows
+                    for dependency in f.dependencies
+                ),
+            )
+
+
+def _relationship_rows(
+    org_alias: str, sobject: str, describe: Dict[str, Any]
+) -> Iterable[Tuple[str, str, str, str | None, str, str]]:
+    for f in describe.get("fields", []):
+        for target in f.get("referenceTo") or []:
+            yield (org_alias, sobject, f.get("name"), f.get("relationshipName"), target, "lookup")
+    for child in describe.get("childRelationships", []):
+        if child.get("childSObject"):
+            yield (
+                org_alias,
+                sobject,
+                child.get("field"),
+                child.get("relationshipName"),
+                child["childSObject"],
+                "child",
+            )
+
+
+_default_catalog: SchemaCatalog | None = None
+
+
+def default_catalog() -> SchemaCatalog | None:
+    """The process-wide catalog at SFMCP_CATALOG_PATH, or None when it is disabled"""
+    global _default_catalog
+    if not settings.catalog_enabled:
+        return None
+    if _default_catalog is None:
+        try:
+            _default_catalog = SchemaCatalog(settings.catalog_path)
+        except sqlite3.Error as e:
+            logger.warning(f"Schema catalog unavailable at {settings.catalog_path}: {e}")
+            return None
+    return _default_catalog
@@ -0,0 +1,164 @@
+from __future__ import annotations
+import asyncio
+import functools
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, ParamSpec, Sequence, TypeVar
+from .config.settings import settings
+from .deadlines import ToolDeadlines
+from .metrics import AsyncFunction, track_tool
+from .profiling import ToolProfiler
+from .result_store import ResultStore
+from .salesforce_client import SalesforceClient
+from .scheduler import background
+from .tracing import span
+
+logger = logging.getLogger("sfmcp.clients")
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class ClientRegistry:
+    """Owns one SalesforceClient per org alias for the life of the process
+
+    Tools get their client from here instead of building a new one per call, so
+    connection pools, caches and auth state survive from one invocation to the next.
+    The registry also holds process-wide resources shared by all orgs, such as the
+    result store and the tool deadlines.
+    """
+
+    def __init__(
+        self, factory: Callable[[str | None], SalesforceClient] = SalesforceClient.from_env
+    ):
+        self._factory = factory
+        self._clients: Dict[str, SalesforceClient] = {}
+        self._sessions = 0
+        self._background: List[asyncio.Task[None]] = []
+        self._warmed_up = False
+        self._results: ResultStore | None = None
+        self.deadlines = ToolDeadlines(
+            default=settings.tool_timeout, timeouts=settings.tool_timeouts
+        )
+        self.profiler = ToolProfiler(
+            tools=settings.profile_tool_names,
+            every=settings.profile_every,
+            interval=settings.profile_interval,
+            directory=settings.profile_dir,
+        )
+
+    @property
+    def results(self) -> ResultStore:
+        """The process-wide store for large query results, created on first use"""
+        if self._results is None:
+            self._results = ResultStore(
+                max_bytes=settings.result_store_max_bytes,
+                directory=settings.result_store_dir or None,
+            )
+        return self._results
+
+    def tool(self, name: str) -> Callable[[AsyncFunction[P, T]], AsyncFunction[P, T]]:
+        """Decorate a tool function: each call runs under the tool's deadline, is measured
+        and traced, and is profiled when the profiler picks it"""
+
+        def decorator(function: AsyncFunction[P, T]) -> AsyncFunction[P, T]:
+            @functools.wraps(function)
+            async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                with span("tool", tool=name), track_tool(name):
+                    async with self.profiler.profile(name), self.deadlines.limit(name):
+                        return await function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of every client and of the process-wide resources"""
+        return {
+            "clients": {alias: client.stats() for alias, client in self._clients.items()},
+            "result_store": self._results.stats() if self._results is not None else None,
+            "deadlines": self.deadlines.stats(),
+            "profiles": {"saved": self.profiler.profiles},
+        }
+
+    def get(self, org_alias: str | None = None) -> SalesforceClient:
+        """Return the shared client for an org, creating it on first use"""
+        alias = org_alias or settings.sf_org_alias
+        client = self._clients.get(alias)
+        if client is None:
+            client = self._factory(org_alias)
+            self._clients[alias] = client
+        return client
+
+    async def warm_up(self, hot_objects: Sequence[str] = ()) -> None:
+        """Prefetch the object list and describe the hot SObjects of the default org"""
+        sf = self.get()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            await sf.list_objects()
+        except Exception as e:
+            logger.warning(f"Warm-up failed to list objects: {e}")
+
+        results = await asyncio.gather(
+            *(sf.describe_object(name) for name in hot_objects), return_exceptions=True
+        )
+        for name, result in zip(hot_objects, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(f"Warm-up failed to describe {name}: {result}")
+        logger.info(
+            f"Warm-up finished for {sf.org_alias} in {loop.time() - started:.2f}s "
+            f"({len(hot_objects)} hot objects)"
+        )
+
+    async def refresh_schema_periodically(self, interval: float) -> None:
+        """Keep the default org's schema catalog current for as long as the server runs"""
+        sf = self.get()
+        while True:
+            try:
+                await sf.refresh_schema(max_age=interval)
+            except Exception as e:
+                logger.warning(f"Schema catalog refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+    @asynccontextmanager
+    async def session(
+        self,
+        *,
+        warm_up: bool = False,
+        hot_objects: Sequence[str] = (),
+        refresh_interval: float = 0,
+    ) -> AsyncIterator[ClientRegistry]:
+        """Hold the registry open for one server session
+
+        FastMCP enters the lifespan once per session (once per SSE connection in HTTP
+        mode), so the registry is reference counted: background work starts with the
+        first session and pooled connections are released when the last one ends.
+        Warm-up runs once per process; the schema refresh loop runs while sessions exist.
+        """
+        self._sessions += 1
+        if self._sessions == 1:
+            # Tasks copy the current context, so their requests run at background priority
+            with background():
+                if warm_up and not self._warmed_up:
+                    self._warmed_up = True
+                    self._background.append(asyncio.create_task(self.warm_up(hot_objects)))
+                if refresh_interval > 0:
+                    self._background.append(
+                        asyncio.create_task(self.refresh_schema_periodically(refresh_interval))
+                    )
+        try:
+            yield self
+        finally:
+            self._sessions -= 1
+            if self._sessions == 0:
+                await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop background work in progress and release every client's connections"""
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self._background = []
+        for client in self._clients.values():
+            await client.aclose()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Literal, Mapping
+from pydantic import BaseModel, Field
+
+ResultFormat = Literal["records", "columnar"]
+FORMAT_DESCRIPTION = (
+    "records: one JSON object per row; columnar: column names once and one value array "
+    "per column, with attributes dropped and relationship fields as dotted columns"
+)
+
+
+class ColumnarRows(BaseModel):
+    columns: List[str] = Field(..., description="Column names; dotted for relationship fields")
+    values: List[List[Any]] = Field(
+        ..., description="One array per column, aligned with columns, one value per row"
+    )
+    row_count: int
+
+
+def flatten_record(record: Mapping[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Drop Salesforce `attributes` and flatten relationship objects to dotted keys
+
+    Subquery results (child relationships) become a list of flattened child rows.
+    """
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        if key == "attributes":
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and "records" in value and "done" in value:
+            flat[name] = [flatten_record(child) for child in value["records"]]
+        elif isinstance(value, dict) and "attributes" in value:
+            flat.update(flatten_record(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def to_columnar(
+    records: Iterable[Mapping[str, Any]], *, rename: Mapping[str, str] | None = None
+) -> ColumnarRows:
+    """Turn rows into columns, in first-seen column order; missing values are null
+
+    `rename` maps column names (e.g. Salesforce field names) to output names.
+    """
+    columns: Dict[str, List[Any]] = {}
+    row_count = 0
+    for record in records:
+        for name, value in flatten_record(record).items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = [None] * row_count
+            column.append(value)
+        row_count += 1
+        for column in columns.values():
+            if len(column) < row_count:
+                column.append(None)
+    # A relationship that is null in some rows shows up as a column of its own there
+    for name in [name for name in columns if all(value is None for value in columns[name])]:
+        if any(other.startswith(f"{name}.") for other in columns):
+            del columns[name]
+    return ColumnarRows(
+        columns=[rename.get(name, name) for name in columns] if rename else list(columns),
+        values=list(columns.values()),
+        row_count=row_count,
+    )
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from typing import Dict, List, Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
@@ -19,5 +20,178 @@ class Settings(BaseSettings):
     http_host: str = Field(default="127.0.0.1", env="SFMCP_HTTP_HOST")
     http_port: int = Field(default=3333, env="SFMCP_HTTP_PORT")
 
+    # Salesforce transport: "cli" shells out to `sf`, "rest" uses a pooled HTTP client
+    transport: Literal["cli", "rest"] = Field(default="cli", validation_alias="SFMCP_TRANSPORT")
+    api_version: str = Field(default="61.0", validation_alias="SFMCP_API_VERSION")
+    rest_http2: bool = Field(default=True, validation_alias="SFMCP_REST_HTTP2")
+    rest_max_connections: int = Field(default=10, validation_alias="SFMCP_REST_MAX_CONNECTIONS")
+    rest_timeout: float = Field(default=120.0, validation_alias="SFMCP_REST_TIMEOUT")
+
+    # Request scheduling per org: concurrency caps (background work gets a share of the
+    # slots), the share of the daily API allowance kept for interactive calls, and
+    # retries with exponential backoff after REQUEST_LIMIT_EXCEEDED
+    max_concurrent_requests: int = Field(
+        default=8, validation_alias="SFMCP_MAX_CONCURRENT_REQUESTS"
+    )
+    background_concurrency: int = Field(default=2, validation_alias="SFMCP_BACKGROUND_CONCURRENCY")
+    api_reserve: float = Field(default=0.1, validation_alias="SFMCP_API_RESERVE")
+    rate_limit_retries: int = Field(default=3, validation_alias="SFMCP_RATE_LIMIT_RETRIES")
+    rate_limit_backoff: float = Field(default=1.0, validation_alias="SFMCP_RATE_LIMIT_BACKOFF")
+    rate_limit_backoff_max: float = Field(
+        default=60.0, validation_alias="SFMCP_RATE_LIMIT_BACKOFF_MAX"
+    )
+
+    # Tool call deadlines in seconds: a call running longer is cancelled, killing its `sf`
+    # processes and dropping its HTTP requests. Per-tool overrides are given as
+    # "describe=30,bulk_query=7200" using tool names without the salesforce_ prefix
+    # (0 means no deadline); long-running tools default to their job timeouts below
+    tool_timeout: float = Field(default=120.0, validation_alias="SFMCP_TOOL_TIMEOUT")
+    tool_timeout_overrides: str = Field(default="", validation_alias="SFMCP_TOOL_TIMEOUTS")
+
+    # Idempotent reads (queries, describes): transient failures (5xx, dropped connections)
+    # are retried, SOQL and other errors are not. With hedging on, a read still running
+    # at the `hedge_percentile` latency of recent reads gets a second attempt and the
+    # first answer wins
+    read_retries: int = Field(default=2, validation_alias="SFMCP_READ_RETRIES")
+    read_retry_backoff: float = Field(default=0.2, validation_alias="SFMCP_READ_RETRY_BACKOFF")
+    hedge_reads: bool = Field(default=False, validation_alias="SFMCP_HEDGE_READS")
+    hedge_percentile: float = Field(default=0.95, validation_alias="SFMCP_HEDGE_PERCENTILE")
+    hedge_min_samples: int = Field(default=20, validation_alias="SFMCP_HEDGE_MIN_SAMPLES")
+
+    # Tracing: nested spans of every tool call appended to this JSONL file (empty disables).
+    # Sampling profiler: calls of these comma-separated tools ("*" for all), and every Nth
+    # tool call when profile_every is set, are sampled every profile_interval seconds and
+    # saved as collapsed stacks (flamegraph.pl, speedscope) in profile_dir
+    trace_file: str = Field(default="", validation_alias="SFMCP_TRACE_FILE")
+    profile_tools: str = Field(default="", validation_alias="SFMCP_PROFILE_TOOLS")
+    profile_every: int = Field(default=0, validation_alias="SFMCP_PROFILE_EVERY")
+    profile_interval: float = Field(default=0.005, validation_alias="SFMCP_PROFILE_INTERVAL")
+    profile_dir: str = Field(
+        default="~/.cache/sfmcp/profiles", validation_alias="SFMCP_PROFILE_DIR"
+    )
+
+    # Startup warm-up: prefetch the object list and describe these comma-separated SObjects
+    warmup: bool = Field(default=False, validation_alias="SFMCP_WARMUP")
+    warmup_objects: str = Field(
+        default="Account,Contact,Opportunity,Lead,Case", validation_alias="SFMCP_WARMUP_OBJECTS"
+    )
+
+    # Describe cache: served fresh for `ttl` seconds, then served stale for up to
+    # `stale_ttl` more seconds while revalidating in the background (ttl=0 disables)
+    describe_cache_ttl: float = Field(default=300.0, validation_alias="SFMCP_DESCRIBE_CACHE_TTL")
+    describe_cache_stale_ttl: float = Field(
+        default=3600.0, validation_alias="SFMCP_DESCRIBE_CACHE_STALE_TTL"
+    )
+    describe_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, validation_alias="SFMCP_DESCRIBE_CACHE_MAX_BYTES"
+    )
+
+    # Describes requested within `window` seconds of each other are sent as one batch
+    # (Composite requests on REST, up to `concurrency` parallel `sf` calls on the CLI);
+    # a window of 0 sends each describe on its own
+    describe_batch_window: float = Field(
+        default=0.005, validation_alias="SFMCP_DESCRIBE_BATCH_WINDOW"
+    )
+    describe_batch_size: int = Field(default=25, validation_alias="SFMCP_DESCRIBE_BATCH_SIZE")
+    describe_concurrency: int = Field(default=4, validation_alias="SFMCP_DESCRIBE_CONCURRENCY")
+    # Describes salesforce_describe_many runs at once
+    describe_many_concurrency: int = Field(
+        default=25, validation_alias="SFMCP_DESCRIBE_MANY_CONCURRENCY"
+    )
+
+    # Persistent SQLite schema catalog, refreshed in the background every interval seconds
+    catalog_enabled: bool = Field(default=True, validation_alias="SFMCP_CATALOG_ENABLED")
+    catalog_path: str = Field(
+        default="~/.cache/sfmcp/catalog.sqlite3", validation_alias="SFMCP_CATALOG_PATH"
+    )
+    catalog_refresh_interval: float = Field(
+        default=3600.0, validation_alias="SFMCP_CATALOG_REFRESH_INTERVAL"
+    )
+
+    # salesforce_list_flows answers from the catalog for this many seconds after a sync,
+    # then pulls only the flows changed since (0 syncs on every call)
+    flow_sync_interval: float = Field(default=30.0, validation_alias="SFMCP_FLOW_SYNC_INTERVAL")
+
+    # Metadata retrieves (flows); retrieved flow XML is cached per flow version
+    retrieve_poll_interval: float = Field(
+        default=1.0, validation_alias="SFMCP_RETRIEVE_POLL_INTERVAL"
+    )
+    retrieve_timeout: float = Field(default=600.0, validation_alias="SFMCP_RETRIEVE_TIMEOUT")
+    retrieve_batch_size: int = Field(default=500, validation_alias="SFMCP_RETRIEVE_BATCH_SIZE")
+    flow_cache_max_bytes: int = Field(
+        default=32 * 1024 * 1024, validation_alias="SFMCP_FLOW_CACHE_MAX_BYTES"
+    )
+
+    # Analytics API report runs; results are cached per report definition and filters
+    report_poll_interval: float = Field(default=1.0, validation_alias="SFMCP_REPORT_POLL_INTERVAL")
+    report_timeout: float = Field(default=600.0, validation_alias="SFMCP_REPORT_TIMEOUT")
+    report_cache_ttl: float = Field(default=900.0, validation_alias="SFMCP_REPORT_CACHE_TTL")
+    report_cache_max_bytes: int = Field(
+        default=32 * 1024 * 1024, validation_alias="SFMCP_REPORT_CACHE_MAX_BYTES"
+    )
+
+    # Bulk API 2.0 query extracts
+    bulk_output_dir: str = Field(default="~/.cache/sfmcp/bulk", validation_alias="SFMCP_BULK_DIR")
+    bulk_poll_interval: float = Field(default=1.0, validation_alias="SFMCP_BULK_POLL_INTERVAL")
+    bulk_timeout: float = Field(default=3600.0, validation_alias="SFMCP_BULK_TIMEOUT")
+
+    # Query results above these sizes are spilled to the on-disk result store and
+    # returned as a handle plus a preview of the first rows
+    result_spill_rows: int = Field(default=1000, validation_alias="SFMCP_RESULT_SPILL_ROWS")
+    result_spill_bytes: int = Field(
+        default=1024 * 1024, validation_alias="SFMCP_RESULT_SPILL_BYTES"
+    )
+    result_preview_rows: int = Field(default=100, validation_alias="SFMCP_RESULT_PREVIEW_ROWS")
+    result_store_max_bytes: int = Field(
+        default=512 * 1024 * 1024, validation_alias="SFMCP_RESULT_STORE_MAX_BYTES"
+    )
+    result_store_dir: str = Field(default="", validation_alias="SFMCP_RESULT_STORE_DIR")
+
+    # Opt-in query result cache; per-object TTLs are given as "Opportunity=60,User=3600"
+    # (0 disables caching for that object) and override the default TTL
+    query_cache_enabled: bool = Field(default=False, validation_alias="SFMCP_QUERY_CACHE")
+    query_cache_ttl: float = Field(default=300.0, validation_alias="SFMCP_QUERY_CACHE_TTL")
+    query_cache_object_ttls: str = Field(
+        default="", validation_alias="SFMCP_QUERY_CACHE_OBJECT_TTLS"
+    )
+    query_cache_max_bytes: int = Field(
+        default=128 * 1024 * 1024, validation_alias="SFMCP_QUERY_CACHE_MAX_BYTES"
+    )
+    query_cache_probe_interval: float = Field(
+        default=15.0, validation_alias="SFMCP_QUERY_CACHE_PROBE_INTERVAL"
+    )
+
+    @property
+    def warmup_object_names(self) -> List[str]:
+        return [name.strip() for name in self.warmup_objects.split(",") if name.strip()]
+
+    @property
+    def profile_tool_names(self) -> List[str]:
+        return [name.strip() for name in self.profile_tools.split(",") if name.strip()]
+
+    @property
+    def query_cache_ttls(self) -> Dict[str, float]:
+        ttls: Dict[str, float] = {}
+        for item in self.query_cache_object_ttls.split(","):
+            name, _, ttl = item.partition("=")
+            if name.strip() and ttl.strip():
+                ttls[name.strip()] = float(ttl)
+        return ttls
+
+    @property
+    def tool_timeouts(self) -> Dict[str, float]:
+        timeouts = {
+            "bulk_query": self.bulk_timeout,
+            "run_report": self.report_timeout,
+            "describe_flow": self.retrieve_timeout,
+            "describe_flows": self.retrieve_timeout,
+            "find_automation": self.retrieve_timeout,
+        }
+        for item in self.tool_timeout_overrides.split(","):
+            name, _, timeout = item.partition("=")
+            if name.strip() and timeout.strip():
+                timeouts[name.strip()] = float(timeout)
+        return timeouts
+
 
 settings = Settings()  # evaluated at import time
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Mapping
+
+logger = logging.getLogger("sfmcp.deadlines")
+
+# Event loop time by which the current tool call must finish, if it has a deadline
+_deadline: ContextVar[float | None] = ContextVar("sfmcp_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """A tool call ran past its deadline and the work it started was cancelled"""
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or None without one"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - asyncio.get_running_loop().time())
+
+
+def clamp(timeout: float) -> float:
+    """Shorten an operation's own timeout (job polling, `sf --wait`) to the deadline"""
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
+
+
+class ToolDeadlines:
+    """Per-tool time limits for MCP tool calls
+
+    A tool call that runs past its limit is cancelled: the cancellation reaches the
+    Salesforce call in progress, so `sf` processes are killed, HTTP requests dropped
+    and queued scheduler slots given up, and the caller gets a DeadlineExceeded. The
+    deadline is visible to the code below through remaining() and clamp(). Calls
+    cancelled by the MCP client unwind the same way and are counted separately.
+    """
+
+    def __init__(self, *, default: float, timeouts: Mapping[str, float] | None = None):
+        self.default = default
+        self.timeouts = dict(timeouts or {})
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def timeout_for(self, tool: str) -> float | None:
+        """The time limit of a tool in seconds; None when it has none (configured as 0)"""
+        timeout = self.timeouts.get(tool, self.default)
+        return timeout if timeout > 0 else None
+
+    @asynccontextmanager
+    async def limit(self, tool: str) -> AsyncIterator[None]:
+        """Run the block under the tool's deadline (or an earlier one already set)"""
+        counts = self._counts.setdefault(tool, {"calls": 0, "timeouts": 0, "cancelled": 0})
+        counts["calls"] += 1
+        timeout = self.timeout_for(tool)
+        now = asyncio.get_running_loop().time()
+        outer = _deadline.get()
+        deadline = outer
+        if timeout is not None:
+            deadline = now + timeout if outer is None else min(outer, now + timeout)
+        # Seconds the block was given: its own limit, or what was left of an earlier one
+        budget = timeout if outer is None or deadline != outer else max(0.0, outer - now)
+        token = _deadline.set(deadline)
+        scope = asyncio.timeout_at(deadline)
+        try:
+            async with scope:
+                yield
+        except TimeoutError:
+            if not scope.expired():
+                raise  # a timeout of the Salesforce call itself, not the deadline
+            counts["timeouts"] += 1
+            logger.warning(f"{tool} exceeded its {budget:.3g}s deadline and was cancelled")
+            raise DeadlineExceeded(
+                f"{tool} did not finish within {budget:.3g}s; the Salesforce call was cancelled"
+            ) from None
+        except asyncio.CancelledError:
+            counts["cancelled"] += 1
+            logger.info(f"{tool} was cancelled")
+            raise
+        finally:
+            _deadline.reset(token)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "timeouts": sum(counts["timeouts"] for counts in self._counts.values()),
+            "cancelled": sum(counts["cancelled"] for counts in self._counts.values()),
+            "by_tool": {name: dict(counts) for name, counts in self._counts.items()},
+        }
@@ -0,0 +1,261 @@
+from __future__ import annotations
+import io
+import re
+from typing import IO, Any, Dict, Iterable, List, Set, Tuple
+from xml.etree import ElementTree
+
+# Top-level Flow elements that are nodes of the flow graph, and the record operation
+# each data element performs
+RECORD_OPERATIONS = {
+    "recordCreates": "create",
+    "recordUpdates": "update",
+    "recordLookups": "read",
+    "recordDeletes": "delete",
+}
+NODE_TYPES = {
+    "actionCalls",
+    "apexPluginCalls",
+    "assignments",
+    "collectionProcessors",
+    "customErrors",
+    "decisions",
+    "loops",
+    "orchestratedStages",
+    "recordRollbacks",
+    "screens",
+    "steps",
+    "subflows",
+    "transforms",
+    "waits",
+    *RECORD_OPERATIONS,
+}
+# Flow properties reported as they are
+PROPERTIES = {"apiVersion", "description", "label", "processType", "status", "triggerOrder"}
+
+_CONNECTOR_TAGS = {
+    "connector",
+    "defaultConnector",
+    "faultConnector",
+    "nextValueConnector",
+    "noMoreValuesConnector",
+}
+# Containers whose connectors are named after the container (decision outcomes etc.)
+_BRANCH_TAGS = {"rules", "waitEvents", "scheduledPaths"}
+_RECORD_FIELD_RE = re.compile(r"\$Record(?:__Prior)?\.(\w+)")
+# References to the triggering record, whose type is the start element's object
+_TRIGGER_RECORDS = {"$Record", "$Record__Prior"}
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element: ElementTree.Element, name: str) -> str | None:
+    for child in element:
+        if _local(child.tag) == name:
+            return child.text
+    return None
+
+
+def _children(element: ElementTree.Element, name: str) -> Iterable[ElementTree.Element]:
+    return (child for child in element if _local(child.tag) == name)
+
+
+def _connectors(element: ElementTree.Element, branch: str | None = None) -> List[Dict[str, str]]:
+    """Outgoing connectors of an element, labelled by kind (and outcome for branches)"""
+    found = []
+    for child in element:
+        tag = _local(child.tag)
+        if tag in _CONNECTOR_TAGS:
+            target = _child_text(child, "targetReference")
+            if target:
+                kind = f"{branch}:{tag}" if branch else tag
+                found.append({"kind": kind, "target": target})
+        elif tag in _BRANCH_TAGS:
+            found.extend(_connectors(child, _child_text(child, "name") or tag))
+    return found
+
+
+def _record_fields(element: ElementTree.Element) -> Set[str]:
+    """Fields of the triggering record ($Record.Field) referenced anywhere in an element"""
+    return {
+        match.group(1)
+        for node in element.iter()
+        if node.text
+        for match in _RECORD_FIELD_RE.finditer(node.text)
+    }
+
+
+def _assigned_fields(element: ElementTree.Element) -> Iterable[Tuple[str, str]]:
+    """(record reference, field) of each `reference.Field` an assignment element sets"""
+    for item in _children(element, "assignmentItems"):
+        target = _child_text(item, "assignToReference") or ""
+        reference, _, field = target.partition(".")
+        if reference and field:
+            yield reference, field
+
+
+def _node(element: ElementTree.Element, element_type: str) -> Dict[str, Any]:
+    node: Dict[str, Any] = {
+        "name": _child_text(element, "name"),
+        "type": element_type,
+        "label": _child_text(element, "label"),
+        "connectors": _connectors(element),
+    }
+    if element_type in RECORD_OPERATIONS:
+        node["operation"] = RECORD_OPERATIONS[element_type]
+        node["object"] = _child_text(element, "object")
+        node["inputReference"] = _child_text(element, "inputReference")
+        node["outputReference"] = _child_text(element, "outputReference")
+        fields: Set[str] = {
+            field
+            for container in ("inputAssignments", "filters", "outputAssignments")
+            for child in _children(element, container)
+            if (field := _child_text(child, "field"))
+        }
+        fields.update(child.text for child in _children(element, "queriedFields") if child.text)
+        node["fields"] = sorted(fields)
+    elif element_type == "decisions":
+        node["outcomes"] = [
+            {
+                "name": _child_text(rule, "name"),
+                "label": _child_text(rule, "label"),
+                "conditions": sum(1 for _ in _children(rule, "conditions")),
+            }
+            for rule in _children(element, "rules")
+        ]
+    elif element_type == "actionCalls":
+        node["actionName"] = _child_text(element, "actionName")
+        node["actionType"] = _child_text(element, "actionType")
+    elif element_type == "subflows":
+        node["flowName"] = _child_text(element, "flowName")
+    elif element_type == "loops":
+        node["collectionReference"] = _child_text(element, "collectionReference")
+    return {key: value for key, value in node.items() if value not in (None, [])}
+
+
+def _start(element: ElementTree.Element) -> Dict[str, Any]:
+    start: Dict[str, Any] = {
+        "object": _child_text(element, "object"),
+        "triggerType": _child_text(element, "triggerType"),
+        "recordTriggerType": _child_text(element, "recordTriggerType"),
+        "filters": sorted(
+            {f for child in _children(element, "filters") if (f := _child_text(child, "field"))}
+        ),
+        "connectors": _connectors(element),
+    }
+    return {key: value for key, value in start.items() if value not in (None, [])}
+
+
+def parse_flow(
+    source: str | bytes | IO[bytes],
+    *,
+    include_elements: bool = True,
+    element_types: Iterable[str] | None = None,
+) -> Dict[str, Any]:
+    """Parse flow-meta.xml into a compact model of the flow graph
+
+    The XML is read incrementally with iterparse and each top-level element is
+    discarded once it has been summarised, so memory stays flat however large the flow
+    is. The model has the flow's properties, its start (trigger object and type, and
+    the fields its entry filters and $Record references use),
+    per-type element counts, the SObjects and fields its record operations and
+    $Record references touch, and, with `include_elements`, the elements themselves
+    with their connectors, optionally only those of `element_types`.
+
+    Record elements that work on a record variable instead of naming an `object`
+    ($Record, an SObject variable, the output of a lookup) get the variable's object,
+    and the fields assignments set on it, once the whole flow has been read.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    wanted = set(element_types) if element_types else None
+
+    flow: Dict[str, Any] = {}
+    counts: Dict[str, int] = {}
+    elements: List[Dict[str, Any]] = []
+    touched: Dict[str, Dict[str, Set[str]]] = {}
+    record_fields: Set[str] = set()
+    start: Dict[str, Any] = {}
+    # Record variable name -> SObject, fields assigned per record variable, and the
+    # record elements whose object comes from a variable
+    record_types: Dict[str, str] = {}
+    assigned: Dict[str, Set[str]] = {}
+    by_reference: List[Dict[str, Any]] = []
+
+    def touch(object_name: str, operation: str, fields: Iterable[str]) -> None:
+        entry = touched.setdefault(object_name, {"operations": set(), "fields": set()})
+        entry["operations"].add(operation)
+        entry["fields"].update(fields)
+
+    depth = 0
+    root: ElementTree.Element | None = None
+    for event, element in ElementTree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                root = element
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+
+        tag = _local(element.tag)
+        if tag in PROPERTIES:
+            flow[tag] = element.text
+        elif tag == "start":
+            start = _start(element)
+            record_fields.update(_record_fields(element))
+        elif tag in NODE_TYPES:
+            node = _node(element, tag)
+            counts[tag] = counts.get(tag, 0) + 1
+            record_fields.update(_record_fields(element))
+            if node.get("object"):
+                touch(node["object"], node["operation"], node.get("fields", []))
+                if tag == "recordLookups":
+                    # Stored automatically under the element's name, or in outputReference
+                    for variable in (node.get("name"), node.get("outputReference")):
+                        if variable:
+                            record_types[variable] = node["object"]
+            elif node.get("inputReference"):
+                by_reference.append(node)
+            elif tag == "assignments":
+                for reference, field in _assigned_fields(element):
+                    assigned.setdefault(reference, set()).add(field)
+            if include_elements and (wanted is None or tag in wanted):
+                elements.append(node)
+        elif tag in ("variables", "formulas", "constants", "textTemplates", "choices"):
+            counts[tag] = counts.get(tag, 0) + 1
+            object_type = _child_text(element, "objectType")
+            if tag == "variables" and object_type:
+                record_types[_child_text(element, "name") or ""] = object_type
+        # The element is summarised: drop it (and its subtree) from the tree
+        element.clear()
+        if root is not None:
+            root.remove(element)
+
+    if start.get("object"):
+        for reference in _TRIGGER_RECORDS:
+            record_types[reference] = start["object"]
+        # Fields the trigger depends on, apart from what record elements do to its object
+        start["fields"] = sorted(record_fields.union(start.get("filters", [])))
+        touch(start["object"], "trigger", start["fields"])
+    for node in by_reference:
+        object_name = record_types.get(node["inputReference"])
+        if object_name is None:
+            continue
+        node["object"] = object_name
+        fields = assigned.get(node["inputReference"], set())
+        node["fields"] = sorted(fields.union(node.get("fields", [])))
+        touch(object_name, node["operation"], node["fields"])
+    flow["start"] = start
+    flow["counts"] = counts
+    flow["objects"] = {
+        name: {"operations": sorted(entry["operations"]), "fields": sorted(entry["fields"])}
+        for name, entry in sorted(touched.items())
+    }
+    if include_elements:
+        flow["elements"] = elements
+    return flow
@@ -0,0 +1,160 @@
+from __future__ import annotations
+import asyncio
+import logging
+import random
+import re
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, TypeVar
+import httpx
+from .scheduler import is_limit_error
+from .transport.base import SalesforceAPIError
+
+logger = logging.getLogger("sfmcp.hedging")
+
+T = TypeVar("T")
+
+# Salesforce error codes worth another attempt; SOQL and permission errors never are
+TRANSIENT_ERROR_CODES = {"SERVER_UNAVAILABLE", "UNKNOWN_EXCEPTION"}
+# CLI failures only carry the message: connection drops and gateway errors
+_TRANSIENT_CLI_RE = re.compile(
+    r"ECONNRESET|ETIMEDOUT|ECONNREFUSED|EAI_AGAIN|socket hang up|\b50[234]\b"
+    r"|Service Unavailable|SERVER_UNAVAILABLE",
+    re.IGNORECASE,
+)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed read may succeed if sent again unchanged"""
+    if is_limit_error(error):
+        return False  # the request scheduler pauses and retries those itself
+    if isinstance(error, SalesforceAPIError):
+        if isinstance(error.__cause__ or error.__context__, httpx.TransportError):
+            return True  # connection dropped, reset or timed out
+        if error.error_code in TRANSIENT_ERROR_CODES:
+            return True
+        return error.status is not None and (error.status >= 500 or error.status == 408)
+    return "Salesforce CLI command failed" in str(error) and bool(
+        _TRANSIENT_CLI_RE.search(str(error))
+    )
+
+
+class ReadPolicy:
+    """Classified retries and optional hedging for idempotent reads (queries, describes)
+
+    A read that fails with a transient error (5xx, dropped connection) is retried up to
+    `retries` times after a short jittered backoff; any other error, such as a malformed
+    SOQL query, is raised at once. With `hedge` on, a read still running after the
+    `percentile` latency of recent reads of the same operation gets a second attempt,
+    the first successful answer wins and the other attempt is cancelled. Hedging starts
+    once `min_samples` latencies have been seen.
+    """
+
+    def __init__(
+        self,
+        *,
+        hedge: bool = False,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        retries: int = 2,
+        retry_backoff: float = 0.2,
+    ):
+        self.hedge = hedge
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def hedge_delay(self, operation: str) -> float | None:
+        """Seconds after which a read gets a second attempt, or None to not hedge"""
+        samples = self._latencies.get(operation)
+        if not self.hedge or samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+
+    async def run(self, operation: str, call: Callable[[], Awaitable[T]]) -> T:
+        counts = self._counts.setdefault(
+            operation, {"calls": 0, "retries": 0, "hedged": 0, "hedge_wins": 0}
+        )
+        counts["calls"] += 1
+        attempt = 0
+        while True:
+            try:
+                return await self._hedged(operation, call, counts)
+            except Exception as e:
+                if attempt >= self.retries or not is_transient(e):
+                    raise
+                attempt += 1
+                counts["retries"] += 1
+                delay = self.retry_backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                logger.info(f"Retrying {operation} in {delay:.2f}s after a transient error: {e}")
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, operation: str, call: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await call()
+        latencies = self._latencies.get(operation)
+        if latencies is None:
+            latencies = self._latencies[operation] = deque(maxlen=self.window)
+        latencies.append(loop.time() - started)
+        return result
+
+    async def _hedged(
+        self, operation: str, call: Callable[[], Awaitable[T]], counts: Dict[str, int]
+    ) -> T:
+        delay = self.hedge_delay(operation)
+        if delay is None:
+            return await self._attempt(operation, call)
+
+        attempts: List[asyncio.Future[T]] = [asyncio.ensure_future(self._attempt(operation, call))]
+        try:
+            done, pending = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                counts["hedged"] += 1
+                logger.debug(f"Hedging {operation} after {delay:.3f}s")
+                attempts.append(asyncio.ensure_future(self._attempt(operation, call)))
+                pending = set(attempts)
+            error: BaseException | None = None
+            while done or pending:
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is not attempts[0]:
+                            counts["hedge_wins"] += 1
+                        return attempt.result()
+                    error = attempt.exception()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            assert error is not None
+            raise error
+        finally:
+            # The losing attempt is cancelled, which kills its `sf` process or request; a
+            # batched describe is only dropped once no other caller shares its batch
+            for attempt in attempts:
+                if attempt.done():
+                    if not attempt.cancelled():
+                        attempt.exception()  # retrieved: the loser's error is not news
+                else:
+                    attempt.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        by_operation: Dict[str, Any] = {}
+        for name, counts in self._counts.items():
+            delay = self.hedge_delay(name)
+            by_operation[name] = {
+                **counts,
+                "hedge_delay": round(delay, 4) if delay is not None else None,
+            }
+        return {
+            "hedging": self.hedge,
+            "calls": sum(counts["calls"] for counts in self._counts.values()),
+            "retries": sum(counts["retries"] for counts in self._counts.values()),
+            "hedged": sum(counts["hedged"] for counts in self._counts.values()),
+            "hedge_wins": sum(counts["hedge_wins"] for counts in self._counts.values()),
+            "by_operation": by_operation,
+        }
@@ -0,0 +1,202 @@
+from __future__ import annotations
+import importlib.util
+import json
+import re
+import time
+from typing import Any, Callable, Dict, List
+from . import tracing
+from .metrics import JSON_DECODE_SECONDS
+
+# orjson decodes several times faster than json and parses bytes without first
+# decoding them to str; it is optional
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    loads: Callable[[bytes | bytearray], Any] = orjson.loads
+    DECODER = "orjson"
+else:
+    loads = json.loads
+    DECODER = "json"
+
+# Characters that matter to the record scanner outside and inside JSON strings
+_STRUCTURE_RE = re.compile(rb'["{}\[\]]')
+_STRING_RE = re.compile(rb'["\\]')
+# What separates records in the array, and what follows a record that ends there
+_SEPARATOR_RE = re.compile(rb"[\s,]*")
+_RECORD_END_RE = re.compile(rb"\s*([,\]])")
+# Candidate cuts tried before the buffer is handed to the scanner
+_CUT_ATTEMPTS = 3
+
+
+class RecordStream:
+    """Incremental decoder for query responses that yields records as they arrive
+
+    Feed it the response body chunk by chunk (REST body or `sf --json` stdout). The
+    first array under a `records` key is cut after its last complete element and
+    everything before the cut is decoded with a single loads call, so only the record
+    being received is buffered rather than the whole payload, and decoding costs
+    about what decoding the whole body at once would. What surrounds the array
+    (totalSize, done, nextRecordsUrl, the CLI envelope) is returned by close(), with
+    an empty records list.
+    """
+
+    def __init__(self, key: bytes = b"records"):
+        self._key = key
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._last_string: bytes | None = None
+        self._last_string_end = 0
+        # before / inside / after the records array
+        self._state = "before"
+        self._array_depth = 0
+        self._record_start: int | None = None
+        self._envelope = bytearray()
+        # Time spent scanning and decoding, reported once per response by close()
+        self.decode_seconds = 0.0
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """Add a chunk of the body and return the records it completed"""
+        if self._state == "after":
+            self._envelope += data
+            return []
+        started = time.perf_counter()
+        self._buf += data
+        records: List[Dict[str, Any]] = []
+        if self._state == "before" or self._record_start is not None:
+            # Find the records array, or finish the record the scanner was inside
+            self._scan(records, settle=True)
+        if self._state == "inside" and self._record_start is None:
+            if not self._cut(records):
+                self._scan(records, settle=False)
+        self.decode_seconds += time.perf_counter() - started
+        return records
+
+    def _cut(self, records: List[Dict[str, Any]]) -> bool:
+        """Decode every complete record at the start of the buffer in one loads call
+
+        The buffer starts between two records. A `}` followed by `,` or `]` may end
+        the last complete record; the slice up to it only decodes as a list of values
+        if it does, since a cut inside a string or a nested object leaves it
+        unterminated. Returns False when no candidate decoded, so that the exact
+        scanner has to find the records.
+        """
+        buf = self._buf
+        start = _SEPARATOR_RE.match(buf).end()  # type: ignore[union-attr]
+        if buf[start : start + 1] == b"]":
+            self._finish(start)
+            return True
+        end = len(buf)
+        attempts = 0
+        while attempts < _CUT_ATTEMPTS:
+            close = buf.rfind(b"}", start, end)
+            if close < 0:
+                # No record completed yet, or none of the candidates was a record end
+                return attempts == 0
+            end = close
+            follow = _RECORD_END_RE.match(buf, close + 1)
+            if follow is None:
+                continue
+            attempts += 1
+            try:
+                decoded = loads(b"[" + buf[start : close + 1] + b"]")
+            except ValueError:
+                continue
+            # Later candidates all failed, so no complete record follows this one
+            records.extend(decoded)
+            if follow.group(1) == b"]":
+                self._finish(follow.start(1))
+            else:
+                self._pos = close + 1
+                self._drop(close + 1)
+            return True
+        return False
+
+    def _scan(self, records: List[Dict[str, Any]], *, settle: bool) -> None:
+        """Walk the buffer structurally, decoding each record on its own
+
+        With `settle`, stop as soon as the records array is entered or a record is
+        completed, so that _cut can take the rest.
+        """
+        buf = self._buf
+        while self._state != "after":
+            if self._in_string:
+                match = _STRING_RE.search(buf, self._pos)
+                if match is None:
+                    break
+                if match.group() == b"\\":
+                    self._pos = match.end() + 1  # skip the escaped character
+                    continue
+                self._in_string = False
+                self._pos = match.end()
+                if self._state == "before":
+                    self._last_string = bytes(buf[self._string_start : match.start()])
+                    self._last_string_end = self._pos
+                continue
+
+            match = _STRUCTURE_RE.search(buf, self._pos)
+            if match is None:
+                break
+            char = match.group()
+            self._pos = match.end()
+            if char == b'"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif char in (b"{", b"["):
+                if self._state == "before":
+                    if (
+                        char == b"["
+                        and self._last_string == self._key
+                        and buf[self._last_string_end : match.start()].strip() == b":"
+                    ):
+                        self._depth += 1
+                        self._array_depth = self._depth
+                        self._state = "inside"
+                        self._envelope += buf[: self._pos]
+                        self._drop(self._pos)
+                        if settle:
+                            return
+                        continue
+                elif self._depth == self._array_depth:
+                    self._record_start = match.start()
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._state != "inside":
+                    continue
+                if self._depth == self._array_depth and self._record_start is not None:
+                    records.append(loads(bytes(buf[self._record_start : self._pos])))
+                    self._record_start = None
+                    self._drop(self._pos)
+                    if settle:
+                        return
+                elif self._depth < self._array_depth:
+                    # End of the records array: the rest belongs to the envelope
+                    self._finish(match.start())
+
+    def _finish(self, end: int) -> None:
+        """Close the records array, which ends at `end`; the rest is envelope"""
+        self._state = "after"
+        self._envelope += self._buf[end:]
+        self._buf = bytearray()
+
+    def _drop(self, end: int) -> None:
+        """Forget the first `end` bytes of the buffer, which have been consumed"""
+        del self._buf[:end]
+        self._pos -= end
+        self._last_string_end -= end
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the body and return everything but the records"""
+        if self._state == "inside":
+            raise ValueError("Response ended inside the records array")
+        started = time.perf_counter()
+        envelope: Dict[str, Any] = loads(
+            bytes(self._buf if self._state == "before" else self._envelope)
+        )
+        self.decode_seconds += time.perf_counter() - started
+        JSON_DECODE_SECONDS.observe(self.decode_seconds, source="stream")
+        tracing.record("json.decode", self.decode_seconds, source="stream")
+        return envelope
@@ -0,0 +1,316 @@
+from __future__ import annotations
+import bisect
+import functools
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Mapping, ParamSpec, Sequence
+from typing import Tuple, TypeVar
+from . import tracing
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+AsyncFunction = Callable[P, Coroutine[Any, Any, T]]
+
+# Bucket upper bounds: seconds, bytes (1 KiB to 256 MiB) and record counts
+SECONDS_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0,
+)
+BYTES_BUCKETS = tuple(1024 * 4**power for power in range(10))
+COUNT_BUCKETS = (0, 1, 10, 100, 1000, 10_000, 100_000, 1_000_000)
+
+_NAME_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def error_class(error: BaseException) -> str:
+    """Short, bounded label for an error: the Salesforce errorCode or the exception type"""
+    return getattr(error, "error_code", None) or type(error).__name__
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values
+    )
+    pairs = zip(names, escaped, strict=True)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for key, value in self._values.items():
+            yield f"{self.name}{_labels(self.labels, key)} {value:g}"
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [
+            {**dict(zip(self.labels, key, strict=True)), "value": value}
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per combination of label values"""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = SECONDS_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per series: a count per bucket (plus +Inf), the sum and the count of values
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+        series[1][1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def quantile(self, key: Tuple[str, ...], q: float) -> float | None:
+        """Estimate a quantile by interpolating inside its bucket, as Prometheus does"""
+        counts, (_, total) = self._series[key]
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        lower = 0.0
+        # The +Inf bucket's count comes last and has no finite bound
+        for upper, count in zip(self.buckets, counts[:-1], strict=True):
+            if seen + count >= rank and count:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return self.buckets[-1]  # in the +Inf bucket: the largest finite bound
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for key, (counts, (total_sum, total)) in self._series.items():
+            cumulative = 0
+            for upper, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                bound = "+Inf" if upper == float("inf") else f"{upper:g}"
+                labels = _labels((*self.labels, "le"), (*key, bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, key)} {total_sum:g}"
+            yield f"{self.name}_count{_labels(self.labels, key)} {total:g}"
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        series = []
+        for key, (_, (total_sum, total)) in self._series.items():
+            estimates = {
+                name: round(value, 6) if (value := self.quantile(key, q)) is not None else None
+                for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+            }
+            series.append(
+                {
+                    **dict(zip(self.labels, key, strict=True)),
+                    "count": int(total),
+                    "sum": round(total_sum, 6),
+                    **estimates,
+                }
+            )
+        return series
+
+
+class MetricsRegistry:
+    """The process's metrics, rendered in the Prometheus text format or as a dict"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        metric = self._metrics[name] = Counter(name, help, labels)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = SECONDS_BUCKETS,
+    ) -> Histogram:
+        metric = self._metrics[name] = Histogram(name, help, labels, buckets)
+        return metric
+
+    def render(self, stats: Mapping[str, Any] | None = None) -> str:
+        """Prometheus exposition text; `stats` (ClientRegistry.stats()) adds gauges"""
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        if stats is not None:
+            lines.extend(_stat_gauges(stats))
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+
+def _stat_gauges(stats: Mapping[str, Any]) -> Iterator[str]:
+    """Numeric component stats as gauges: sfmcp_<component>_<stat>, per org for clients"""
+    gauges: Dict[str, List[str]] = {}
+
+    def add(component: str, values: Any, labels: str) -> None:
+        if not isinstance(values, Mapping):
+            return
+        for stat, value in values.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                name = _NAME_RE.sub("_", f"sfmcp_{component}_{stat}")
+                gauges.setdefault(name, []).append(f"{name}{labels} {value:g}")
+
+    for org, components in (stats.get("clients") or {}).items():
+        for component, values in components.items():
+            add(component, values, _labels(("org",), (org,)))
+    for component, values in stats.items():
+        if component != "clients":
+            add(component, values, "")
+    for name, samples in gauges.items():
+        yield f"# TYPE {name} gauge"
+        yield from samples
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_SECONDS = REGISTRY.histogram(
+    "sfmcp_tool_duration_seconds", "Wall time of MCP tool calls", ("tool", "outcome")
+)
+TOOL_ERRORS = REGISTRY.counter(
+    "sfmcp_tool_errors_total", "MCP tool calls that failed, by error class", ("tool", "error")
+)
+CLIENT_SECONDS = REGISTRY.histogram(
+    "sfmcp_client_operation_duration_seconds",
+    "Wall time of SalesforceClient operations, including cache hits and coalesced waits",
+    ("operation", "outcome"),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "sfmcp_salesforce_request_duration_seconds",
+    "Wall time of HTTP requests and sf processes sent to Salesforce",
+    ("transport", "operation", "outcome"),
+)
+REQUEST_ERRORS = REGISTRY.counter(
+    "sfmcp_salesforce_errors_total",
+    "Failed Salesforce requests, by error class",
+    ("transport", "operation", "error"),
+)
+BYTES_SENT = REGISTRY.histogram(
+    "sfmcp_salesforce_request_bytes",
+    "Request body (or sf command line) size",
+    ("transport", "operation"),
+    BYTES_BUCKETS,
+)
+BYTES_RECEIVED = REGISTRY.histogram(
+    "sfmcp_salesforce_response_bytes",
+    "Response body (or sf stdout) size",
+    ("transport", "operation"),
+    BYTES_BUCKETS,
+)
+CLI_SPAWN_SECONDS = REGISTRY.histogram(
+    "sfmcp_cli_spawn_seconds", "Time to start an sf process", ("command",)
+)
+JSON_DECODE_SECONDS = REGISTRY.histogram(
+    "sfmcp_json_decode_seconds", "Time spent decoding JSON responses", ("source",)
+)
+RECORDS = REGISTRY.histogram(
+    "sfmcp_query_records", "Records returned per query", ("operation",), COUNT_BUCKETS
+)
+
+
+class RequestTrack:
+    """Byte counts of one Salesforce request, filled in while it runs"""
+
+    def __init__(self, sent: int = 0):
+        self.sent = sent
+        self.received = 0
+
+
+@contextmanager
+def track_request(transport: str, operation: str, *, sent: int = 0) -> Iterator[RequestTrack]:
+    """Measure one Salesforce request; an exception leaving the block counts as its error"""
+    track = RequestTrack(sent)
+    started = time.perf_counter()
+    outcome = "ok"
+    with tracing.span("salesforce.request", transport=transport, operation=operation) as span:
+        try:
+            yield track
+        except GeneratorExit:
+            raise  # the reader stopped consuming a streamed response early
+        except BaseException as e:
+            outcome = "error"
+            REQUEST_ERRORS.inc(transport=transport, operation=operation, error=error_class(e))
+            raise
+        finally:
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                transport=transport,
+                operation=operation,
+                outcome=outcome,
+            )
+            BYTES_SENT.observe(track.sent, transport=transport, operation=operation)
+            BYTES_RECEIVED.observe(track.received, transport=transport, operation=operation)
+            if span is not None:
+                span.set(bytes_sent=track.sent, bytes_received=track.received)
+
+
+@contextmanager
+def track_tool(tool: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException as e:
+        outcome = "error"
+        TOOL_ERRORS.inc(tool=tool, error=error_class(e))
+        raise
+    finally:
+        TOOL_SECONDS.observe(time.perf_counter() - started, tool=tool, outcome=outcome)
+
+
+def timed(operation: str) -> Callable[[AsyncFunction[P, T]], AsyncFunction[P, T]]:
+    """Decorate an async SalesforceClient method to record its wall time (and trace it)"""
+
+    def decorator(method: AsyncFunction[P, T]) -> AsyncFunction[P, T]:
+        @functools.wraps(method)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                with tracing.span(f"client.{operation}"):
+                    result = await method(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                CLIENT_SECONDS.observe(
+                    time.perf_counter() - started, operation=operation, outcome=outcome
+                )
+
+        return wrapper
+
+    return decorator
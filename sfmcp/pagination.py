@@ -0,0 +1,54 @@
+from __future__ import annotations
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass
+class QueryCursor:
+    """Server-side state behind an opaque query cursor"""
+
+    buffered: List[Dict[str, Any]]
+    next_records_url: str | None
+    total_size: int
+    page_size: int
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class QueryCursorStore:
+    """Bounded store of open query cursors, expiring idle ones after `ttl` seconds
+
+    Only the rows of the current Salesforce batch that have not been returned yet are
+    held here; later batches are fetched through queryMore when the cursor is resumed.
+    """
+
+    def __init__(self, *, max_cursors: int = 256, ttl: float = 900.0):
+        self.max_cursors = max_cursors
+        self.ttl = ttl
+        self._cursors: OrderedDict[str, QueryCursor] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def put(self, cursor: QueryCursor) -> str:
+        self._expire()
+        token = secrets.token_urlsafe(16)
+        cursor.created_at = time.monotonic()
+        self._cursors[token] = cursor
+        while len(self._cursors) > self.max_cursors:
+            self._cursors.popitem(last=False)
+        return token
+
+    def pop(self, token: str) -> QueryCursor | None:
+        self._expire()
+        return self._cursors.pop(token, None)
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        while self._cursors:
+            token, cursor = next(iter(self._cursors.items()))
+            if cursor.created_at >= cutoff:
+                break
+            del self._cursors[token]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+import asyncio
+import collections
+import itertools
+import logging
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import FrameType
+from typing import AsyncIterator, Collection, Counter
+from . import tracing
+
+logger = logging.getLogger("sfmcp.profiling")
+
+
+def collapse(frame: FrameType | None) -> str:
+    """A stack as one `outer;...;inner` line of function labels, outermost first"""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        labels.append(f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Samples the stack of one thread (the event loop's) from a background thread
+
+    Python code of every task on the loop shows up, so samples taken while other tool
+    calls run are attributed to them as well; time spent waiting on Salesforce shows
+    as the event loop's selector.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter[str] = collections.Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sfmcp-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.samples[collapse(frame)] += 1
+
+
+class ToolProfiler:
+    """Decides which tool calls run under the sampling profiler and saves their stacks
+
+    Calls of the tools in `tools` ("*" for every tool) are profiled, and so is every
+    `every`th tool call when it is set. Each profile is written to `directory` in the
+    collapsed-stack format read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(
+        self,
+        *,
+        tools: Collection[str] = (),
+        every: int = 0,
+        interval: float = 0.005,
+        directory: str = "~/.cache/sfmcp/profiles",
+    ):
+        self.tools = set(tools)
+        self.every = every
+        self.interval = interval
+        self.directory = Path(directory).expanduser()
+        self._calls = itertools.count(1)
+        self.profiles = 0
+
+    def wants(self, tool: str) -> bool:
+        call = next(self._calls)
+        if "*" in self.tools or tool in self.tools:
+            return True
+        return self.every > 0 and call % self.every == 0
+
+    @asynccontextmanager
+    async def profile(self, tool: str) -> AsyncIterator[None]:
+        """Sample the block if this call of `tool` is to be profiled
+
+        Stopping the sampler joins its thread and saving writes a file, so both run in
+        a worker thread rather than on the event loop.
+        """
+        if not self.wants(tool):
+            yield
+            return
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        try:
+            yield
+        finally:
+            samples = await asyncio.to_thread(sampler.stop)
+            self.profiles += 1
+            path = await asyncio.to_thread(self._save, tool, samples, self.profiles)
+            if (span := tracing.current_span()) is not None:
+                span.set(profile=str(path), samples=sum(samples.values()))
+
+    def _save(self, tool: str, samples: Counter[str], number: int) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{tool}-{time.strftime('%Y%m%d-%H%M%S')}-{number}.folded"
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        logger.info(f"Saved {sum(samples.values())} stack samples of {tool} to {path}")
+        return path
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+def _groupings(
+    node: Dict[str, Any] | None, path: Tuple[str, ...] = ()
+) -> Iterator[Tuple[str, Tuple[str, ...], bool]]:
+    """Walk a groupingsDown/groupingsAcross tree: (factMap key, label path, is leaf)"""
+    for grouping in (node or {}).get("groupings") or []:
+        labels = (*path, str(grouping.get("label", grouping.get("value"))))
+        children = grouping.get("groupings") or []
+        yield grouping["key"], labels, not children
+        yield from _groupings(grouping, labels)
+
+
+def summarize_report(result: Dict[str, Any], *, include_details: bool = False) -> Dict[str, Any]:
+    """Turn an Analytics API report result into compact rows of aggregates
+
+    Each down grouping (at every level) becomes a row with its grouping labels and
+    aggregate values; matrix reports add the values per across grouping. Detail rows,
+    when requested, are taken from the leaf groupings (or the whole report when it is
+    not grouped) and keyed by column label.
+    """
+    metadata = result.get("reportMetadata") or {}
+    extended = result.get("reportExtendedMetadata") or {}
+    fact_map: Dict[str, Any] = result.get("factMap") or {}
+    attributes = result.get("attributes") or {}
+
+    aggregate_info = extended.get("aggregateColumnInfo") or {}
+    aggregate_labels = [
+        (aggregate_info.get(name) or {}).get("label", name)
+        for name in metadata.get("aggregates") or []
+    ]
+    grouping_info = extended.get("groupingColumnInfo") or {}
+
+    def column_labels(groupings: List[Dict[str, Any]]) -> List[str]:
+        return [(grouping_info.get(g["name"]) or {}).get("label", g["name"]) for g in groupings]
+
+    def aggregates(key: str) -> Dict[str, Any]:
+        values = (fact_map.get(key) or {}).get("aggregates")
+        if not values:
+            return {}
+        pairs = zip(aggregate_labels, values, strict=True)
+        return {label: value.get("value") for label, value in pairs}
+
+    across = list(_groupings(result.get("groupingsAcross")))
+    rows = []
+    for down_key, labels, _ in _groupings(result.get("groupingsDown")):
+        row: Dict[str, Any] = {
+            "groupings": list(labels),
+            "aggregates": aggregates(f"{down_key}!T"),
+        }
+        if across:
+            row["across"] = [
+                {"groupings": list(across_labels), "aggregates": aggregates(f"{down_key}!{key}")}
+                for key, across_labels, _ in across
+            ]
+        rows.append(row)
+
+    summary: Dict[str, Any] = {
+        "reportId": attributes.get("reportId") or metadata.get("id"),
+        "reportName": attributes.get("reportName") or metadata.get("name"),
+        "reportFormat": metadata.get("reportFormat"),
+        "groupingsDown": column_labels(metadata.get("groupingsDown") or []),
+        "groupingsAcross": column_labels(metadata.get("groupingsAcross") or []),
+        "aggregates": aggregate_labels,
+        "total": aggregates("T!T"),
+        "rows": rows,
+        "allData": result.get("allData", True),
+    }
+
+    if include_details and result.get("hasDetailRows"):
+        detail_info = extended.get("detailColumnInfo") or {}
+        columns = [
+            (detail_info.get(name) or {}).get("label", name)
+            for name in metadata.get("detailColumns") or []
+        ]
+        leaves = [
+            (f"{key}!T", list(labels))
+            for key, labels, leaf in _groupings(result.get("groupingsDown"))
+            if leaf
+        ] or [("T!T", [])]
+        details = []
+        for key, leaf_labels in leaves:
+            for fact_row in (fact_map.get(key) or {}).get("rows") or []:
+                cells = fact_row.get("dataCells") or []
+                detail: Dict[str, Any] = {
+                    column: cell.get("label") for column, cell in zip(columns, cells, strict=True)
+                }
+                if leaf_labels:
+                    detail["groupings"] = leaf_labels
+                details.append(detail)
+        summary["detailColumns"] = columns
+        summary["details"] = details
+    return summary
@@ -0,0 +1,213 @@
+from __future__ import annotations
+import json
+import logging
+import mmap
+import random
+import secrets
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+logger = logging.getLogger("sfmcp.results")
+
+
+class ResultStoreError(Exception):
+    """A result handle is unknown or evicted, or a result does not fit in the store"""
+
+
+@dataclass
+class StoredResult:
+    handle: str
+    path: Path
+    offsets: array[int]  # start offset of each row, plus the end of the file
+    columns: List[str]
+    created_at: float = field(default_factory=time.time)
+    # Guarded by the store's lock: reads in progress, and whether the result was evicted
+    # or removed while they ran (its mmap and file then go when the last read ends)
+    readers: int = 0
+    discarded: bool = False
+    _mmap: mmap.mmap | None = None
+
+    @property
+    def row_count(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def size_bytes(self) -> int:
+        return self.offsets[-1] + self.offsets.itemsize * len(self.offsets)
+
+    def open(self) -> None:
+        if self._mmap is None:
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def row_bytes(self, index: int) -> bytes:
+        assert self._mmap is not None, "read a stored result through ResultStore"
+        return self._mmap[self.offsets[index] : self.offsets[index + 1]]
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class ResultStore:
+    """Per-process store of large query results, kept on disk and read back by handle
+
+    Rows are written as JSON lines with an in-memory index of row offsets, then read
+    through mmap, so paging, projecting or sampling touches only the rows requested.
+    The total size on disk is bounded by `max_bytes`; least recently used results
+    are evicted (and their files deleted) to make room. Reads may run in threads next
+    to puts: a result evicted while it is being read is closed when the read ends.
+    """
+
+    def __init__(self, *, max_bytes: int, directory: str | Path | None = None):
+        self.max_bytes = max_bytes
+        if directory:
+            self.directory = Path(directory).expanduser()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._tmp: tempfile.TemporaryDirectory[str] | None = None
+        else:
+            # Removed together with its files when the process exits
+            self._tmp = tempfile.TemporaryDirectory(prefix="sfmcp-results-")
+            self.directory = Path(self._tmp.name)
+        self.total_bytes = 0
+        self.evictions = 0
+        self._results: OrderedDict[str, StoredResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def put(self, records: Iterable[Dict[str, Any]]) -> StoredResult:
+        """Write records to disk and return the stored result (blocking; run in a thread)"""
+        handle = f"res_{secrets.token_urlsafe(12)}"
+        path = self.directory / f"{handle}.jsonl"
+        offsets = array("Q", [0])
+        columns: Dict[str, None] = {}
+        with open(path, "wb") as f:
+            for record in records:
+                for key in record:
+                    if key != "attributes":
+                        columns.setdefault(key)
+                line = json.dumps(record, separators=(",", ":"), default=str).encode() + b"\n"
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+
+        result = StoredResult(handle=handle, path=path, offsets=offsets, columns=list(columns))
+        with self._lock:
+            if result.size_bytes > self.max_bytes:
+                path.unlink(missing_ok=True)
+                raise ResultStoreError(
+                    f"Result of {result.row_count} rows ({result.size_bytes} bytes) exceeds the "
+                    f"result store budget of {self.max_bytes} bytes; narrow the query or use "
+                    "salesforce_bulk_query"
+                )
+            while self._results and self.total_bytes + result.size_bytes > self.max_bytes:
+                _, evicted = self._results.popitem(last=False)
+                self._discard(evicted)
+                self.evictions += 1
+            self._results[handle] = result
+            self.total_bytes += result.size_bytes
+        logger.debug(f"Stored {result.row_count} rows as {handle} ({result.size_bytes} bytes)")
+        return result
+
+    def get(self, handle: str) -> StoredResult:
+        with self._lock:
+            result = self._results.get(handle)
+            if result is None:
+                raise ResultStoreError(f"Unknown or evicted result handle: {handle}")
+            self._results.move_to_end(handle)
+            return result
+
+    def read(
+        self,
+        handle: str,
+        *,
+        offset: int = 0,
+        limit: int = 100,
+        columns: Sequence[str] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Return rows [offset, offset + limit), optionally projected to `columns`"""
+        with self._reading(handle) as result:
+            end = min(offset + limit, result.row_count)
+            return [
+                _project(json.loads(result.row_bytes(i)), columns) for i in range(offset, end)
+            ]
+
+    def sample(
+        self,
+        handle: str,
+        size: int,
+        *,
+        columns: Sequence[str] | None = None,
+        seed: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Return a uniform random sample of rows, in their stored order"""
+        with self._reading(handle) as result:
+            indexes = sorted(
+                random.Random(seed).sample(range(result.row_count), min(size, result.row_count))
+            )
+            return [_project(json.loads(result.row_bytes(i)), columns) for i in indexes]
+
+    @contextmanager
+    def _reading(self, handle: str) -> Iterator[StoredResult]:
+        """Hold a result open for reading; eviction meanwhile does not close its mmap"""
+        with self._lock:
+            result = self._results.get(handle)
+            if result is None:
+                raise ResultStoreError(f"Unknown or evicted result handle: {handle}")
+            self._results.move_to_end(handle)
+            result.open()
+            result.readers += 1
+        try:
+            yield result
+        finally:
+            with self._lock:
+                result.readers -= 1
+                if result.discarded and not result.readers:
+                    self._release(result)
+
+    def remove(self, handle: str) -> None:
+        with self._lock:
+            result = self._results.pop(handle, None)
+            if result is not None:
+                self._discard(result)
+
+    def _discard(self, result: StoredResult) -> None:
+        self.total_bytes -= result.size_bytes
+        result.discarded = True
+        if not result.readers:
+            self._release(result)
+
+    @staticmethod
+    def _release(result: StoredResult) -> None:
+        result.close()
+        result.path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "results": len(self._results),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+def _project(record: Dict[str, Any], columns: Sequence[str] | None) -> Dict[str, Any]:
+    """Keep only `columns`; dotted names (Account.Name) reach into relationship fields"""
+    if not columns:
+        return record
+    projected: Dict[str, Any] = {}
+    for column in columns:
+        value: Any = record
+        for part in column.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        projected[column] = value
+    return projected
@@ -1,392 +1,919 @@
 from __future__ import annotations
-import json
 import asyncio
+import json
 import logging
-import os
 import shutil
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, Iterable, List, Sequence
+from .automation import AutomationIndex, IndexedFlow, flow_dependencies
+from .batching import DescribeBatcher
+from .cache import ByteLRU, DescribeCache, DescribeLoader, QueryCache, json_size
+from .catalog import SchemaCatalog, default_catalog
 from .config.settings import settings
+from .deadlines import clamp
+from .hedging import ReadPolicy
+from .metrics import RECORDS, timed
+from .pagination import QueryCursor, QueryCursorStore
+from .reports import summarize_report
+from .scheduler import RequestScheduler
+from .singleflight import Singleflight, coalesce
+from .soql import datetime_literal, normalize, parse_datetime, quote
+from .transport import CliTransport, Transport, make_transport
+from .transport.metadata import flow_file_keys
 
 logger = logging.getLogger("sfmcp.client")
 
+_FLOW_DEFINITION_FIELDS = "Id, DeveloperName, ActiveVersionId, LatestVersionId, LastModifiedDate"
+_FLOW_VERSION_FIELDS = "Id, DefinitionId, MasterLabel, Status, VersionNumber, LastModifiedDate"
+# Fields list_reports and list_dashboards select unless told otherwise
+REPORT_FIELDS = (
+    "Id", "Name", "DeveloperName", "Format", "FolderName", "Description", "OwnerId",
+    "LastRunDate", "LastViewedDate", "LastReferencedDate",
+)
+DASHBOARD_FIELDS = (
+    "Id", "Title", "DeveloperName", "FolderName", "Description", "OwnerId",
+    "LastViewedDate", "LastReferencedDate",
+)
+# Flow ids per `Id IN (...)` query, keeping the query URL well under Salesforce's limit
+_FLOW_IDS_PER_QUERY = 200
+
 
 class SalesforceClient:
-    def __init__(self, *, instance_url: str, access_token: str, org_alias: str):
+    def __init__(
+        self,
+        *,
+        instance_url: str,
+        access_token: str,
+        org_alias: str,
+        transport: Transport | None = None,
+        describe_cache: DescribeCache | None = None,
+        catalog: SchemaCatalog | None = None,
+        query_cache: QueryCache | None = None,
+    ):
         self._instance_url = instance_url
         self._access_token = access_token
         self._org_alias = org_alias
+        self._transport = transport or CliTransport(org_alias=org_alias)
+        self._scheduler = RequestScheduler(
+            max_concurrency=settings.max_concurrent_requests,
+            background_concurrency=settings.background_concurrency,
+            reserve=settings.api_reserve,
+            max_retries=settings.rate_limit_retries,
+            backoff=settings.rate_limit_backoff,
+            max_backoff=settings.rate_limit_backoff_max,
+        )
+        self._transport.scheduler = self._scheduler
+        self._reads = ReadPolicy(
+            hedge=settings.hedge_reads,
+            percentile=settings.hedge_percentile,
+            min_samples=settings.hedge_min_samples,
+            retries=settings.read_retries,
+            retry_backoff=settings.read_retry_backoff,
+        )
+        self._catalog = catalog
+        self._cursors = QueryCursorStore()
+        self._inflight = Singleflight()
+        self._flow_xml: ByteLRU[str] = ByteLRU(settings.flow_cache_max_bytes)
+        self._automation: AutomationIndex | None = None
+        self._report_results: ByteLRU[Dict[str, Any]] = ByteLRU(settings.report_cache_max_bytes)
+        self._describe_batcher = (
+            DescribeBatcher(
+                self._transport,
+                window=settings.describe_batch_window,
+                max_batch=settings.describe_batch_size,
+                concurrency=settings.describe_concurrency,
+            )
+            if settings.describe_batch_window > 0
+            else None
+        )
+        self._describe_cache = describe_cache or DescribeCache(
+            ttl=settings.describe_cache_ttl,
+            stale_ttl=settings.describe_cache_stale_ttl,
+            max_bytes=settings.describe_cache_max_bytes,
+            store=catalog,
+        )
+        if query_cache is None and settings.query_cache_enabled:
+            query_cache = QueryCache(
+                default_ttl=settings.query_cache_ttl,
+                max_bytes=settings.query_cache_max_bytes,
+                object_ttls=settings.query_cache_ttls,
+                probe_interval=settings.query_cache_probe_interval,
+            )
+        self._query_cache = query_cache
 
     @classmethod
-    def from_env(cls) -> "SalesforceClient":
+    def from_env(cls, org_alias: str | None = None) -> "SalesforceClient":
+        if org_alias and org_alias != settings.sf_org_alias:
+            # The configured token belongs to the default org, so other orgs go through the CLI
+            return cls(
+                instance_url=settings.sf_instance_url,
+                access_token=settings.sf_access_token,
+                org_alias=org_alias,
+                catalog=default_catalog(),
+            )
         return cls(
             instance_url=settings.sf_instance_url,
             access_token=settings.sf_access_token,
             org_alias=settings.sf_org_alias,
+            transport=make_transport(settings),
+            catalog=default_catalog(),
         )
 
-    async def _run_cli_command(self, command: List[str]) -> Dict[Any, Any]:
-        """Run a Salesforce CLI command asynchronously"""
-        try:
-            logger.debug(f"Running SF CLI: {' '.join(command)}")
-            process = await asyncio.create_subprocess_exec(
-                *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Unknown error"
-                logger.error(f"SF CLI failed: {error_msg}")
-                raise Exception(f"Salesforce CLI command failed: {error_msg}")
+    @property
+    def org_alias(self) -> str:
+        return self._org_alias
+
+    @property
+    def transport(self) -> Transport:
+        return self._transport
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        return self._scheduler
+
+    @property
+    def reads(self) -> ReadPolicy:
+        """Retry and hedging policy of queries and describes"""
+        return self._reads
+
+    @property
+    def describe_cache(self) -> DescribeCache:
+        return self._describe_cache
+
+    @property
+    def query_cache(self) -> QueryCache | None:
+        return self._query_cache
+
+    @property
+    def describe_batcher(self) -> DescribeBatcher | None:
+        return self._describe_batcher
+
+    @property
+    def inflight(self) -> Singleflight:
+        """Coalescer shared by concurrent identical calls on this client"""
+        return self._inflight
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of this client's caches, coalescing, scheduling and retries"""
+        return {
+            "transport": {"name": self._transport.name, **self._transport.stats()},
+            "describe_cache": self._describe_cache.stats(),
+            "query_cache": self._query_cache.stats() if self._query_cache else None,
+            "describe_batcher": (
+                self._describe_batcher.stats() if self._describe_batcher else None
+            ),
+            "flow_cache": self._flow_xml.stats(),
+            "report_cache": self._report_results.stats(),
+            "singleflight": self._inflight.stats(),
+            "scheduler": self._scheduler.stats(),
+            "reads": self._reads.stats(),
+        }
+
+    async def aclose(self) -> None:
+        """Release connections held by the transport"""
+        await self._transport.aclose()
+
+    async def _query_all(self, soql: str, *, tooling: bool = False) -> List[Dict[str, Any]]:
+        """Run a query and follow nextRecordsUrl until every page has been fetched"""
+
+        async def fetch() -> List[Dict[str, Any]]:
+            records: List[Dict[str, Any]] = []
+            async for batch in self._transport.iter_query(soql, tooling=tooling):
+                records.extend(batch)
+            RECORDS.observe(len(records), operation="tooling_query" if tooling else "query")
+            return records
+
+        return await self._reads.run("query", fetch)
+
+    async def iter_soql(self, soql: str) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Run a SOQL query and yield its records in batches as they are decoded
+
+        Unlike run_soql nothing is cached or coalesced, and records can be processed
+        while the rest of the response is still arriving.
+        """
+        async for batch in self._transport.iter_query(soql):
+            yield batch
+
+    @timed("query")
+    @coalesce("query", key=normalize)
+    async def run_soql(self, soql: str) -> List[Dict[str, Any]]:
+        """Run a SOQL query and return the records, through the query cache if enabled"""
+        if self._query_cache is None:
+            return await self._query_all(soql)
+        return await self._query_cache.get_or_run(
+            self._org_alias, soql, lambda: self._query_all(soql), self._probe_changes
+        )
 
-            result = json.loads(stdout.decode())
-            return result  # type: ignore[no-any-return]
+    async def _probe_changes(self, object_name: str) -> str | None:
+        """Change token for an SObject: its row count and latest SystemModstamp
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse SF CLI JSON output: {e}")
-            raise Exception(f"Failed to parse Salesforce CLI output: {e}")
-        except FileNotFoundError:
-            logger.error("Salesforce CLI (sf) not found")
-            raise Exception(
-                "Salesforce CLI (sf) not found. Please install the Salesforce CLI."
+        Deletes lower the count and inserts or updates raise the modstamp. Objects that
+        do not support the aggregate (no SystemModstamp, external objects) return None.
+        """
+        try:
+            page = await self._transport.query(
+                f"SELECT COUNT(Id) n, MAX(SystemModstamp) m FROM {object_name}"
             )
+            row = page["records"][0]
         except Exception as e:
-            logger.error(f"SF CLI command error: {e}")
-            raise Exception(f"Error running Salesforce CLI command: {e}")
+            logger.debug(f"Change probe failed for {object_name}, not caching: {e}")
+            return None
+        return f"{row.get('n')}:{row.get('m')}"
+
+    @timed("query_page")
+    async def query_page(
+        self,
+        soql: str | None = None,
+        *,
+        page_size: int | None = None,
+        cursor: str | None = None,
+    ) -> Dict[str, Any]:
+        """Return one page of a query, plus a cursor for the next page if there is one
+
+        Start a query with `soql`, then pass the returned `cursor` to get the following
+        page. Only one Salesforce batch is held between calls; further batches are
+        fetched through queryMore as pages are requested. A resumed cursor keeps the
+        page size it was started with unless a new one is given.
+        """
+        if cursor is not None:
+            state = self._cursors.pop(cursor)
+            if state is None:
+                raise Exception("Unknown or expired query cursor; run the query again")
+            state.page_size = page_size or state.page_size
+        elif soql is not None:
+            page_size = page_size or 2000
+            page = await self._transport.query(soql, batch_size=page_size)
+            if "records" not in page:
+                raise Exception("Unexpected response format from Salesforce")
+            state = QueryCursor(
+                buffered=list(page["records"]),
+                next_records_url=None if page.get("done", True) else page.get("nextRecordsUrl"),
+                total_size=page.get("totalSize", len(page["records"])),
+                page_size=page_size,
+            )
+        else:
+            raise Exception("Either a SOQL query or a cursor is required")
 
-    async def run_soql(self, soql: str) -> List[Dict[str, Any]]:
-        """Run a SOQL query and return the records"""
-        command = [
-            "sf",
-            "data",
-            "query",
-            "--target-org",
-            self._org_alias,
-            "--query",
-            soql,
-            "--result-format",
-            "json",
-        ]
-        result = await self._run_cli_command(command)
+        while len(state.buffered) < state.page_size and state.next_records_url:
+            page = await self._transport.query_more(state.next_records_url)
+            state.buffered.extend(page.get("records", []))
+            state.next_records_url = (
+                None if page.get("done", True) else page.get("nextRecordsUrl")
+            )
 
-        if "result" in result and "records" in result["result"]:
-            return result["result"]["records"]  # type: ignore[no-any-return]
-        else:
-            raise Exception("Unexpected response format from Salesforce CLI")
+        records = state.buffered[: state.page_size]
+        state.buffered = state.buffered[state.page_size :]
+        done = not state.buffered and not state.next_records_url
+        return {
+            "records": records,
+            "totalSize": state.total_size,
+            "done": done,
+            "cursor": None if done else self._cursors.put(state),
+        }
+
+    @timed("bulk_query")
+    async def bulk_query(self, soql: str, destination: Path) -> Dict[str, Any]:
+        """Run a Bulk API 2.0 query and stream its CSV result to `destination`"""
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        started = time.monotonic()
+        result = await self._transport.bulk_query(
+            soql,
+            destination,
+            poll_interval=settings.bulk_poll_interval,
+            timeout=clamp(settings.bulk_timeout),
+        )
+        logger.info(
+            f"Bulk query job {result.get('jobId')} wrote {result.get('rowCount')} rows "
+            f"to {destination} in {time.monotonic() - started:.2f}s"
+        )
+        return {**result, "path": str(destination), "bytes": destination.stat().st_size}
 
+    @timed("list_objects")
+    @coalesce("list_objects")
     async def list_objects(self) -> List[str]:
-        """Get list of all Salesforce object names"""
-        command = [
-            "sf",
-            "force:schema:sobject:list",
-            "--target-org",
-            self._org_alias,
-            "--json",
-        ]
-        result = await self._run_cli_command(command)
+        """Get list of all Salesforce object names (served from the schema catalog if present)"""
+        if self._catalog is not None:
+            stored = await asyncio.to_thread(self._catalog.list_objects, self._org_alias)
+            if stored is not None:
+                return stored[0]
+        return await self._fetch_objects()
+
+    async def _fetch_objects(self) -> List[str]:
+        names = await self._transport.list_sobjects()
+        if self._catalog is not None:
+            await asyncio.to_thread(self._catalog.save_objects, self._org_alias, names)
+        return names
+
+    def _describe_loader(self, object_name: str) -> DescribeLoader:
+        async def fetch(if_modified_since: str | None) -> Dict[str, Any] | None:
+            if self._describe_batcher is not None:
+                return await self._describe_batcher.describe(
+                    object_name, if_modified_since=if_modified_since
+                )
+            return await self._transport.describe_sobject(
+                object_name, if_modified_since=if_modified_since
+            )
 
-        if "result" in result and isinstance(result["result"], list):
-            return result["result"]
-        else:
-            raise Exception("Unexpected response format from Salesforce CLI")
+        async def load(if_modified_since: str | None) -> Dict[str, Any] | None:
+            return await self._reads.run("describe", lambda: fetch(if_modified_since))
+
+        return load
 
+    @timed("describe")
+    @coalesce("describe", key=str.lower)
     async def describe_object(self, object_name: str) -> Dict[str, Any]:
-        """Get detailed information about a Salesforce object"""
-        command = [
-            "sf",
-            "force:schema:sobject:describe",
-            "--target-org",
-            self._org_alias,
-            "-s",
-            object_name,
-            "--json",
-        ]
-        result = await self._run_cli_command(command)
+        """Get detailed information about a Salesforce object (served from the describe cache)"""
+        return await self._describe_cache.get_or_load(
+            self._org_alias, object_name, self._describe_loader(object_name)
+        )
 
-        if "result" in result:
-            return result["result"]  # type: ignore[no-any-return]
-        else:
-            raise Exception("Unexpected response format from Salesforce CLI")
+    @timed("refresh_schema")
+    async def refresh_schema(self, *, max_age: float, concurrency: int = 4) -> None:
+        """Bring the schema catalog up to date
+
+        Refetches the object list and revalidates (If-Modified-Since) only the stored
+        describes fetched more than `max_age` seconds ago.
+        """
+        if self._catalog is None:
+            return
+        started = time.monotonic()
+        stored = await asyncio.to_thread(self._catalog.list_objects, self._org_alias)
+        if stored is None or time.time() - stored[1] > max_age:
+            await self._fetch_objects()
+
+        stale_names = await asyncio.to_thread(
+            self._catalog.describe_names, self._org_alias, older_than=time.time() - max_age
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def revalidate(name: str) -> None:
+            async with semaphore:
+                try:
+                    await self._describe_cache.revalidate(
+                        self._org_alias, name, self._describe_loader(name)
+                    )
+                except Exception as e:
+                    logger.warning(f"Schema refresh failed to revalidate {name}: {e}")
+
+        await asyncio.gather(*(revalidate(name) for name in stale_names))
+        logger.info(
+            f"Schema catalog refreshed for {self._org_alias} in "
+            f"{time.monotonic() - started:.2f}s ({len(stale_names)} describes revalidated)"
+        )
 
+    @timed("list_flows")
+    @coalesce("list_flows")
     async def list_flows(self) -> List[Dict[str, Any]]:
-        """Get list of Salesforce flows using tooling API, joined with FlowDefinition"""
-        # Query 1: Get Flow records (all versions)
-        flow_command = [
-            "sf",
-            "data",
-            "query",
-            "--target-org",
-            self._org_alias,
-            "--use-tooling-api",
-            "-q",
-            "SELECT Id, MasterLabel, Status, VersionNumber FROM Flow",
-            "--json",
-        ]
-        flow_result = await self._run_cli_command(flow_command)
-
-        # Query 2: Get FlowDefinition records
-        flow_def_command = [
-            "sf",
-            "data",
-            "query",
-            "--target-org",
-            self._org_alias,
-            "--use-tooling-api",
-            "-q",
-            "SELECT Id, DeveloperName, ActiveVersionId, LatestVersionId FROM FlowDefinition",
-            "--json",
-        ]
-        flow_def_result = await self._run_cli_command(flow_def_command)
-
-        # Extract results
-        if (
-            "result" not in flow_result
-            or "records" not in flow_result["result"]
-            or "result" not in flow_def_result
-            or "records" not in flow_def_result["result"]
-        ):
-            raise Exception("Unexpected response format from Salesforce CLI")
-
-        flows_data = flow_result["result"]["records"]
-        flow_defs_data = flow_def_result["result"]["records"]
-
-        # Create a mapping of Flow ID to Flow data
-        flows_by_id = {flow["Id"]: flow for flow in flows_data}
-
-        # Join the data and get only latest versions
-        combined_flows = []
-        for flow_def in flow_defs_data:
-            latest_version_id = flow_def.get("LatestVersionId")
-            active_version_id = flow_def.get("ActiveVersionId")
-
-            # Use the latest version ID to get the flow details
-            if latest_version_id and latest_version_id in flows_by_id:
-                flow = flows_by_id[latest_version_id]
-
-                combined_flow = {
-                    "id": flow["Id"],
-                    "masterLabel": flow["MasterLabel"],
-                    "status": flow["Status"],
-                    "versionNumber": flow["VersionNumber"],
-                    "developerName": flow_def["DeveloperName"],
-                    "definitionId": flow_def["Id"],
-                    "isActive": latest_version_id == active_version_id,
-                    "activeVersionId": active_version_id,
-                    "latestVersionId": latest_version_id,
-                }
-                combined_flows.append(combined_flow)
+        """Get the latest version of each Salesforce flow, joined with its FlowDefinition
+
+        Only the latest version of each flow is fetched, never the full version history.
+        With a schema catalog, flows are kept there and synced incrementally by
+        LastModifiedDate; calls within SFMCP_FLOW_SYNC_INTERVAL of the last sync are
+        answered from the catalog without contacting Salesforce.
+        """
+        if self._catalog is None:
+            definitions = await self._query_all(
+                f"SELECT {_FLOW_DEFINITION_FIELDS} FROM FlowDefinition", tooling=True
+            )
+            versions = await self._flow_versions(d.get("LatestVersionId") for d in definitions)
+            flows = _join_flows(definitions, versions)
+        else:
+            flows = await self._sync_flows(self._catalog)
 
         # Sort by MasterLabel
-        combined_flows.sort(key=lambda x: x["masterLabel"] or "")
-
-        return combined_flows
-
-    async def list_reports(self) -> List[Dict[str, Any]]:
-        """Get list of Salesforce reports"""
-        command = [
-            "sf",
-            "data",
-            "query",
-            "--target-org",
+        flows.sort(key=lambda x: x["masterLabel"] or "")
+        return flows
+
+    async def _flow_versions(self, version_ids: Iterable[str | None]) -> Dict[str, Dict[str, Any]]:
+        """Fetch Flow version records by id, in concurrent chunks"""
+        ids = sorted({version_id for version_id in version_ids if version_id})
+        chunks = [ids[i : i + _FLOW_IDS_PER_QUERY] for i in range(0, len(ids), _FLOW_IDS_PER_QUERY)]
+        semaphore = asyncio.Semaphore(4)
+
+        async def fetch(chunk: List[str]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._query_all(
+                    f"SELECT {_FLOW_VERSION_FIELDS} FROM Flow "
+                    f"WHERE Id IN ({', '.join(quote(i) for i in chunk)})",
+                    tooling=True,
+                )
+
+        pages = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        return {version["Id"]: version for page in pages for version in page}
+
+    async def _sync_flows(self, catalog: SchemaCatalog) -> List[Dict[str, Any]]:
+        """Bring the catalog's flows up to date and return them"""
+        state = await asyncio.to_thread(catalog.flow_sync, self._org_alias)
+        if state is not None and time.time() - state[1] < settings.flow_sync_interval:
+            return await asyncio.to_thread(catalog.load_flows, self._org_alias)
+
+        if state is None or state[0] is None:
+            definitions = await self._query_all(
+                f"SELECT {_FLOW_DEFINITION_FIELDS} FROM FlowDefinition", tooling=True
+            )
+            versions = await self._flow_versions(d.get("LatestVersionId") for d in definitions)
+            flows = _join_flows(definitions, versions)
+            await asyncio.to_thread(
+                catalog.save_flows,
+                self._org_alias,
+                flows,
+                high_water=_high_water([*definitions, *versions.values()]),
+                replace=True,
+            )
+            logger.info(f"Flow catalog for {self._org_alias} fully synced: {len(flows)} flows")
+            return flows
+
+        # Changed definitions, changed versions and the ids of all definitions (to notice
+        # deletions) are independent, so they are fetched concurrently
+        since = datetime_literal(state[0])
+        definitions, changed_versions, current = await asyncio.gather(
+            self._query_all(
+                f"SELECT {_FLOW_DEFINITION_FIELDS} FROM FlowDefinition "
+                f"WHERE LastModifiedDate >= {since}",
+                tooling=True,
+            ),
+            self._query_all(
+                f"SELECT {_FLOW_VERSION_FIELDS} FROM Flow WHERE LastModifiedDate >= {since}",
+                tooling=True,
+            ),
+            self._query_all("SELECT Id FROM FlowDefinition", tooling=True),
+        )
+        stored = {
+            flow["definitionId"]: flow
+            for flow in await asyncio.to_thread(catalog.load_flows, self._org_alias)
+        }
+        versions = {version["Id"]: version for version in changed_versions}
+        changed_definitions = {definition["Id"] for definition in definitions}
+        newest: Dict[str, Dict[str, Any]] = {}
+        for version in changed_versions:
+            current_newest = newest.get(version.get("DefinitionId") or "")
+            if current_newest is None or (version.get("VersionNumber") or 0) > (
+                current_newest.get("VersionNumber") or 0
+            ):
+                newest[version.get("DefinitionId") or ""] = version
+        for definition_id, version in newest.items():
+            flow = stored.get(definition_id)
+            if flow is None or definition_id in changed_definitions:
+                continue
+            # A version edited or added without its definition showing up as changed
+            if (version.get("VersionNumber") or 0) >= (flow["versionNumber"] or 0):
+                definitions.append(
+                    {
+                        "Id": flow["definitionId"],
+                        "DeveloperName": flow["developerName"],
+                        "ActiveVersionId": flow["activeVersionId"],
+                        "LatestVersionId": version["Id"],
+                    }
+                )
+        versions.update(
+            await self._flow_versions(
+                d.get("LatestVersionId") for d in definitions
+                if d.get("LatestVersionId") not in versions
+            )
+        )
+        flows = _join_flows(definitions, versions)
+        await asyncio.to_thread(
+            catalog.save_flows,
             self._org_alias,
-            "--query",
-            "SELECT Id, Name, DeveloperName, Format, FolderName, Description, OwnerId, LastRunDate, LastViewedDate, LastReferencedDate FROM Report ORDER BY FolderName, Name",
-            "--result-format",
-            "json",
-        ]
+            flows,
+            high_water=_high_water([*definitions, *changed_versions], state[0]),
+            keep=[record["Id"] for record in current],
+        )
+        logger.debug(f"Flow catalog for {self._org_alias} synced {len(flows)} changed flows")
+        return await asyncio.to_thread(catalog.load_flows, self._org_alias)
+
+    @timed("list_reports")
+    @coalesce("list_reports")
+    async def list_reports(
+        self,
+        *,
+        fields: Sequence[str] = REPORT_FIELDS,
+        folder: str | None = None,
+        search: str | None = None,
+        owner_id: str | None = None,
+        last_run_days: int | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Dict[str, Any]:
+        """Get Salesforce reports matching the filters, as Report records
+
+        Filters, the field list and the page size are all part of the SOQL, so only
+        matching rows and requested fields are transferred. `search` matches the name
+        (SOQL LIKE wildcards allowed) and `last_run_days` keeps reports run in the last
+        N days. With `limit` one page is returned with a cursor for the next one;
+        otherwise every matching report is.
+        """
+        conditions = _listing_conditions(folder=folder, search=search, owner_id=owner_id)
+        if last_run_days is not None:
+            since = datetime.now(timezone.utc) - timedelta(days=last_run_days)
+            conditions.append(f"LastRunDate >= {datetime_literal(since)}")
+        return await self._list_page(
+            "Report", fields, conditions, "FolderName, Name, Id", limit=limit, cursor=cursor
+        )
 
-        result = await self._run_cli_command(command)
-
-        if "result" in result and "records" in result["result"]:
-            reports_data = result["result"]["records"]
-
-            # Process reports to add calculated fields
-            processed_reports = []
-            for report in reports_data:
-                processed_report = {
-                    "id": report.get("Id"),
-                    "name": report.get("Name"),
-                    "developerName": report.get("DeveloperName"),
-                    "format": report.get("Format"),
-                    "folderName": report.get("FolderName", "Unfiled Public Reports"),
-                    "description": report.get("Description"),
-                    "ownerId": report.get("OwnerId"),
-                    "lastRunDate": report.get("LastRunDate"),
-                    "lastViewedDate": report.get("LastViewedDate"),
-                    "lastReferencedDate": report.get("LastReferencedDate"),
-                }
-                processed_reports.append(processed_report)
+    @timed("list_dashboards")
+    @coalesce("list_dashboards")
+    async def list_dashboards(
+        self,
+        *,
+        fields: Sequence[str] = DASHBOARD_FIELDS,
+        folder: str | None = None,
+        search: str | None = None,
+        owner_id: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Dict[str, Any]:
+        """Get Salesforce dashboards matching the filters, as Dashboard records
+
+        Works like list_reports; `search` matches the dashboard title.
+        """
+        conditions = _listing_conditions(
+            folder=folder, search=search, owner_id=owner_id, name_field="Title"
+        )
+        return await self._list_page(
+            "Dashboard", fields, conditions, "FolderName, Title, Id", limit=limit, cursor=cursor
+        )
 
-            return processed_reports
-        else:
-            raise Exception("Unexpected response format from Salesforce CLI")
-
-    async def list_dashboards(self) -> List[Dict[str, Any]]:
-        """Get list of Salesforce dashboards"""
-        command = [
-            "sf",
-            "data",
-            "query",
-            "--target-org",
+    async def _list_page(
+        self,
+        object_name: str,
+        fields: Sequence[str],
+        conditions: List[str],
+        order_by: str,
+        *,
+        limit: int | None,
+        cursor: str | None,
+    ) -> Dict[str, Any]:
+        if cursor is not None:
+            return await self.query_page(page_size=limit, cursor=cursor)
+        soql = f"SELECT {', '.join(dict.fromkeys(['Id', *fields]))} FROM {object_name}"
+        if conditions:
+            soql += " WHERE " + " AND ".join(conditions)
+        soql += f" ORDER BY {order_by}"
+        if limit is not None:
+            return await self.query_page(soql, page_size=limit)
+        records = await self._query_all(soql)
+        return {"records": records, "totalSize": len(records), "done": True, "cursor": None}
+
+    @timed("run_report")
+    @coalesce(
+        "run_report",
+        key=lambda report_id, **options: (report_id, json.dumps(options, sort_keys=True)),
+    )
+    async def run_report(
+        self,
+        report_id: str,
+        *,
+        filters: List[Dict[str, Any]] | None = None,
+        boolean_filter: str | None = None,
+        include_details: bool = False,
+    ) -> Dict[str, Any]:
+        """Run a report in Salesforce and return its aggregates (see summarize_report)
+
+        The report runs as an asynchronous Analytics API instance that is polled without
+        blocking. `filters` replace the report's saved filters for this run. Results are
+        cached by report id, filters and the report's LastModifiedDate (so editing the
+        report invalidates them) for SFMCP_REPORT_CACHE_TTL seconds, since the data the
+        report reads changes too.
+        """
+        records = await self._query_all(
+            f"SELECT Id, LastModifiedDate FROM Report WHERE Id = {quote(report_id)}"
+        )
+        if not records:
+            raise Exception(f"Report {report_id} not found")
+        last_modified = records[0].get("LastModifiedDate")
+
+        metadata: Dict[str, Any] = {}
+        if filters is not None:
+            metadata["reportFilters"] = filters
+        if boolean_filter:
+            metadata["reportBooleanFilter"] = boolean_filter
+        key = (
             self._org_alias,
-            "--query",
-            "SELECT Id, Title, DeveloperName, FolderName, Description, OwnerId, LastViewedDate, LastReferencedDate FROM Dashboard ORDER BY FolderName, Title",
-            "--result-format",
-            "json",
-        ]
-
-        result = await self._run_cli_command(command)
-
-        if "result" in result and "records" in result["result"]:
-            dashboards_data = result["result"]["records"]
-
-            # Process dashboards to add calculated fields
-            processed_dashboards = []
-            for dashboard in dashboards_data:
-                processed_dashboard = {
-                    "id": dashboard.get("Id"),
-                    "title": dashboard.get("Title"),
-                    "developerName": dashboard.get("DeveloperName"),
-                    "folderName": dashboard.get(
-                        "FolderName", "Unfiled Public Dashboards"
-                    ),
-                    "description": dashboard.get("Description"),
-                    "ownerId": dashboard.get("OwnerId"),
-                    "lastViewedDate": dashboard.get("LastViewedDate"),
-                    "lastReferencedDate": dashboard.get("LastReferencedDate"),
-                }
-                processed_dashboards.append(processed_dashboard)
-
-            return processed_dashboards
-        else:
-            raise Exception("Unexpected response format from Salesforce CLI")
-
+            report_id,
+            last_modified,
+            json.dumps(metadata, sort_keys=True),
+            include_details,
+        )
+        entry = self._report_results.get(key)
+        if entry is not None and entry.age < settings.report_cache_ttl:
+            return {**entry.value, "cached": True}
+
+        started = time.monotonic()
+        result = await self._transport.run_report(
+            report_id,
+            report_metadata=metadata or None,
+            include_details=include_details,
+            poll_interval=settings.report_poll_interval,
+            timeout=clamp(settings.report_timeout),
+        )
+        summary = summarize_report(result, include_details=include_details)
+        summary["lastModifiedDate"] = last_modified
+        self._report_results.put(key, summary, json_size(summary))
+        logger.debug(f"Ran report {report_id} in {time.monotonic() - started:.2f}s")
+        return {**summary, "cached": False}
+
+    @timed("describe_flow")
+    @coalesce("describe_flow")
     async def describe_flow(self, flow_developer_name: str) -> Dict[str, Any]:
-        """Retrieve and read a flow's metadata XML file, then clean up"""
-        # Use sf project retrieve to get the flow metadata
-        command = [
-            "sf", "project", "retrieve", "start",
-            "--target-org", self._org_alias,
-            "--metadata", f"Flow:{flow_developer_name}",
-        ]
-
+        """Retrieve a flow's metadata XML, cached by the flow's latest version id
+
+        Retrieves run in a temporary directory (CLI) or in memory (REST), never in the
+        server's working directory, so concurrent describes cannot interfere. A flow
+        whose latest version is already cached is returned without a retrieve.
+        """
+        version_id = await self._latest_flow_version(flow_developer_name)
+        flow_content = await self._cached_flow_xml(version_id) if version_id else None
+        cached = flow_content is not None
+        if flow_content is None:
+            try:
+                retrieved = await self._retrieve_flows([flow_developer_name])
+            except Exception as e:
+                logger.error(f"Failed to describe flow {flow_developer_name}: {e}")
+                raise Exception(f"Failed to retrieve flow metadata: {e}") from e
+            flow_content = retrieved.get(flow_developer_name)
+            if flow_content is None:
+                raise Exception(
+                    f"Flow file not found for {flow_developer_name}. "
+                    "The flow may not exist or the developer name may be incorrect."
+                )
+            if version_id:
+                await self._cache_flow_xml(version_id, flow_developer_name, flow_content)
+
+        return _flow_description(flow_developer_name, flow_content, version_id, cached=cached)
+
+    async def _latest_flow_version(self, flow_developer_name: str) -> str | None:
+        """LatestVersionId of a flow, from the flow catalog when there is one"""
+        versions = await self._latest_flow_versions([flow_developer_name])
+        return versions.get(flow_developer_name)
+
+    async def _latest_flow_versions(
+        self, flow_developer_names: List[str]
+    ) -> Dict[str, str | None]:
+        """LatestVersionId of each flow (None if unknown), from the flow catalog if any"""
         try:
-            logger.debug(f"Retrieving flow metadata for: {flow_developer_name}")
-            # The retrieve command doesn't return JSON, so we use a different approach
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+            if self._catalog is not None:
+                latest = {
+                    flow["developerName"]: flow["latestVersionId"]
+                    for flow in await self.list_flows()
+                }
+            else:
+                names = sorted(set(flow_developer_names))
+                pages = await asyncio.gather(
+                    *(
+                        self._query_all(
+                            "SELECT DeveloperName, LatestVersionId FROM FlowDefinition "
+                            f"WHERE DeveloperName IN ({', '.join(quote(n) for n in chunk)})",
+                            tooling=True,
+                        )
+                        for chunk in (
+                            names[i : i + _FLOW_IDS_PER_QUERY]
+                            for i in range(0, len(names), _FLOW_IDS_PER_QUERY)
+                        )
+                    )
+                )
+                latest = {
+                    record["DeveloperName"]: record.get("LatestVersionId")
+                    for page in pages
+                    for record in page
+                }
+        except Exception as e:
+            logger.warning(f"Could not look up flow versions: {e}")
+            latest = {}
+        return {name: latest.get(name) for name in flow_developer_names}
+
+    async def iter_describe_flows(
+        self, flow_developer_names: List[str] | None = None, *, all_active: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Describe many flows, yielding each one as soon as it is available
+
+        Flows whose latest version is cached come first. The rest are fetched together
+        with one metadata retrieve per SFMCP_RETRIEVE_BATCH_SIZE flows, so a typical
+        request is a single retrieve. Flows that cannot be retrieved are yielded with an
+        "error" instead of "flowContent".
+        """
+        names = list(dict.fromkeys(flow_developer_names or []))
+        if all_active:
+            names.extend(
+                flow["developerName"]
+                for flow in await self.list_flows()
+                if flow["activeVersionId"] and flow["developerName"] not in names
             )
+        versions = await self._latest_flow_versions(names)
+
+        missing = []
+        for name in names:
+            version_id = versions[name]
+            xml = await self._cached_flow_xml(version_id) if version_id else None
+            if xml is None:
+                missing.append(name)
+            else:
+                yield _flow_description(name, xml, version_id, cached=True)
+
+        batch_size = settings.retrieve_batch_size
+        for batch in (missing[i : i + batch_size] for i in range(0, len(missing), batch_size)):
+            try:
+                retrieved = await self._retrieve_flows(batch)
+            except Exception as e:
+                logger.error(f"Failed to retrieve {len(batch)} flows: {e}")
+                for name in batch:
+                    yield {"flowDeveloperName": name, "error": f"Retrieve failed: {e}"}
+                continue
+            for name in batch:
+                xml = retrieved.get(name)
+                if xml is None:
+                    yield {"flowDeveloperName": name, "error": "Flow not found in the org"}
+                    continue
+                version_id = versions[name]
+                if version_id:
+                    await self._cache_flow_xml(version_id, name, xml)
+                yield _flow_description(name, xml, version_id, cached=False)
+
+    @timed("automation_index")
+    @coalesce("automation_index")
+    async def automation_index(self) -> AutomationIndex:
+        """The flow dependency index, brought up to date with the org's flows
+
+        Only flows whose latest version is not the indexed one are described (one bulk
+        retrieve, cached flow XML reused) and parsed; deleted flows are dropped. The
+        index is persisted in the schema catalog when there is one, so a new process
+        starts from it. Flows that could not be described are in `index.errors`.
+        """
+        index = self._automation
+        if index is None:
+            index = AutomationIndex()
+            if self._catalog is not None:
+                stored_index = await asyncio.to_thread(
+                    self._catalog.load_flow_index, self._org_alias
+                )
+                for indexed in stored_index:
+                    index.put(indexed)
+            self._automation = index
+
+        flows = {
+            flow["developerName"]: flow
+            for flow in await self.list_flows()
+            if flow["developerName"] and flow["latestVersionId"]
+        }
+        indexed_versions = index.versions()
+        for name in indexed_versions.keys() - flows.keys():
+            index.remove(name)
+        stale = [
+            name
+            for name, flow in flows.items()
+            if indexed_versions.get(name) != flow["latestVersionId"]
+        ]
 
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Unknown error"
-                logger.error(f"SF CLI retrieve failed: {error_msg}")
-                raise Exception(f"Salesforce CLI retrieve failed: {error_msg}")
-
-            # Log the retrieve output for debugging
-            retrieve_output = stdout.decode()
-            logger.debug(f"Retrieve output: {retrieve_output}")
-
-            # The retrieve command doesn't return JSON by default, so we need to find the file
-            # Look for the flow file in the standard locations
-            possible_paths = [
-                f"force-app/main/default/flows/{flow_developer_name}.flow-meta.xml",
-                f"src/flows/{flow_developer_name}.flow-meta.xml",
-                # Some orgs might use different directory structures
-                f"flows/{flow_developer_name}.flow-meta.xml",
-                f"metadata/flows/{flow_developer_name}.flow-meta.xml",
-            ]
-
-            flow_content = None
-            flow_file_path = None
-
-            for path_str in possible_paths:
-                path = Path(path_str)
-                if path.exists():
-                    logger.debug(f"Found flow file at: {path}")
-                    flow_file_path = path
-                    try:
-                        with open(path, 'r', encoding='utf-8') as f:
-                            flow_content = f.read()
-                        break
-                    except Exception as read_error:
-                        logger.error(f"Failed to read flow file {path}: {read_error}")
-                        continue
-
-            if flow_content is None:
-                # Try to search more broadly in case the file is in a different location
-                logger.debug("Flow file not found in standard locations, searching broadly...")
-                for root, dirs, files in os.walk("."):
-                    for file in files:
-                        if file == f"{flow_developer_name}.flow-meta.xml":
-                            found_path = Path(root) / file
-                            logger.debug(f"Found flow file at: {found_path}")
-                            flow_file_path = found_path
-                            try:
-                                with open(found_path, 'r', encoding='utf-8') as f:
-                                    flow_content = f.read()
-                                break
-                            except Exception as read_error:
-                                logger.error(f"Failed to read flow file {found_path}: {read_error}")
-                                continue
-                    if flow_content:
-                        break
-
-            if flow_content is None:
-                # Provide more helpful error message with debugging info
-                error_msg = f"Flow file not found after retrieve: {flow_developer_name}\n"
-                error_msg += f"Retrieve command output: {retrieve_output}\n"
-                error_msg += f"Searched paths: {possible_paths}\n"
+        started = time.monotonic()
+        updated: List[IndexedFlow] = []
+        errors: Dict[str, str] = {}
+        async for described in self.iter_describe_flows(stale):
+            name = described["flowDeveloperName"]
+            if "error" in described:
+                errors[name] = described["error"]
+                continue
+            try:
+                model, dependencies = flow_dependencies(described["flowContent"])
+            except Exception as e:
+                errors[name] = f"Could not parse flow metadata: {e}"
+                continue
+            indexed = IndexedFlow(
+                developer_name=name,
+                version_id=described["versionId"] or flows[name]["latestVersionId"],
+                dependencies=dependencies,
+                label=model.get("label"),
+                process_type=model.get("processType"),
+                trigger_type=model["start"].get("triggerType"),
+            )
+            index.put(indexed)
+            updated.append(indexed)
+        for name, flow in flows.items():
+            indexed_flow = index.get(name)
+            if indexed_flow is not None:
+                indexed_flow.is_active = flow["isActive"]
+        index.errors = errors
+
+        if self._catalog is not None and (updated or len(index) != len(indexed_versions)):
+            await asyncio.to_thread(
+                self._catalog.save_flow_index, self._org_alias, updated, keep=list(flows)
+            )
+        if stale:
+            logger.info(
+                f"Indexed {len(updated)} of {len(stale)} changed flows for {self._org_alias} "
+                f"in {time.monotonic() - started:.2f}s"
+            )
+        return index
+
+    async def _cached_flow_xml(self, version_id: str) -> str | None:
+        entry = self._flow_xml.get((self._org_alias, version_id))
+        if entry is not None:
+            return entry.value
+        if self._catalog is None:
+            return None
+        xml = await asyncio.to_thread(
+            self._catalog.load_flow_metadata, self._org_alias, version_id
+        )
+        if xml is not None:
+            self._flow_xml.put((self._org_alias, version_id), xml, len(xml))
+        return xml
+
+    async def _cache_flow_xml(
+        self, version_id: str, flow_developer_name: str, xml: str
+    ) -> None:
+        self._flow_xml.put((self._org_alias, version_id), xml, len(xml))
+        if self._catalog is not None:
+            await asyncio.to_thread(
+                self._catalog.save_flow_metadata,
+                self._org_alias,
+                version_id,
+                flow_developer_name,
+                xml,
+            )
 
-                # List current directory contents for debugging
-                try:
-                    current_files = []
-                    for root, dirs, files in os.walk("."):
-                        for file in files:
-                            if flow_developer_name.lower() in file.lower():
-                                current_files.append(os.path.join(root, file))
-                    if current_files:
-                        error_msg += f"Files found with flow name: {current_files}"
-                    else:
-                        error_msg += "No files found containing the flow name"
-                except Exception as search_err:
-                    error_msg += f"Error searching for files: {search_err}"
-
-                raise Exception(error_msg)
-
-            # Clean up: remove the retrieved file
-            if flow_file_path:
-                try:
-                    flow_file_path.unlink()
-                    logger.debug(f"Cleaned up flow file: {flow_file_path}")
-
-                    # Also clean up empty directories if they exist
-                    parent_dir = flow_file_path.parent
-                    if parent_dir.exists() and not any(parent_dir.iterdir()):
-                        parent_dir.rmdir()
-                        logger.debug(f"Cleaned up empty directory: {parent_dir}")
-
-                        # Clean up parent directories if they're empty too
-                        grandparent = parent_dir.parent
-                        if grandparent.name in ["flows", "default", "main"] and grandparent.exists():
-                            if not any(grandparent.iterdir()):
-                                grandparent.rmdir()
-                                logger.debug(f"Cleaned up empty directory: {grandparent}")
-
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to clean up flow file {flow_file_path}: {cleanup_error}")
-
-            return {
-                "flowDeveloperName": flow_developer_name,
-                "flowContent": flow_content,
-                "contentLength": len(flow_content),
-                "filePath": str(flow_file_path) if flow_file_path else "unknown",
+    async def _retrieve_flows(self, flow_developer_names: List[str]) -> Dict[str, str]:
+        """Retrieve the XML of several flows in one metadata retrieve"""
+        started = time.monotonic()
+        files = await self._transport.retrieve_metadata(
+            {"Flow": flow_developer_names},
+            poll_interval=settings.retrieve_poll_interval,
+            timeout=clamp(settings.retrieve_timeout),
+        )
+        flows = {}
+        for name in flow_developer_names:
+            for key in flow_file_keys(name):
+                if key in files:
+                    flows[name] = files[key].decode("utf-8")
+                    break
+        logger.debug(
+            f"Retrieved {len(flows)} of {len(flow_developer_names)} flows "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return flows
+
+def _join_flows(
+    definitions: List[Dict[str, Any]], versions: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Combine each FlowDefinition with its latest Flow version"""
+    flows = []
+    for flow_def in definitions:
+        latest_version_id = flow_def.get("LatestVersionId")
+        active_version_id = flow_def.get("ActiveVersionId")
+        flow = versions.get(latest_version_id or "")
+        if flow is None:
+            continue
+        flows.append(
+            {
+                "id": flow["Id"],
+                "masterLabel": flow.get("MasterLabel"),
+                "status": flow.get("Status"),
+                "versionNumber": flow.get("VersionNumber"),
+                "developerName": flow_def.get("DeveloperName"),
+                "definitionId": flow_def["Id"],
+                "isActive": latest_version_id == active_version_id,
+                "activeVersionId": active_version_id,
+                "latestVersionId": latest_version_id,
             }
-
-        except Exception as e:
-            logger.error(f"Failed to describe flow {flow_developer_name}: {e}")
-            raise Exception(f"Failed to retrieve flow metadata: {e}")
+        )
+    return flows
+
+
+def _flow_description(
+    flow_developer_name: str, flow_content: str, version_id: str | None, *, cached: bool
+) -> Dict[str, Any]:
+    return {
+        "flowDeveloperName": flow_developer_name,
+        "flowContent": flow_content,
+        "contentLength": len(flow_content),
+        "filePath": f"flows/{flow_developer_name}.flow",
+        "versionId": version_id,
+        "cached": cached,
+    }
+
+
+def _listing_conditions(
+    *,
+    folder: str | None,
+    search: str | None,
+    owner_id: str | None,
+    name_field: str = "Name",
+) -> List[str]:
+    """SOQL conditions shared by the report and dashboard listings"""
+    conditions = []
+    if folder is not None:
+        conditions.append(f"FolderName = {quote(folder)}")
+    if search:
+        pattern = search if "%" in search else f"%{search}%"
+        conditions.append(f"{name_field} LIKE {quote(pattern)}")
+    if owner_id is not None:
+        conditions.append(f"OwnerId = {quote(owner_id)}")
+    return conditions
+
+
+def _high_water(records: List[Dict[str, Any]], current: str | None = None) -> str | None:
+    """The latest LastModifiedDate among `records` and `current`"""
+    dates = [r["LastModifiedDate"] for r in records if r.get("LastModifiedDate")]
+    if current:
+        dates.append(current)
+    return max(dates, key=parse_datetime, default=None)
@@ -0,0 +1,220 @@
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import re
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Tuple, TypeVar
+
+logger = logging.getLogger("sfmcp.scheduler")
+
+T = TypeVar("T")
+
+LIMIT_ERROR_CODE = "REQUEST_LIMIT_EXCEEDED"
+_API_USAGE_RE = re.compile(r"api-usage=(\d+)/(\d+)")
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first"""
+
+    INTERACTIVE = 0  # tool calls an agent is waiting on
+    BACKGROUND = 1  # warm-up, catalog refreshes
+
+
+_priority: ContextVar[Priority] = ContextVar(
+    "sfmcp_request_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def background() -> Iterator[None]:
+    """Run the requests made in this block, and in tasks it starts, as background work"""
+    token = _priority.set(Priority.BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def is_limit_error(error: BaseException) -> bool:
+    """Whether Salesforce rejected a request for exceeding the org's request limits"""
+    if getattr(error, "error_code", None) == LIMIT_ERROR_CODE:
+        return True
+    return LIMIT_ERROR_CODE in str(error)  # CLI errors only carry the message
+
+
+class RequestScheduler:
+    """Admission control for the requests one SalesforceClient sends to its org
+
+    At most `max_concurrency` requests (HTTP requests or `sf` processes) run at once,
+    of which at most `background_concurrency` are background work; waiting interactive
+    requests always go first. The org's API usage is tracked from Sforce-Limit-Info
+    headers, and once less than `reserve` of the daily allowance is left background
+    requests are refused so interactive ones keep working. A REQUEST_LIMIT_EXCEEDED
+    error pauses every request for an exponentially growing, jittered delay, and
+    run() retries the request after it; the delay resets after a success.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 8,
+        background_concurrency: int = 2,
+        reserve: float = 0.1,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.background_concurrency = min(background_concurrency, max_concurrency)
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.api_usage: Tuple[int, int] | None = None
+        self._active = 0
+        self._active_background = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._consecutive_limit_errors = 0
+        self.requests = 0
+        self.queued = 0
+        self.limit_errors = 0
+        self.retries = 0
+        self.deferred = 0
+
+    def record_limit_info(self, header: str) -> None:
+        """Track API usage from a Sforce-Limit-Info header (api-usage=used/max)"""
+        if match := _API_USAGE_RE.search(header):
+            self.api_usage = (int(match.group(1)), int(match.group(2)))
+
+    def _allowance_low(self) -> bool:
+        if self.api_usage is None or not self.api_usage[1]:
+            return False
+        used, allowed = self.api_usage
+        return allowed - used < self.reserve * allowed
+
+    def _can_start(self, priority: int) -> bool:
+        if self._active >= self.max_concurrency:
+            return False
+        return (
+            priority == Priority.INTERACTIVE
+            or self._active_background < self.background_concurrency
+        )
+
+    def _start(self, priority: int) -> None:
+        self._active += 1
+        if priority == Priority.BACKGROUND:
+            self._active_background += 1
+
+    def _release(self, priority: int) -> None:
+        self._active -= 1
+        if priority == Priority.BACKGROUND:
+            self._active_background -= 1
+        # Hand freed slots to the most urgent waiters, in arrival order within a class
+        while self._waiters:
+            waiter_priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)  # cancelled while waiting
+                continue
+            if not self._can_start(waiter_priority):
+                break
+            heapq.heappop(self._waiters)
+            self._start(waiter_priority)
+            future.set_result(None)
+
+    async def _acquire(self, priority: Priority) -> None:
+        if priority == Priority.BACKGROUND and self._allowance_low():
+            self.deferred += 1
+            used, allowed = self.api_usage or (0, 0)
+            raise Exception(
+                f"Salesforce API allowance is low ({used} of {allowed} requests used); "
+                "background request deferred"
+            )
+        self.requests += 1
+        ahead = any(p <= priority for p, _, f in self._waiters if not f.done())
+        if self._can_start(priority) and not ahead:
+            self._start(priority)
+        else:
+            self.queued += 1
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release(priority)  # the slot was granted as we were cancelled
+                raise
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._release(priority)
+                raise
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a request slot, at the priority of the current context, for one request"""
+        priority = _priority.get()
+        await self._acquire(priority)
+        try:
+            yield
+        except Exception as e:
+            if is_limit_error(e):
+                self._limit_exceeded()
+            raise
+        else:
+            self._consecutive_limit_errors = 0
+        finally:
+            self._release(priority)
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether a request that failed after `attempt` retries is sent again
+
+        The backoff itself happens when the retry waits for its slot.
+        """
+        if not is_limit_error(error) or attempt >= self.max_retries:
+            return False
+        self.retries += 1
+        return True
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run one request in a slot, retrying after a backoff when it hits the limits"""
+        attempt = 0
+        while True:
+            try:
+                async with self.slot():
+                    return await call()
+            except Exception as e:
+                if not self.should_retry(e, attempt):
+                    raise
+                attempt += 1
+
+    def _limit_exceeded(self) -> None:
+        self.limit_errors += 1
+        self._consecutive_limit_errors += 1
+        delay = min(self.max_backoff, self.backoff * 2 ** (self._consecutive_limit_errors - 1))
+        delay *= random.uniform(0.5, 1.5)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning(f"Salesforce request limit exceeded; pausing requests for {delay:.1f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self._active,
+            "active_background": self._active_background,
+            "waiting": sum(1 for _, _, future in self._waiters if not future.done()),
+            "requests": self.requests,
+            "queued": self.queued,
+            "limit_errors": self.limit_errors,
+            "retries": self.retries,
+            "deferred": self.deferred,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            "api_usage": list(self.api_usage) if self.api_usage else None,
+        }
@@ -1,33 +1,77 @@
 from __future__ import annotations
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from .client_registry import ClientRegistry
 from .config.logging import configure_logging
 from .config.settings import settings
+from .metrics import REGISTRY
+from .tracing import TracedFastMCP, configure as configure_tracing
 
 logger = logging.getLogger("sfmcp.server")
 
 # submodules
 from .tools import query as tool_query
 from .tools import describe as tool_describe
+from .tools import describe_many as tool_describe_many
 from .tools import list_objects as tool_list_objects
 from .tools import list_flows as tool_list_flows
 from .tools import list_reports as tool_list_reports
 from .tools import list_dashboards as tool_list_dashboards
+from .tools import run_report as tool_run_report
 from .tools import describe_flow as tool_describe_flow
+from .tools import describe_flows as tool_describe_flows
+from .tools import find_automation as tool_find_automation
+from .tools import bulk_query as tool_bulk_query
+from .tools import result_page as tool_result_page
+from .tools import server_stats as tool_server_stats
 # from .resources import saved_queries as res_saved_queries
 # from .prompts import opps_by_stage as prm_opps_by_stage
 
-mcp = FastMCP("sfmcp")
+# One SalesforceClient per org, shared by every tool for the life of the process
+clients = ClientRegistry()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP[ClientRegistry]) -> AsyncIterator[ClientRegistry]:
+    async with clients.session(
+        warm_up=settings.warmup,
+        hot_objects=settings.warmup_object_names,
+        refresh_interval=settings.catalog_refresh_interval if settings.catalog_enabled else 0,
+    ) as registry:
+        yield registry
+
+
+# Tool calls are traced (and result serialization timed) when SFMCP_TRACE_FILE is set
+mcp = TracedFastMCP("sfmcp", lifespan=lifespan)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])  # type: ignore[untyped-decorator]
+async def metrics(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint of the HTTP server"""
+    return PlainTextResponse(
+        REGISTRY.render(clients.stats()), media_type="text/plain; version=0.0.4"
+    )
 
 
 def _register_all() -> None:
-    tool_query.register(mcp)
-    tool_describe.register(mcp)
-    tool_list_objects.register(mcp)
-    tool_list_flows.register(mcp)
-    tool_list_reports.register(mcp)
-    tool_list_dashboards.register(mcp)
-    tool_describe_flow.register(mcp)
+    tool_query.register(mcp, clients)
+    tool_describe.register(mcp, clients)
+    tool_describe_many.register(mcp, clients)
+    tool_list_objects.register(mcp, clients)
+    tool_list_flows.register(mcp, clients)
+    tool_list_reports.register(mcp, clients)
+    tool_list_dashboards.register(mcp, clients)
+    tool_run_report.register(mcp, clients)
+    tool_describe_flow.register(mcp, clients)
+    tool_describe_flows.register(mcp, clients)
+    tool_find_automation.register(mcp, clients)
+    tool_bulk_query.register(mcp, clients)
+    tool_result_page.register(mcp, clients)
+    tool_server_stats.register(mcp, clients)
     # res_saved_queries.register(mcp)
     # prm_opps_by_stage.register(mcp)
 
@@ -35,15 +79,20 @@ def _register_all() -> None:
 def run_stdio() -> None:
     # Disable logging for STDIO mode to avoid interfering with MCP protocol
     configure_logging(level=logging.CRITICAL)
+    configure_tracing(settings.trace_file)
     _register_all()
     mcp.run()
 
 
 def run_http() -> None:
     configure_logging()
+    configure_tracing(settings.trace_file)
     _register_all()
 
     # FastMCP provides direct HTTP support
     import asyncio
-    logger.info(f"Starting SFMCP HTTP server at {settings.http_host}:{settings.http_port}")
+    logger.info(
+        f"Starting SFMCP HTTP server at {settings.http_host}:{settings.http_port} "
+        "(Prometheus metrics on /metrics)"
+    )
     asyncio.run(mcp.run_sse_async())
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import asyncio
+import functools
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Concatenate, Coroutine, Dict, Hashable, ParamSpec
+from typing import Protocol, TypeVar
+
+logger = logging.getLogger("sfmcp.singleflight")
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future[Any]
+    waiters: int = 0
+
+
+class Singleflight:
+    """Coalesces concurrent calls with the same key onto a single in-flight call
+
+    The first caller for a key starts the call; callers arriving while it is running
+    await the same result (or exception) instead of starting their own. Nothing is
+    cached once the call completes. The call runs in a task of its own, so a caller
+    that is cancelled (the first one included) stops waiting without cancelling it
+    and the other waiters still get their result; once every caller has gone, the
+    call is cancelled.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Flight] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, operation: str, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        counts = self._counts.setdefault(operation, {"calls": 0, "coalesced": 0})
+        full_key = (operation, key)
+        flight = self._calls.get(full_key)
+        if flight is not None:
+            counts["coalesced"] += 1
+        else:
+            counts["calls"] += 1
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._calls[full_key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(full_key, flight))
+        flight.waiters += 1
+        try:
+            result: T = await asyncio.shield(flight.task)
+            return result
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is left to take the result: later callers start afresh
+                self._forget(full_key, flight)
+                flight.task.cancel()
+
+    def _forget(self, full_key: Hashable, flight: _Flight) -> None:
+        if self._calls.get(full_key) is flight:
+            del self._calls[full_key]
+        if flight.task.done() and not flight.task.cancelled():
+            flight.task.exception()  # retrieved: the callers that wanted it have gone
+
+    def stats(self) -> Dict[str, Any]:
+        calls = sum(counts["calls"] for counts in self._counts.values())
+        coalesced = sum(counts["coalesced"] for counts in self._counts.values())
+        return {
+            "calls": calls,
+            "coalesced": coalesced,
+            "in_flight": len(self._calls),
+            "by_operation": {name: dict(counts) for name, counts in self._counts.items()},
+        }
+
+
+class _Coalescing(Protocol):
+    _inflight: Singleflight
+
+
+S = TypeVar("S", bound=_Coalescing)
+
+
+Method = Callable[Concatenate[S, P], Coroutine[Any, Any, T]]
+
+
+def coalesce(
+    operation: str, key: Callable[..., Hashable] | None = None
+) -> Callable[[Method[S, P, T]], Method[S, P, T]]:
+    """Decorate an async method so concurrent identical calls share one execution
+
+    `key` maps the method's arguments to the coalescing key; by default the positional
+    and keyword arguments are used as they are.
+    """
+
+    def decorator(method: Method[S, P, T]) -> Method[S, P, T]:
+        async def wrapper(self: S, /, *args: P.args, **kwargs: P.kwargs) -> T:
+            call_key = (
+                key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            )
+            return await self._inflight.do(
+                operation, call_key, lambda: method(self, *args, **kwargs)
+            )
+
+        functools.update_wrapper(wrapper, method)
+        return wrapper
+
+    return decorator
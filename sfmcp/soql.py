@@ -0,0 +1,108 @@
+from __future__ import annotations
+import re
+from datetime import datetime, timezone
+from typing import Iterator, List, Tuple
+
+_WORD_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# Clauses that must follow LIMIT in a SOQL statement
+_AFTER_LIMIT = {"OFFSET", "FOR", "UPDATE"}
+
+
+def _top_level_words(soql: str) -> Iterator[Tuple[int, str]]:
+    """Yield (position, upper-cased word) for words outside string literals and subqueries"""
+    depth = 0
+    i = 0
+    while i < len(soql):
+        char = soql[i]
+        if char == "'":
+            # Skip the literal, honouring backslash escapes
+            i += 1
+            while i < len(soql) and soql[i] != "'":
+                i += 2 if soql[i] == "\\" else 1
+            i += 1
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and (match := _WORD_RE.match(soql, i)):
+            yield i, match.group(0).upper()
+            i = match.end()
+            continue
+        i += 1
+
+
+def apply_limit(soql: str, limit: int) -> str:
+    """Push a row limit into a SOQL statement
+
+    An existing top-level LIMIT is lowered to `limit` if it is larger; otherwise a
+    LIMIT clause is inserted before any OFFSET / FOR / UPDATE clause.
+    """
+    soql = soql.strip().rstrip(";")
+    words = list(_top_level_words(soql))
+    for index, (position, word) in enumerate(words):
+        if word == "LIMIT":
+            match = re.match(r"LIMIT\s+(\d+)", soql[position:], re.IGNORECASE)
+            if match is None:
+                return soql
+            if int(match.group(1)) <= limit:
+                return soql
+            return f"{soql[:position]}LIMIT {limit}{soql[position + match.end():]}"
+        if word in _AFTER_LIMIT and index > 0:
+            return f"{soql[:position].rstrip()} LIMIT {limit} {soql[position:]}"
+    return f"{soql} LIMIT {limit}"
+
+
+def normalize(soql: str) -> str:
+    """Canonical form of a statement for use as a cache key
+
+    SOQL keywords, field and object names are case-insensitive, so everything outside
+    string literals is lower-cased and runs of whitespace are collapsed.
+    """
+    parts: List[str] = []
+    i = 0
+    soql = soql.strip().rstrip(";").strip()
+    while i < len(soql):
+        if soql[i] == "'":
+            end = i + 1
+            while end < len(soql) and soql[end] != "'":
+                end += 2 if soql[end] == "\\" else 1
+            parts.append(soql[i : end + 1])
+            i = end + 1
+            continue
+        end = soql.find("'", i)
+        end = len(soql) if end < 0 else end
+        parts.append(re.sub(r"\s+", " ", soql[i:end].lower()))
+        i = end
+    return "".join(parts)
+
+
+def from_object(soql: str) -> str | None:
+    """The SObject named in the statement's top-level FROM clause"""
+    words = iter(_top_level_words(soql))
+    for _, word in words:
+        if word == "FROM":
+            position, _ = next(words, (-1, ""))
+            if position < 0:
+                return None
+            match = _WORD_RE.match(soql, position)
+            return match.group(0) if match else None
+    return None
+
+
+def quote(value: str) -> str:
+    """Quote a value as a SOQL string literal"""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def datetime_literal(value: str | datetime) -> str:
+    """Format a datetime, or a Salesforce datetime string, as a SOQL datetime literal"""
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse a Salesforce datetime such as 2024-05-01T12:30:00.000+0000"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
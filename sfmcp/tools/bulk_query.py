@@ -0,0 +1,53 @@
+from __future__ import annotations
+import secrets
+import time
+from pathlib import Path
+from pydantic import BaseModel, Field, field_validator
+from mcp.server.fastmcp import FastMCP
+from ..client_registry import ClientRegistry
+from ..config.settings import settings
+
+
+class BulkQueryArgs(BaseModel):
+    soql: str = Field(..., description="SOQL query string")
+    file_name: str | None = Field(
+        None, description="CSV file name to write in the server's bulk output directory"
+    )
+
+    @field_validator("file_name")
+    @classmethod
+    def _plain_file_name(cls, value: str | None) -> str | None:
+        if value is not None and (Path(value).name != value or value.startswith(".")):
+            raise ValueError("file_name must be a plain file name without directories")
+        return value
+
+
+class BulkQueryResult(BaseModel):
+    job_id: str | None = None
+    row_count: int = Field(..., description="Number of rows written to the CSV file")
+    path: str = Field(..., description="Location of the CSV file on the server")
+    size_bytes: int
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
+    @mcp.tool(
+        name="salesforce_bulk_query",
+        description=(
+            "Run a large SOQL extract through the Bulk API 2.0 and write it to a CSV file "
+            "on the server; returns the file location and row count instead of the rows"
+        ),
+    )
+    @clients.tool("bulk_query")
+    async def salesforce_bulk_query(args: BulkQueryArgs) -> BulkQueryResult:
+        sf = clients.get()
+        file_name = args.file_name or (
+            f"bulk-{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(4)}.csv"
+        )
+        destination = Path(settings.bulk_output_dir).expanduser() / file_name
+        result = await sf.bulk_query(args.soql, destination)
+        return BulkQueryResult(
+            job_id=result.get("jobId"),
+            row_count=result["rowCount"],
+            path=result["path"],
+            size_bytes=result["bytes"],
+        )
@@ -1,9 +1,9 @@
 from __future__ import annotations
 import asyncio
-from typing import Any, List
+from typing import Any, Dict, List
 from pydantic import BaseModel, Field
 from mcp.server.fastmcp import FastMCP
-from ..salesforce_client import SalesforceClient
+from ..client_registry import ClientRegistry
 
 
 class DescribeArgs(BaseModel):
@@ -23,37 +23,42 @@ class DescribeResult(BaseModel):
     fields: List[FieldInfo]
 
 
-def register(mcp: FastMCP) -> None:
+def field_infos(describe_data: Dict[str, Any]) -> List[FieldInfo]:
+    """Extract field information from an SObject describe"""
+    fields = []
+    for field_data in describe_data.get("fields", []):
+        # Extract picklist values if present
+        picklist_values = None
+        if (
+            field_data.get("type") == "picklist"
+            and "picklistValues" in field_data
+        ):
+            picklist_values = [
+                pv.get("value")
+                for pv in field_data["picklistValues"]
+                if pv.get("active")
+            ]
+
+        field_info = FieldInfo(
+            name=field_data.get("name", ""),
+            type=field_data.get("type", ""),
+            label=field_data.get("label"),
+            nillable=field_data.get("nillable"),
+            picklistValues=picklist_values,
+        )
+        fields.append(field_info)
+    return fields
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
     @mcp.tool(
         name="salesforce_describe",
         description="Describe an SObject and return field information",
     )
+    @clients.tool("describe")
     async def describe_object(args: DescribeArgs) -> DescribeResult:
-        sf = SalesforceClient.from_env()
+        sf = clients.get()
         describe_data = await sf.describe_object(args.object_api_name)
 
-        # Extract field information
-        fields = []
-        for field_data in describe_data.get("fields", []):
-            # Extract picklist values if present
-            picklist_values = None
-            if (
-                field_data.get("type") == "picklist"
-                and "picklistValues" in field_data
-            ):
-                picklist_values = [
-                    pv.get("value")
-                    for pv in field_data["picklistValues"]
-                    if pv.get("active")
-                ]
-
-            field_info = FieldInfo(
-                name=field_data.get("name", ""),
-                type=field_data.get("type", ""),
-                label=field_data.get("label"),
-                nillable=field_data.get("nillable"),
-                picklistValues=picklist_values,
-            )
-            fields.append(field_info)
-
+        fields = field_infos(describe_data)
         return DescribeResult(object_api_name=args.object_api_name, fields=fields)
@@ -1,33 +1,71 @@
 from __future__ import annotations
+from typing import Any, Dict, List, Literal
 from pydantic import BaseModel, Field
 from mcp.server.fastmcp import FastMCP
-from ..salesforce_client import SalesforceClient
+from ..client_registry import ClientRegistry
+from ..flow_model import parse_flow
+
+FlowMode = Literal["xml", "summary", "structured"]
+MODE_DESCRIPTION = (
+    "xml: the raw flow XML; summary: trigger, element counts and the objects and fields "
+    "the flow touches; structured: the summary plus the elements and their connectors"
+)
+ELEMENT_TYPES_DESCRIPTION = (
+    "structured mode: only return elements of these types (e.g., [decisions, recordUpdates])"
+)
 
 
 class DescribeFlowArgs(BaseModel):
     flow_developer_name: str = Field(..., description="Flow developer name (e.g., Contact_Last_Reply_Date)")
+    mode: FlowMode = Field("xml", description=MODE_DESCRIPTION)
+    element_types: List[str] | None = Field(None, description=ELEMENT_TYPES_DESCRIPTION)
 
 
 class DescribeFlowResult(BaseModel):
     flowDeveloperName: str
-    flowContent: str
+    flowContent: str | None = Field(default=None, description="Flow XML (xml mode)")
     contentLength: int
     filePath: str
+    versionId: str | None = Field(
+        default=None, description="Flow version the XML belongs to (the latest version)"
+    )
+    cached: bool = Field(default=False, description="Served from the flow cache")
+    flow: Dict[str, Any] | None = Field(
+        default=None, description="Parsed flow model (summary and structured modes)"
+    )
+
+
+def flow_model(
+    flow_content: str, mode: FlowMode, element_types: List[str] | None = None
+) -> Dict[str, Any] | None:
+    """The parsed flow model a describe mode asks for (None for xml)"""
+    if mode == "xml":
+        return None
+    return parse_flow(
+        flow_content, include_elements=mode == "structured", element_types=element_types
+    )
 
 
-def register(mcp: FastMCP) -> None:
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
     @mcp.tool(
         name="salesforce_describe_flow",
-        description="Retrieve the full XML metadata for a specific Salesforce flow by developer name",
+        description=(
+            "Retrieve the full XML metadata for a specific Salesforce flow by developer name, "
+            "or a parsed summary or structured model of it"
+        ),
     )
+    @clients.tool("describe_flow")
     async def describe_salesforce_flow(args: DescribeFlowArgs) -> DescribeFlowResult:
         """Get the complete flow definition XML by retrieving it from Salesforce"""
-        sf = SalesforceClient.from_env()
+        sf = clients.get()
         flow_data = await sf.describe_flow(args.flow_developer_name)
 
         return DescribeFlowResult(
             flowDeveloperName=flow_data["flowDeveloperName"],
-            flowContent=flow_data["flowContent"],
+            flowContent=flow_data["flowContent"] if args.mode == "xml" else None,
             contentLength=flow_data["contentLength"],
             filePath=flow_data["filePath"],
-        )
\ No newline at end of file
+            versionId=flow_data.get("versionId"),
+            cached=flow_data.get("cached", False),
+            flow=flow_model(flow_data["flowContent"], args.mode, args.element_types),
+        )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+from pydantic import BaseModel, Field, model_validator
+from mcp.server.fastmcp import Context, FastMCP
+from ..client_registry import ClientRegistry
+from .describe_flow import ELEMENT_TYPES_DESCRIPTION, MODE_DESCRIPTION, FlowMode, flow_model
+
+
+class DescribeFlowsArgs(BaseModel):
+    flow_developer_names: List[str] | None = Field(
+        None, description="Flow developer names (e.g., [Contact_Last_Reply_Date])"
+    )
+    all_active: bool = Field(False, description="Describe every flow that has an active version")
+    mode: FlowMode = Field("xml", description=MODE_DESCRIPTION)
+    element_types: List[str] | None = Field(None, description=ELEMENT_TYPES_DESCRIPTION)
+
+    @model_validator(mode="after")
+    def _names_or_all_active(self) -> "DescribeFlowsArgs":
+        if not self.flow_developer_names and not self.all_active:
+            raise ValueError("Give flow_developer_names or set all_active")
+        return self
+
+
+class FlowDescription(BaseModel):
+    flowDeveloperName: str
+    flowContent: str | None = None
+    contentLength: int | None = None
+    versionId: str | None = None
+    cached: bool = False
+    flow: Dict[str, Any] | None = None
+    error: str | None = Field(default=None, description="Why the flow could not be described")
+
+
+class DescribeFlowsResult(BaseModel):
+    flows: List[FlowDescription]
+    total_count: int = Field(..., description="Number of flows described")
+    error_count: int = Field(..., description="Number of flows that could not be described")
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
+    @mcp.tool(
+        name="salesforce_describe_flows",
+        description=(
+            "Retrieve the XML metadata of many flows, or of all active flows, in a single "
+            "metadata retrieve"
+        ),
+    )
+    @clients.tool("describe_flows")
+    async def describe_salesforce_flows(
+        args: DescribeFlowsArgs, ctx: Context[Any, Any, Any]
+    ) -> DescribeFlowsResult:
+        """Get the flow definition XML of several flows at once"""
+        sf = clients.get()
+        flows: List[FlowDescription] = []
+        async for flow_data in sf.iter_describe_flows(
+            args.flow_developer_names, all_active=args.all_active
+        ):
+            description = FlowDescription.model_validate(flow_data)
+            if description.flowContent is not None and args.mode != "xml":
+                description.flow = flow_model(
+                    description.flowContent, args.mode, args.element_types
+                )
+                description.flowContent = None
+            flows.append(description)
+            await _report_progress(ctx, len(flows), flow_data["flowDeveloperName"])
+
+        errors = sum(1 for flow in flows if flow.error)
+        return DescribeFlowsResult(
+            flows=flows, total_count=len(flows) - errors, error_count=errors
+        )
+
+
+async def _report_progress(
+    ctx: Context[Any, Any, Any], done: int, flow_developer_name: str
+) -> None:
+    """Send a progress notification per flow, when the client asked for progress"""
+    try:
+        await ctx.report_progress(done, message=f"Described {flow_developer_name}")
+    except ValueError:
+        pass  # called outside an MCP request
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import asyncio
+from typing import Any, Dict, List, Literal
+from pydantic import BaseModel, Field
+from mcp.server.fastmcp import FastMCP
+from ..client_registry import ClientRegistry
+from ..config.settings import settings
+from .describe import field_infos
+
+FieldAttribute = Literal["type", "label", "nillable", "picklistValues"]
+
+
+class DescribeManyArgs(BaseModel):
+    object_api_names: List[str] = Field(
+        ..., min_length=1, max_length=200, description="SObject API names, e.g., [Account, Contact]"
+    )
+    fields: List[str] | None = Field(
+        None, description="Only return these fields of each object (case-insensitive)"
+    )
+    attributes: List[FieldAttribute] | None = Field(
+        None, description="Only return these field attributes besides the field name"
+    )
+
+
+class ObjectDescribe(BaseModel):
+    object_api_name: str
+    fields: List[Dict[str, Any]]
+
+
+class DescribeManyResult(BaseModel):
+    objects: List[ObjectDescribe]
+    errors: Dict[str, str] = Field(
+        default_factory=dict, description="Objects that could not be described, with the reason"
+    )
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
+    @mcp.tool(
+        name="salesforce_describe_many",
+        description=(
+            "Describe several SObjects in one call and return their field information, "
+            "optionally limited to some fields and field attributes"
+        ),
+    )
+    @clients.tool("describe_many")
+    async def describe_many(args: DescribeManyArgs) -> DescribeManyResult:
+        sf = clients.get()
+        # Object names are case-insensitive; describe each one once, in the order given
+        names: List[str] = []
+        for name in args.object_api_names:
+            if name.lower() not in {seen.lower() for seen in names}:
+                names.append(name)
+        wanted_fields = {name.lower() for name in args.fields} if args.fields else None
+        include = {"name", *args.attributes} if args.attributes else None
+        semaphore = asyncio.Semaphore(settings.describe_many_concurrency)
+
+        async def describe(name: str) -> ObjectDescribe:
+            async with semaphore:
+                describe_data = await sf.describe_object(name)
+            return ObjectDescribe(
+                object_api_name=describe_data.get("name", name),
+                fields=[
+                    field.model_dump(include=include, exclude_none=True)
+                    for field in field_infos(describe_data)
+                    if wanted_fields is None or field.name.lower() in wanted_fields
+                ],
+            )
+
+        results = await asyncio.gather(
+            *(describe(name) for name in names), return_exceptions=True
+        )
+        objects: List[ObjectDescribe] = []
+        errors: Dict[str, str] = {}
+        for name, result in zip(names, results, strict=True):
+            if isinstance(result, ObjectDescribe):
+                objects.append(result)
+            elif isinstance(result, Exception):
+                errors[name] = str(result)
+            else:
+                raise result
+        return DescribeManyResult(objects=objects, errors=errors)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+from typing import Dict, List, Literal
+from pydantic import BaseModel, Field
+from mcp.server.fastmcp import FastMCP
+from ..client_registry import ClientRegistry
+
+Operation = Literal["trigger", "create", "read", "update", "delete"]
+
+
+class FindAutomationArgs(BaseModel):
+    object_api_name: str = Field(..., description="SObject API name (e.g., Case)")
+    field_api_name: str | None = Field(
+        None, description="Only flows that use this field of the object (e.g., Status)"
+    )
+    operations: List[Operation] | None = Field(
+        None,
+        description=(
+            "Only these uses: trigger (record-triggered on the object, or $Record fields), "
+            "create, read, update, delete"
+        ),
+    )
+    active_only: bool = Field(False, description="Only flows whose latest version is active")
+
+
+class AutomationFlow(BaseModel):
+    flowDeveloperName: str
+    label: str | None = None
+    versionId: str
+    isActive: bool
+    processType: str | None = None
+    triggerType: str | None = None
+    operations: List[str] = Field(..., description="How the flow uses the object or field")
+    fields: List[str] = Field(..., description="Fields of the object the flow uses that way")
+
+
+class FindAutomationResult(BaseModel):
+    flows: List[AutomationFlow]
+    total_count: int
+    indexed_flows: int = Field(..., description="Number of flows in the dependency index")
+    errors: Dict[str, str] = Field(
+        default_factory=dict, description="Flows that could not be indexed, with the reason"
+    )
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
+    @mcp.tool(
+        name="salesforce_find_automation",
+        description=(
+            "Find the flows that trigger on, read, create, update or delete an SObject or "
+            "one of its fields, from a local dependency index of the org's flows"
+        ),
+    )
+    @clients.tool("find_automation")
+    async def find_automation(args: FindAutomationArgs) -> FindAutomationResult:
+        sf = clients.get()
+        index = await sf.automation_index()
+        flows = [
+            AutomationFlow(
+                flowDeveloperName=match.flow.developer_name,
+                label=match.flow.label,
+                versionId=match.flow.version_id,
+                isActive=match.flow.is_active,
+                processType=match.flow.process_type,
+                triggerType=match.flow.trigger_type,
+                operations=sorted(match.operations),
+                fields=sorted(match.fields),
+            )
+            for match in index.find(args.object_api_name, args.field_api_name, args.operations)
+            if match.flow.is_active or not args.active_only
+        ]
+        return FindAutomationResult(
+            flows=flows, total_count=len(flows), indexed_flows=len(index), errors=index.errors
+        )
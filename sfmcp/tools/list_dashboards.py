@@ -1,48 +1,123 @@
 from __future__ import annotations
-from typing import List
-from pydantic import BaseModel, Field
+from typing import List, Literal
+from pydantic import BaseModel, ConfigDict, Field
 from mcp.server.fastmcp import FastMCP
-from ..salesforce_client import SalesforceClient
+from ..client_registry import ClientRegistry
+from ..columnar import FORMAT_DESCRIPTION, ColumnarRows, ResultFormat, to_columnar
+from ..salesforce_client import DASHBOARD_FIELDS
+
+DashboardField = Literal[
+    "title",
+    "developerName",
+    "folderName",
+    "description",
+    "ownerId",
+    "lastViewedDate",
+    "lastReferencedDate",
+]
+
+
+class ListDashboardsArgs(BaseModel):
+    folder: str | None = Field(None, description="Only dashboards in this folder (exact name)")
+    search: str | None = Field(
+        None, description="Only dashboards whose title contains this text (% wildcards allowed)"
+    )
+    owner_id: str | None = Field(None, description="Only dashboards owned by this user id")
+    fields: List[DashboardField] | None = Field(
+        None, description="Only return these fields besides id (default: all)"
+    )
+    limit: int | None = Field(
+        None,
+        ge=1,
+        le=2000,
+        description="Return at most this many dashboards and a cursor for the rest",
+    )
+    cursor: str | None = Field(
+        None, description="Cursor from a previous result; fetches its next page"
+    )
+    format: ResultFormat = Field("records", description=FORMAT_DESCRIPTION)
 
 
 class DashboardInfo(BaseModel):
-    id: str
-    title: str | None = None
-    developerName: str | None = None
-    folderName: str | None = None
-    description: str | None = None
-    ownerId: str | None = None
-    lastViewedDate: str | None = None
-    lastReferencedDate: str | None = None
+    """A dashboard, read straight from a Dashboard record"""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: str = Field(..., validation_alias="Id")
+    title: str | None = Field(None, validation_alias="Title")
+    developerName: str | None = Field(None, validation_alias="DeveloperName")
+    folderName: str | None = Field(None, validation_alias="FolderName")
+    description: str | None = Field(None, validation_alias="Description")
+    ownerId: str | None = Field(None, validation_alias="OwnerId")
+    lastViewedDate: str | None = Field(None, validation_alias="LastViewedDate")
+    lastReferencedDate: str | None = Field(None, validation_alias="LastReferencedDate")
 
 
 class ListDashboardsResult(BaseModel):
-    dashboards: List[DashboardInfo]
-    total_count: int = Field(..., description="Total number of dashboards")
+    dashboards: List[DashboardInfo] = Field(
+        default_factory=list, description="The dashboards (empty in columnar format)"
+    )
+    columnar: ColumnarRows | None = Field(
+        default=None, description="The dashboards as columns (columnar format)"
+    )
+    total_count: int = Field(..., description="Number of dashboards matching the filters")
+    next_cursor: str | None = Field(
+        default=None, description="Pass as cursor to fetch the next page; null on the last page"
+    )
+
 
+# FolderName reported for dashboards that are not in a folder
+_UNFILED = "Unfiled Public Dashboards"
 
-def register(mcp: FastMCP) -> None:
+
+# DashboardInfo field for each Salesforce field, naming the columns of columnar results
+_OUTPUT_NAMES = {
+    str(info.validation_alias): name for name, info in DashboardInfo.model_fields.items()
+}
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
     @mcp.tool(
         name="salesforce_list_dashboards",
-        description="Get list of all Salesforce dashboards with their folder and usage information",
+        description=(
+            "Get Salesforce dashboards with their folder and usage information, optionally "
+            "filtered by folder, title or owner, with selected fields and paging"
+        ),
     )
-    async def list_salesforce_dashboards() -> ListDashboardsResult:
+    @clients.tool("list_dashboards")
+    async def list_salesforce_dashboards(
+        args: ListDashboardsArgs | None = None,
+    ) -> ListDashboardsResult:
         """Get list of Salesforce dashboards"""
-        sf = SalesforceClient.from_env()
-        dashboards_data = await sf.list_dashboards()
-
-        dashboards = []
-        for dashboard_data in dashboards_data:
-            dashboard_info = DashboardInfo(
-                id=dashboard_data.get("id", ""),
-                title=dashboard_data.get("title"),
-                developerName=dashboard_data.get("developerName"),
-                folderName=dashboard_data.get("folderName"),
-                description=dashboard_data.get("description"),
-                ownerId=dashboard_data.get("ownerId"),
-                lastViewedDate=dashboard_data.get("lastViewedDate"),
-                lastReferencedDate=dashboard_data.get("lastReferencedDate"),
+        args = args or ListDashboardsArgs.model_validate({})
+        sf = clients.get()
+        fields = (
+            tuple(str(DashboardInfo.model_fields[f].validation_alias) for f in args.fields)
+            if args.fields
+            else DASHBOARD_FIELDS
+        )
+        page = await sf.list_dashboards(
+            fields=fields,
+            folder=args.folder,
+            search=args.search,
+            owner_id=args.owner_id,
+            limit=args.limit,
+            cursor=args.cursor,
+        )
+        records = page["records"]
+        if "FolderName" in fields:
+            records = [
+                record if record.get("FolderName") is not None
+                else {**record, "FolderName": _UNFILED}
+                for record in records
+            ]
+        if args.format == "columnar":
+            return ListDashboardsResult(
+                columnar=to_columnar(records, rename=_OUTPUT_NAMES),
+                total_count=page["totalSize"],
+                next_cursor=page["cursor"],
             )
-            dashboards.append(dashboard_info)
-
-        return ListDashboardsResult(dashboards=dashboards, total_count=len(dashboards))
\ No newline at end of file
+        dashboards = [DashboardInfo.model_validate(record) for record in records]
+        return ListDashboardsResult(
+            dashboards=dashboards, total_count=page["totalSize"], next_cursor=page["cursor"]
+        )
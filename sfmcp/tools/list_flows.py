@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import List, Dict, Any
 from pydantic import BaseModel, Field
 from mcp.server.fastmcp import FastMCP
-from ..salesforce_client import SalesforceClient
+from ..client_registry import ClientRegistry
 
 
 class FlowInfo(BaseModel):
@@ -22,14 +22,15 @@ class ListFlowsResult(BaseModel):
     total_count: int = Field(..., description="Total number of flows")
 
 
-def register(mcp: FastMCP) -> None:
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
     @mcp.tool(
         name="salesforce_list_flows",
         description="Get list of all Salesforce flows with their status and version information",
     )
+    @clients.tool("list_flows")
     async def list_salesforce_flows() -> ListFlowsResult:
         """Get list of Salesforce flows"""
-        sf = SalesforceClient.from_env()
+        sf = clients.get()
         flows_data = await sf.list_flows()
 
         flows = []
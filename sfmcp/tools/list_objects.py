@@ -3,7 +3,7 @@ import asyncio
 from typing import List
 from pydantic import BaseModel, Field
 from mcp.server.fastmcp import FastMCP
-from ..salesforce_client import SalesforceClient
+from ..client_registry import ClientRegistry
 
 
 class ListObjectsResult(BaseModel):
@@ -11,14 +11,15 @@ class ListObjectsResult(BaseModel):
     total_count: int = Field(..., description="Total number of objects")
 
 
-def register(mcp: FastMCP) -> None:
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
     @mcp.tool(
         name="salesforce_list_objects",
         description="Get list of all Salesforce object names (SObjects)",
     )
+    @clients.tool("list_objects")
     async def list_salesforce_objects() -> ListObjectsResult:
         """Get list of Salesforce object names"""
-        sf = SalesforceClient.from_env()
+        sf = clients.get()
         object_names = await sf.list_objects()
         return ListObjectsResult(
             object_names=object_names, total_count=len(object_names)
@@ -1,52 +1,129 @@
 from __future__ import annotations
-from typing import List
-from pydantic import BaseModel, Field
+from typing import List, Literal
+from pydantic import BaseModel, ConfigDict, Field
 from mcp.server.fastmcp import FastMCP
-from ..salesforce_client import SalesforceClient
+from ..client_registry import ClientRegistry
+from ..columnar import FORMAT_DESCRIPTION, ColumnarRows, ResultFormat, to_columnar
+from ..salesforce_client import REPORT_FIELDS
+
+ReportField = Literal[
+    "name",
+    "developerName",
+    "format",
+    "folderName",
+    "description",
+    "ownerId",
+    "lastRunDate",
+    "lastViewedDate",
+    "lastReferencedDate",
+]
+
+
+class ListReportsArgs(BaseModel):
+    folder: str | None = Field(None, description="Only reports in this folder (exact name)")
+    search: str | None = Field(
+        None, description="Only reports whose name contains this text (% wildcards allowed)"
+    )
+    owner_id: str | None = Field(None, description="Only reports owned by this user id")
+    last_run_days: int | None = Field(
+        None, ge=1, description="Only reports run in the last N days"
+    )
+    fields: List[ReportField] | None = Field(
+        None, description="Only return these fields besides id (default: all)"
+    )
+    limit: int | None = Field(
+        None,
+        ge=1,
+        le=2000,
+        description="Return at most this many reports and a cursor for the rest",
+    )
+    cursor: str | None = Field(
+        None, description="Cursor from a previous result; fetches its next page"
+    )
+    format: ResultFormat = Field("records", description=FORMAT_DESCRIPTION)
 
 
 class ReportInfo(BaseModel):
-    id: str
-    name: str | None = None
-    developerName: str | None = None
-    format: str | None = None
-    folderName: str | None = None
-    description: str | None = None
-    ownerId: str | None = None
-    lastRunDate: str | None = None
-    lastViewedDate: str | None = None
-    lastReferencedDate: str | None = None
+    """A report, read straight from a Report record"""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: str = Field(..., validation_alias="Id")
+    name: str | None = Field(None, validation_alias="Name")
+    developerName: str | None = Field(None, validation_alias="DeveloperName")
+    format: str | None = Field(None, validation_alias="Format")
+    folderName: str | None = Field(None, validation_alias="FolderName")
+    description: str | None = Field(None, validation_alias="Description")
+    ownerId: str | None = Field(None, validation_alias="OwnerId")
+    lastRunDate: str | None = Field(None, validation_alias="LastRunDate")
+    lastViewedDate: str | None = Field(None, validation_alias="LastViewedDate")
+    lastReferencedDate: str | None = Field(None, validation_alias="LastReferencedDate")
 
 
 class ListReportsResult(BaseModel):
-    reports: List[ReportInfo]
-    total_count: int = Field(..., description="Total number of reports")
+    reports: List[ReportInfo] = Field(
+        default_factory=list, description="The reports (empty in columnar format)"
+    )
+    columnar: ColumnarRows | None = Field(
+        default=None, description="The reports as columns (columnar format)"
+    )
+    total_count: int = Field(..., description="Number of reports matching the filters")
+    next_cursor: str | None = Field(
+        default=None, description="Pass as cursor to fetch the next page; null on the last page"
+    )
+
 
+# FolderName reported for reports that are not in a folder
+_UNFILED = "Unfiled Public Reports"
 
-def register(mcp: FastMCP) -> None:
+
+# ReportInfo field for each Salesforce field, naming the columns of columnar results
+_OUTPUT_NAMES = {
+    str(info.validation_alias): name for name, info in ReportInfo.model_fields.items()
+}
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
     @mcp.tool(
         name="salesforce_list_reports",
-        description="Get list of all Salesforce reports with their folder and usage information",
+        description=(
+            "Get Salesforce reports with their folder and usage information, optionally "
+            "filtered by folder, name, owner or last run, with selected fields and paging"
+        ),
     )
-    async def list_salesforce_reports() -> ListReportsResult:
+    @clients.tool("list_reports")
+    async def list_salesforce_reports(args: ListReportsArgs | None = None) -> ListReportsResult:
         """Get list of Salesforce reports"""
-        sf = SalesforceClient.from_env()
-        reports_data = await sf.list_reports()
-
-        reports = []
-        for report_data in reports_data:
-            report_info = ReportInfo(
-                id=report_data.get("id", ""),
-                name=report_data.get("name"),
-                developerName=report_data.get("developerName"),
-                format=report_data.get("format"),
-                folderName=report_data.get("folderName"),
-                description=report_data.get("description"),
-                ownerId=report_data.get("ownerId"),
-                lastRunDate=report_data.get("lastRunDate"),
-                lastViewedDate=report_data.get("lastViewedDate"),
-                lastReferencedDate=report_data.get("lastReferencedDate"),
+        args = args or ListReportsArgs.model_validate({})
+        sf = clients.get()
+        fields = (
+            tuple(str(ReportInfo.model_fields[f].validation_alias) for f in args.fields)
+            if args.fields
+            else REPORT_FIELDS
+        )
+        page = await sf.list_reports(
+            fields=fields,
+            folder=args.folder,
+            search=args.search,
+            owner_id=args.owner_id,
+            last_run_days=args.last_run_days,
+            limit=args.limit,
+            cursor=args.cursor,
+        )
+        records = page["records"]
+        if "FolderName" in fields:
+            records = [
+                record if record.get("FolderName") is not None
+                else {**record, "FolderName": _UNFILED}
+                for record in records
+            ]
+        if args.format == "columnar":
+            return ListReportsResult(
+                columnar=to_columnar(records, rename=_OUTPUT_NAMES),
+                total_count=page["totalSize"],
+                next_cursor=page["cursor"],
             )
-            reports.append(report_info)
-
-        return ListReportsResult(reports=reports, total_count=len(reports))
\ No newline at end of file
+        reports = [ReportInfo.model_validate(record) for record in records]
+        return ListReportsResult(
+            reports=reports, total_count=page["totalSize"], next_cursor=page["cursor"]
+        )
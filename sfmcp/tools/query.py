@@ -1,28 +1,114 @@
 from __future__ import annotations
 import asyncio
 from typing import Any, Dict, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from mcp.server.fastmcp import FastMCP
-from ..salesforce_client import SalesforceClient
+from ..cache import json_size
+from ..client_registry import ClientRegistry
+from ..columnar import FORMAT_DESCRIPTION, ColumnarRows, ResultFormat, to_columnar
+from ..config.settings import settings
+from ..soql import apply_limit
 
 
 class QueryArgs(BaseModel):
-    soql: str = Field(..., description="SOQL query string")
+    soql: str | None = Field(None, description="SOQL query string")
     max_records: int | None = Field(None, ge=1, le=50000)
+    page_size: int | None = Field(
+        None,
+        ge=1,
+        le=2000,
+        description="Return at most this many rows and a cursor for the rest",
+    )
+    cursor: str | None = Field(
+        None, description="Cursor from a previous paged result; fetches its next page"
+    )
+    format: ResultFormat = Field("records", description=FORMAT_DESCRIPTION)
+
+    @model_validator(mode="after")
+    def _require_query_or_cursor(self) -> "QueryArgs":
+        if self.soql is None and self.cursor is None:
+            raise ValueError("Either soql or cursor is required")
+        return self
 
 
 class QueryResult(BaseModel):
     total_size: int
-    records: List[Dict[str, Any]]
+    records: List[Dict[str, Any]] = Field(
+        default_factory=list, description="The rows (empty in columnar format)"
+    )
+    columnar: ColumnarRows | None = Field(
+        default=None, description="The rows as columns (columnar format)"
+    )
+    done: bool = True
+    next_cursor: str | None = Field(
+        default=None, description="Pass as cursor to fetch the next page; null on the last page"
+    )
+    query_total_size: int | None = Field(
+        default=None, description="Total rows matched by the query across all pages"
+    )
+    result_handle: str | None = Field(
+        default=None,
+        description=(
+            "Set when the result was too large to return inline: records holds a preview "
+            "and the full result can be read with salesforce_result_page"
+        ),
+    )
 
 
-def register(mcp: FastMCP) -> None:
+def _should_spill(rows: List[Dict[str, Any]]) -> bool:
+    if len(rows) > settings.result_spill_rows:
+        return True
+    # Only pay for measuring the payload when it is bigger than a preview anyway
+    return (
+        len(rows) > settings.result_preview_rows
+        and json_size(rows) > settings.result_spill_bytes
+    )
+
+
+def _result(
+    rows: List[Dict[str, Any]], result_format: ResultFormat, **fields: Any
+) -> QueryResult:
+    if result_format == "columnar":
+        return QueryResult(total_size=len(rows), columnar=to_columnar(rows), **fields)
+    return QueryResult(total_size=len(rows), records=rows, **fields)
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
     @mcp.tool(
         name="salesforce_query", description="Run a SOQL query and return JSON rows"
     )
+    @clients.tool("query")
     async def salesforce_query(args: QueryArgs) -> QueryResult:
-        sf = SalesforceClient.from_env()
-        rows = await sf.run_soql(args.soql)
+        sf = clients.get()
+        soql = args.soql
+        if soql is not None and args.max_records is not None:
+            soql = apply_limit(soql, args.max_records)
+
+        if args.page_size is not None or args.cursor is not None:
+            page = await sf.query_page(
+                None if args.cursor else soql,
+                page_size=args.page_size,
+                cursor=args.cursor,
+            )
+            return _result(
+                page["records"],
+                args.format,
+                done=page["done"],
+                next_cursor=page["cursor"],
+                query_total_size=page["totalSize"],
+            )
+
+        assert soql is not None
+        rows = await sf.run_soql(soql)
         if args.max_records is not None:
             rows = rows[: args.max_records]
-        return QueryResult(total_size=len(rows), records=rows)
+        if _should_spill(rows):
+            stored = await asyncio.to_thread(clients.results.put, rows)
+            preview = rows[: settings.result_preview_rows]
+            return _result(
+                preview,
+                args.format,
+                query_total_size=stored.row_count,
+                result_handle=stored.handle,
+            )
+        return _result(rows, args.format)
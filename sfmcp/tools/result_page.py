@@ -0,0 +1,64 @@
+from __future__ import annotations
+import asyncio
+from typing import Any, Dict, List
+from pydantic import BaseModel, Field
+from mcp.server.fastmcp import FastMCP
+from ..client_registry import ClientRegistry
+from ..columnar import FORMAT_DESCRIPTION, ColumnarRows, ResultFormat, to_columnar
+
+
+class ResultPageArgs(BaseModel):
+    handle: str = Field(..., description="result_handle returned by salesforce_query")
+    offset: int = Field(0, ge=0, description="Index of the first row to return")
+    limit: int = Field(100, ge=1, le=2000, description="Number of rows to return")
+    columns: List[str] | None = Field(
+        None, description="Only return these columns; dotted names reach into relationships"
+    )
+    sample: int | None = Field(
+        None, ge=1, le=2000, description="Return this many randomly sampled rows instead"
+    )
+    seed: int | None = Field(None, description="Seed for a reproducible sample")
+    format: ResultFormat = Field("records", description=FORMAT_DESCRIPTION)
+
+
+class ResultPageResult(BaseModel):
+    handle: str
+    total_rows: int
+    offset: int
+    records: List[Dict[str, Any]] = Field(
+        default_factory=list, description="The rows (empty in columnar format)"
+    )
+    columnar: ColumnarRows | None = Field(
+        default=None, description="The rows as columns (columnar format)"
+    )
+    columns: List[str] = Field(..., description="Columns available in the stored result")
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
+    @mcp.tool(
+        name="salesforce_result_page",
+        description=(
+            "Page through, project columns from, or sample a large query result that "
+            "salesforce_query stored on the server"
+        ),
+    )
+    @clients.tool("result_page")
+    async def salesforce_result_page(args: ResultPageArgs) -> ResultPageResult:
+        store = clients.results
+        stored = store.get(args.handle)
+        if args.sample is not None:
+            records = await asyncio.to_thread(
+                store.sample, args.handle, args.sample, columns=args.columns, seed=args.seed
+            )
+        else:
+            records = await asyncio.to_thread(
+                store.read, args.handle, offset=args.offset, limit=args.limit, columns=args.columns
+            )
+        return ResultPageResult(
+            handle=args.handle,
+            total_rows=stored.row_count,
+            offset=args.offset if args.sample is None else 0,
+            records=records if args.format == "records" else [],
+            columnar=to_columnar(records) if args.format == "columnar" else None,
+            columns=stored.columns,
+        )
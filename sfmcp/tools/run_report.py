@@ -0,0 +1,70 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+from pydantic import BaseModel, Field
+from mcp.server.fastmcp import FastMCP
+from ..client_registry import ClientRegistry
+
+
+class ReportFilter(BaseModel):
+    column: str = Field(..., description="Report column API name (e.g., STAGE_NAME)")
+    operator: str = Field(..., description="Analytics API operator (e.g., equals, greaterThan)")
+    value: str = Field(..., description="Filter value")
+
+
+class RunReportArgs(BaseModel):
+    report_id: str = Field(..., description="Report id (from salesforce_list_reports)")
+    filters: List[ReportFilter] | None = Field(
+        None, description="Filters that replace the report's saved filters for this run"
+    )
+    boolean_filter: str | None = Field(
+        None, description="Filter logic over the filters by position (e.g., '1 AND (2 OR 3)')"
+    )
+    include_details: bool = Field(
+        False, description="Also return detail rows (at most 2000), not just aggregates"
+    )
+
+
+class ReportRow(BaseModel):
+    groupings: List[str] = Field(..., description="Grouping labels, outermost first")
+    aggregates: Dict[str, Any]
+    across: List[Dict[str, Any]] | None = Field(
+        default=None, description="Matrix reports: aggregates per across grouping"
+    )
+
+
+class RunReportResult(BaseModel):
+    reportId: str | None = None
+    reportName: str | None = None
+    reportFormat: str | None = None
+    groupingsDown: List[str]
+    groupingsAcross: List[str]
+    aggregates: List[str] = Field(..., description="Aggregate columns, in report order")
+    total: Dict[str, Any] = Field(..., description="Grand total of each aggregate")
+    rows: List[ReportRow]
+    allData: bool = Field(True, description="False when Salesforce truncated the report")
+    detailColumns: List[str] | None = None
+    details: List[Dict[str, Any]] | None = None
+    lastModifiedDate: str | None = Field(
+        default=None, description="LastModifiedDate of the report definition"
+    )
+    cached: bool = Field(default=False, description="Served from the report result cache")
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
+    @mcp.tool(
+        name="salesforce_run_report",
+        description=(
+            "Run a Salesforce report and return its grouped aggregates (and optionally "
+            "detail rows), computed by Salesforce rather than from raw records"
+        ),
+    )
+    @clients.tool("run_report")
+    async def run_report(args: RunReportArgs) -> RunReportResult:
+        sf = clients.get()
+        result = await sf.run_report(
+            args.report_id,
+            filters=[f.model_dump() for f in args.filters] if args.filters is not None else None,
+            boolean_filter=args.boolean_filter,
+            include_details=args.include_details,
+        )
+        return RunReportResult.model_validate(result)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+from pydantic import BaseModel, Field
+from mcp.server.fastmcp import FastMCP
+from ..client_registry import ClientRegistry
+from ..jsonstream import DECODER
+from ..metrics import REGISTRY
+
+
+class ServerStatsResult(BaseModel):
+    metrics: Dict[str, List[Dict[str, Any]]] = Field(
+        ...,
+        description=(
+            "Histograms (count, sum and p50/p95/p99 estimates) and counters per label set: "
+            "tool and client operation latency, Salesforce request latency, bytes and "
+            "errors, sf spawn time, JSON decode time and records per query"
+        ),
+    )
+    clients: Dict[str, Any] = Field(
+        ..., description="Per org: cache hit counts, coalescing, scheduling and retries"
+    )
+    result_store: Dict[str, Any] | None = None
+    deadlines: Dict[str, Any] = Field(..., description="Tool timeouts and cancellations")
+    profiles: Dict[str, Any] = Field(
+        ..., description="Tool calls saved as stack profiles by the sampling profiler"
+    )
+    json_decoder: str = Field(..., description="JSON library decoding Salesforce responses")
+
+
+def register(mcp: FastMCP, clients: ClientRegistry) -> None:
+    @mcp.tool(
+        name="salesforce_server_stats",
+        description=(
+            "Get the server's latency, throughput, cache and error metrics (the same data "
+            "the HTTP server serves on /metrics)"
+        ),
+    )
+    async def server_stats() -> ServerStatsResult:
+        return ServerStatsResult(
+            metrics=REGISTRY.snapshot(), json_decoder=DECODER, **clients.stats()
+        )
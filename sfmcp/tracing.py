@@ -0,0 +1,153 @@
+from __future__ import annotations
+import itertools
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Sequence
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ContentBlock
+
+logger = logging.getLogger("sfmcp.tracing")
+
+
+class Span:
+    """One timed step of a tool call; written out when it ends"""
+
+    __slots__ = ("trace_id", "span_id", "parent", "name", "attributes", "start", "child_seconds")
+
+    def __init__(self, trace_id: str, span_id: int, parent: Span | None, name: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent = parent
+        self.name = name
+        self.attributes: Dict[str, Any] = {}
+        self.start = time.time()
+        self.child_seconds = 0.0
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """Appends finished spans to a JSONL file, one object per span
+
+    Each line has the trace id (one per tool call), span and parent ids, the name,
+    start time, duration and self time (duration minus child spans, so the time a step
+    spent in its own code, such as building pydantic models in a tool) in milliseconds,
+    the attributes and the error, if any. Spans of concurrent child tasks overlap, so
+    self time is floored at zero.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] = open(self.path, "a", encoding="utf-8")
+        self._ids = itertools.count(1)
+        self._trace_prefix = f"{os.getpid():x}-{int(time.time()):x}"
+        self.spans = 0
+
+    def start(self, name: str, parent: Span | None) -> Span:
+        trace_id = parent.trace_id if parent else f"{self._trace_prefix}-{next(self._ids):x}"
+        return Span(trace_id, next(self._ids), parent, name)
+
+    def finish(self, span: Span, duration: float, error: BaseException | None = None) -> None:
+        if span.parent is not None:
+            span.parent.child_seconds += duration
+        record = {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent.span_id if span.parent else None,
+            "name": span.name,
+            "start": round(span.start, 6),
+            "duration_ms": round(duration * 1000, 3),
+            "self_ms": round(max(0.0, duration - span.child_seconds) * 1000, 3),
+            "attributes": span.attributes,
+        }
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self.spans += 1
+        if span.parent is None:
+            self._file.flush()  # a whole tool call is on disk once its root span ends
+
+    def close(self) -> None:
+        self._file.close()
+
+
+_tracer: Tracer | None = None
+_current: ContextVar[Span | None] = ContextVar("sfmcp_span", default=None)
+
+
+def configure(path: str | None) -> Tracer | None:
+    """Start writing spans to `path`, or stop tracing when it is empty"""
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = Tracer(path) if path else None
+    if _tracer is not None:
+        logger.info(f"Writing trace spans to {_tracer.path}")
+    return _tracer
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Time the block as a child of the current span; yields None when tracing is off"""
+    tracer = _tracer
+    if tracer is None:
+        yield None
+        return
+    parent = _current.get()
+    current = tracer.start(name, parent)
+    current.attributes.update(attributes)
+    token = _current.set(current)
+    started = time.perf_counter()
+    error: BaseException | None = None
+    try:
+        yield current
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current.reset(token)
+        tracer.finish(current, time.perf_counter() - started, error)
+
+
+def record(name: str, seconds: float, **attributes: Any) -> None:
+    """Add an already measured step (such as decode time summed over a stream) as a span"""
+    tracer = _tracer
+    if tracer is None:
+        return
+    current = tracer.start(name, _current.get())
+    current.start = time.time() - seconds
+    current.attributes.update(attributes)
+    tracer.finish(current, seconds)
+
+
+def current_span() -> Span | None:
+    return _current.get() if _tracer is not None else None
+
+
+class TracedFastMCP(FastMCP):
+    """FastMCP whose tool calls are root spans, with result serialization as its own span"""
+
+    async def call_tool(
+        self, name: str, arguments: Dict[str, Any]
+    ) -> Sequence[ContentBlock] | Dict[str, Any]:
+        tool = self._tool_manager.get_tool(name)
+        if _tracer is None or tool is None:
+            return await super().call_tool(name, arguments)
+        with span("mcp.call_tool", tool=name):
+            result = await self._tool_manager.call_tool(
+                name, arguments, context=self.get_context(), convert_result=False
+            )
+            with span("mcp.serialize", tool=name):
+                converted: Sequence[ContentBlock] | Dict[str, Any] = (
+                    tool.fn_metadata.convert_result(result)
+                )
+                return converted
@@ -0,0 +1,21 @@
+from __future__ import annotations
+from .base import SalesforceAPIError, Transport
+from .cli import CliTransport
+from .rest import RestTransport
+from ..config.settings import Settings
+
+__all__ = ["SalesforceAPIError", "Transport", "CliTransport", "RestTransport", "make_transport"]
+
+
+def make_transport(settings: Settings) -> Transport:
+    """Build the transport selected by SFMCP_TRANSPORT ("cli" or "rest")"""
+    if settings.transport == "rest":
+        return RestTransport(
+            instance_url=settings.sf_instance_url,
+            access_token=settings.sf_access_token,
+            api_version=settings.api_version,
+            http2=settings.rest_http2,
+            max_connections=settings.rest_max_connections,
+            timeout=settings.rest_timeout,
+        )
+    return CliTransport(org_alias=settings.sf_org_alias)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from ..scheduler import RequestScheduler
+
+T = TypeVar("T")
+
+
+class SalesforceAPIError(Exception):
+    """Error returned by Salesforce, carrying the HTTP status and errorCode when known"""
+
+    def __init__(
+        self, message: str, *, status: int | None = None, error_code: str | None = None
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.error_code = error_code
+
+
+class Transport(ABC):
+    """Backend that talks to a Salesforce org on behalf of SalesforceClient"""
+
+    name: str = "transport"
+    # Set by SalesforceClient; every request to the org then goes through it
+    scheduler: RequestScheduler | None = None
+
+    async def _scheduled(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run one request through the scheduler (with rate-limit retries), if any"""
+        if self.scheduler is None:
+            return await call()
+        return await self.scheduler.run(call)
+
+    def _should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether a stream rejected before its body arrived is opened again"""
+        return self.scheduler is not None and self.scheduler.should_retry(error, attempt)
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold a scheduler slot for a request that cannot simply be retried (a stream)"""
+        if self.scheduler is None:
+            yield
+            return
+        async with self.scheduler.slot():
+            yield
+
+    @abstractmethod
+    async def query(
+        self, soql: str, *, tooling: bool = False, batch_size: int | None = None
+    ) -> Dict[str, Any]:
+        """Run a SOQL query and return the first page ({records, done, nextRecordsUrl})
+
+        `batch_size` is a hint for how many records each page should hold.
+        """
+
+    async def query_more(self, next_records_url: str) -> Dict[str, Any]:
+        """Fetch the page behind a nextRecordsUrl returned by query()"""
+        raise SalesforceAPIError(f"The {self.name} transport does not support queryMore")
+
+    async def iter_query(
+        self, soql: str, *, tooling: bool = False
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Run a query and yield its records in batches as they are received
+
+        Every page is followed. The default fetches each page whole through query()
+        and query_more(); transports that can decode a response incrementally yield
+        records while the page is still arriving.
+        """
+        page = await self.query(soql, tooling=tooling)
+        if "records" not in page:
+            raise SalesforceAPIError("Unexpected response format from Salesforce")
+        yield page["records"]
+        while not page.get("done", True) and page.get("nextRecordsUrl"):
+            page = await self.query_more(page["nextRecordsUrl"])
+            yield page.get("records", [])
+
+    @abstractmethod
+    async def list_sobjects(self) -> List[str]:
+        """Get the names of all SObjects in the org"""
+
+    @abstractmethod
+    async def describe_sobject(
+        self, object_name: str, *, if_modified_since: str | None = None
+    ) -> Dict[str, Any] | None:
+        """Get the full describe payload of one SObject
+
+        When `if_modified_since` (an HTTP date) is given, transports that support
+        conditional requests return None if the describe has not changed since then.
+        """
+
+    async def describe_sobjects(
+        self, requests: Sequence[Tuple[str, str | None]], *, concurrency: int = 4
+    ) -> List[Dict[str, Any] | None | BaseException]:
+        """Describe several SObjects given as (name, if_modified_since) pairs
+
+        Returns one result per request, in order: the describe, None when not modified,
+        or the exception that request failed with. The default runs describe_sobject
+        for each, at most `concurrency` at a time.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def describe(name: str, since: str | None) -> Dict[str, Any] | None:
+            async with semaphore:
+                return await self.describe_sobject(name, if_modified_since=since)
+
+        return await asyncio.gather(
+            *(describe(name, since) for name, since in requests), return_exceptions=True
+        )
+
+    async def bulk_query(
+        self,
+        soql: str,
+        destination: Path,
+        *,
+        poll_interval: float = 1.0,
+        timeout: float = 3600.0,
+    ) -> Dict[str, Any]:
+        """Run a Bulk API 2.0 query job and write its CSV result to `destination`
+
+        Returns {"jobId", "rowCount"}. Results are streamed to disk chunk by chunk.
+        """
+        raise SalesforceAPIError(f"The {self.name} transport does not support bulk queries")
+
+    async def retrieve_metadata(
+        self,
+        members: Mapping[str, Sequence[str]],
+        *,
+        poll_interval: float = 1.0,
+        timeout: float = 600.0,
+    ) -> Dict[str, bytes]:
+        """Retrieve metadata components, given as {type: [member names]}, in one request
+
+        Returns the retrieved files keyed by folder and file name, e.g.
+        "flows/My_Flow.flow" (see metadata.member_key). Members that do not exist in
+        the org are simply absent from the result.
+        """
+        raise SalesforceAPIError(f"The {self.name} transport does not support retrieves")
+
+    async def run_report(
+        self,
+        report_id: str,
+        *,
+        report_metadata: Dict[str, Any] | None = None,
+        include_details: bool = False,
+        poll_interval: float = 1.0,
+        timeout: float = 600.0,
+    ) -> Dict[str, Any]:
+        """Run a report asynchronously through the Analytics API and return its result
+
+        `report_metadata` overrides parts of the report's metadata for this run (e.g.
+        reportFilters). The result is the report instance's JSON: reportMetadata,
+        groupingsDown/groupingsAcross and factMap.
+        """
+        raise SalesforceAPIError(f"The {self.name} transport does not support running reports")
+
+    def stats(self) -> Dict[str, Any]:
+        """Transport-specific counters"""
+        return {}
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release pooled resources held by the transport; intentionally a no-op for
+        transports that hold none"""
@@ -0,0 +1,274 @@
+from __future__ import annotations
+import csv
+import asyncio
+import logging
+import math
+import os
+import signal
+import tempfile
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Mapping, Sequence
+from ..jsonstream import RecordStream, loads
+from ..metrics import CLI_SPAWN_SECONDS, JSON_DECODE_SECONDS, track_request
+from ..tracing import span
+from .base import Transport
+from .metadata import member_key, package_xml
+
+logger = logging.getLogger("sfmcp.transport.cli")
+
+# Bytes read from the CLI's stdout at a time
+_READ_SIZE = 256 * 1024
+
+
+def _cli_operation(command: Sequence[str]) -> str:
+    """Metric label for a command: its subcommand words (`data query`), without arguments"""
+    words = []
+    for word in command[1:4]:
+        if word.startswith("-"):
+            break
+        words.append(word)
+    return " ".join(words) or Path(command[0]).name
+
+
+class CliTransport(Transport):
+    """Transport that shells out to the Salesforce CLI (`sf`) for every call"""
+
+    name = "cli"
+
+    def __init__(self, *, org_alias: str):
+        self._org_alias = org_alias
+        # `sf` processes killed because their call was cancelled or timed out
+        self.killed = 0
+
+    async def _cli_output(
+        self, command: List[str], *, cwd: Path | None = None
+    ) -> AsyncIterator[bytes]:
+        """Run a Salesforce CLI command and yield its stdout as it is written"""
+        # One scheduler slot per process caps how many `sf` processes run at once
+        operation = _cli_operation(command)
+        async with self._slot():
+            with track_request("cli", operation, sent=sum(map(len, command))) as track:
+                logger.debug(f"Running SF CLI: {' '.join(command)}")
+                try:
+                    with span("cli.spawn"), CLI_SPAWN_SECONDS.time(command=operation):
+                        process = await asyncio.create_subprocess_exec(
+                            *command,
+                            stdout=asyncio.subprocess.PIPE,
+                            stderr=asyncio.subprocess.PIPE,
+                            cwd=cwd,
+                            # Its own process group, so the node workers it starts can be
+                            # killed too
+                            start_new_session=True,
+                        )
+                except FileNotFoundError as e:
+                    logger.error("Salesforce CLI (sf) not found")
+                    raise Exception(
+                        "Salesforce CLI (sf) not found. Please install the Salesforce CLI."
+                    ) from e
+                assert process.stdout is not None and process.stderr is not None
+                # Drain stderr alongside stdout so a chatty command cannot fill the pipe
+                stderr_task = asyncio.ensure_future(process.stderr.read())
+                try:
+                    while data := await process.stdout.read(_READ_SIZE):
+                        track.received += len(data)
+                        yield data
+                    await process.wait()
+                finally:
+                    if process.returncode is None:
+                        self._kill(process)
+                        await process.wait()
+                    stderr = await stderr_task
+
+                if process.returncode != 0:
+                    error_msg = stderr.decode() if stderr else "Unknown error"
+                    logger.error(f"SF CLI failed: {error_msg}")
+                    raise Exception(f"Salesforce CLI command failed: {error_msg}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"killed": self.killed}
+
+    def _kill(self, process: asyncio.subprocess.Process) -> None:
+        """Kill an `sf` process whose caller went away, with everything it started"""
+        self.killed += 1
+        logger.warning(f"Killing SF CLI process {process.pid}: its call was cancelled")
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            process.kill()  # no process groups (Windows) or the group is already gone
+
+    async def _run_cli_command(
+        self, command: List[str], *, cwd: Path | None = None
+    ) -> Dict[Any, Any]:
+        """Run a Salesforce CLI command asynchronously and decode its JSON output"""
+        try:
+            stdout = bytearray()
+            async for data in self._cli_output(command, cwd=cwd):
+                stdout += data
+            # Decoded straight from bytes: no intermediate str copy of the output
+            with span("json.decode", source="cli"), JSON_DECODE_SECONDS.time(source="cli"):
+                result = loads(stdout)
+            return result  # type: ignore[no-any-return]
+
+        except ValueError as e:
+            logger.error(f"Failed to parse SF CLI JSON output: {e}")
+            raise Exception(f"Failed to parse Salesforce CLI output: {e}") from e
+        except Exception as e:
+            logger.error(f"SF CLI command error: {e}")
+            raise Exception(f"Error running Salesforce CLI command: {e}") from e
+
+    def _query_command(self, soql: str, *, tooling: bool) -> List[str]:
+        command = [
+            "sf",
+            "data",
+            "query",
+            "--target-org",
+            self._org_alias,
+            "--query",
+            soql,
+            "--result-format",
+            "json",
+        ]
+        if tooling:
+            command.append("--use-tooling-api")
+        return command
+
+    async def query(
+        self, soql: str, *, tooling: bool = False, batch_size: int | None = None
+    ) -> Dict[str, Any]:
+        # `sf data query` follows queryMore itself, so the first page is the whole result
+        result = await self._run_cli_command(self._query_command(soql, tooling=tooling))
+
+        if "result" in result and "records" in result["result"]:
+            page: Dict[str, Any] = result["result"]
+            page["done"] = True
+            return page
+        else:
+            raise Exception("Unexpected response format from Salesforce CLI")
+
+    async def iter_query(
+        self, soql: str, *, tooling: bool = False
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        # The CLI prints the whole result at once; decoding it record by record keeps
+        # only one record's bytes buffered instead of the full output plus its decode
+        stream = RecordStream()
+        try:
+            async for data in self._cli_output(self._query_command(soql, tooling=tooling)):
+                records = stream.feed(data)
+                if records:
+                    yield records
+            result = stream.close()
+        except ValueError as e:
+            logger.error(f"Failed to parse SF CLI JSON output: {e}")
+            raise Exception(f"Failed to parse Salesforce CLI output: {e}") from e
+        if "records" not in (result.get("result") or {}):
+            raise Exception("Unexpected response format from Salesforce CLI")
+
+    async def list_sobjects(self) -> List[str]:
+        command = [
+            "sf",
+            "force:schema:sobject:list",
+            "--target-org",
+            self._org_alias,
+            "--json",
+        ]
+        result = await self._run_cli_command(command)
+
+        if "result" in result and isinstance(result["result"], list):
+            return result["result"]
+        else:
+            raise Exception("Unexpected response format from Salesforce CLI")
+
+    async def describe_sobject(
+        self, object_name: str, *, if_modified_since: str | None = None
+    ) -> Dict[str, Any] | None:
+        # The CLI cannot make conditional requests, so this is always a full describe
+        command = [
+            "sf",
+            "force:schema:sobject:describe",
+            "--target-org",
+            self._org_alias,
+            "-s",
+            object_name,
+            "--json",
+        ]
+        result = await self._run_cli_command(command)
+
+        if "result" in result:
+            return result["result"]  # type: ignore[no-any-return]
+        else:
+            raise Exception("Unexpected response format from Salesforce CLI")
+
+    async def bulk_query(
+        self,
+        soql: str,
+        destination: Path,
+        *,
+        poll_interval: float = 1.0,
+        timeout: float = 3600.0,
+    ) -> Dict[str, Any]:
+        # `sf data export bulk` creates the Bulk API 2.0 job, polls it and writes the CSV
+        command = [
+            "sf",
+            "data",
+            "export",
+            "bulk",
+            "--target-org",
+            self._org_alias,
+            "--query",
+            soql,
+            "--output-file",
+            str(destination),
+            "--result-format",
+            "csv",
+            "--wait",
+            str(max(1, math.ceil(timeout / 60))),
+            "--json",
+        ]
+        result = await self._run_cli_command(command)
+        job = result.get("result") or {}
+        row_count = job.get("totalSize")
+        if row_count is None:
+            row_count = _count_csv_rows(destination)
+        return {"jobId": job.get("jobId"), "rowCount": row_count}
+
+    async def retrieve_metadata(
+        self,
+        members: Mapping[str, Sequence[str]],
+        *,
+        poll_interval: float = 1.0,
+        timeout: float = 600.0,
+    ) -> Dict[str, bytes]:
+        # Each retrieve gets its own directory, so concurrent retrieves cannot collide and
+        # nothing is written to the server's working directory
+        with tempfile.TemporaryDirectory(prefix="sfmcp-retrieve-") as tmp:
+            root = Path(tmp)
+            (root / "package.xml").write_text(package_xml(members), encoding="utf-8")
+            command = [
+                "sf",
+                "project",
+                "retrieve",
+                "start",
+                "--target-org",
+                self._org_alias,
+                "--manifest",
+                str(root / "package.xml"),
+                "--target-metadata-dir",
+                str(root / "out"),
+                "--unzip",
+                "--single-package",
+                "--wait",
+                str(max(1, math.ceil(timeout / 60))),
+                "--json",
+            ]
+            await self._run_cli_command(command, cwd=root)
+            return {
+                member_key(path.relative_to(root / "out").as_posix()): path.read_bytes()
+                for path in (root / "out").rglob("*")
+                if path.is_file() and path.name != "package.xml" and path.suffix != ".zip"
+            }
+
+
+def _count_csv_rows(path: Path) -> int:
+    """Count data rows of a CSV file without loading it (quoted newlines are handled)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
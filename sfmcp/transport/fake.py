@@ -0,0 +1,513 @@
+from __future__ import annotations
+import asyncio
+import base64
+import csv
+import io
+import itertools
+import json
+import operator
+import re
+import zipfile
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Tuple
+from xml.etree import ElementTree
+import httpx
+from .metadata import METADATA_NS
+
+_FROM_RE = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+_LIMIT_RE = re.compile(r"\bLIMIT\s+(\d+)", re.IGNORECASE)
+_SELECT_RE = re.compile(r"^\s*SELECT\s+(.*?)\s+FROM\b", re.IGNORECASE | re.DOTALL)
+_WHERE_RE = re.compile(
+    r"\bWHERE\s+(.*?)(?:\s+(?:GROUP|ORDER|LIMIT|OFFSET)\b|$)", re.IGNORECASE | re.DOTALL
+)
+_LIKE_RE = re.compile(r"^(\w+)\s+LIKE\s+'((?:[^'\\]|\\.)*)'$", re.IGNORECASE)
+_IN_RE = re.compile(r"^(\w+)\s+(NOT\s+)?IN\s*\((.*)\)$", re.IGNORECASE | re.DOTALL)
+_COMPARISON_RE = re.compile(r"^(\w+)\s*(=|!=|>=|<=|>|<)\s*(.+)$", re.DOTALL)
+_COMPARISONS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+_STRING_RE = re.compile(r"'((?:[^'\\]|\\.)*)'")
+_AGGREGATE_RE = re.compile(r"\b(COUNT|MAX|MIN)\((\w*)\)\s*(\w+)?", re.IGNORECASE)
+
+
+class FakeSalesforceOrg:
+    """In-memory stand-in for the Salesforce REST API, for offline tests and benchmarks
+
+    Serves query/queryMore, tooling query, global describe, sobject describe, Composite
+    requests, Bulk API 2.0 query jobs and Metadata API retrieves through an
+    httpx.MockTransport, so a RestTransport can be pointed at it without a network.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_version: str = "61.0",
+        batch_size: int = 2000,
+        latency: float = 0.0,
+        bulk_polls: int = 1,
+        bulk_chunk_size: int = 50000,
+        retrieve_polls: int = 1,
+        report_polls: int = 1,
+        api_limit: int = 15000,
+    ):
+        self.api_version = api_version
+        self.batch_size = batch_size
+        self.latency = latency
+        self.bulk_polls = bulk_polls
+        self.bulk_chunk_size = bulk_chunk_size
+        self.retrieve_polls = retrieve_polls
+        self.report_polls = report_polls
+        self.api_limit = api_limit
+        self.api_usage = 0
+        # The next `limit_errors` requests are rejected with REQUEST_LIMIT_EXCEEDED
+        self.limit_errors = 0
+        # The next `server_errors` requests fail with 503 SERVER_UNAVAILABLE
+        self.server_errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.reports: Dict[str, Dict[str, Any]] = {}
+        self.report_runs: List[Tuple[str, Dict[str, Any] | None]] = []
+        self._report_instances: Dict[str, Dict[str, Any]] = {}
+        self.retrieves: Dict[str, Dict[str, Any]] = {}
+        self.metadata: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self.bulk_jobs: Dict[str, Dict[str, Any]] = {}
+        self.describes: Dict[str, Dict[str, Any]] = {}
+        self.describe_modified: Dict[str, datetime] = {}
+        self.records: Dict[str, List[Dict[str, Any]]] = {}
+        self.tooling_records: Dict[str, List[Dict[str, Any]]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.queries: List[str] = []
+        self._cursors: Dict[str, Tuple[List[Dict[str, Any]], bool, int]] = {}
+        self._locator_ids = itertools.count(1)
+
+    def add_sobject(
+        self,
+        name: str,
+        *,
+        fields: List[Dict[str, Any]] | None = None,
+        records: List[Dict[str, Any]] | None = None,
+    ) -> None:
+        self.describes[name] = {
+            "name": name,
+            "label": name,
+            "fields": fields or [{"name": "Id", "type": "id", "label": "Record ID"}],
+        }
+        self.describe_modified[name] = datetime.now(timezone.utc)
+        self.records[name] = [
+            {"attributes": {"type": name}, **record} for record in records or []
+        ]
+
+    def modify_sobject(self, name: str, **changes: Any) -> None:
+        """Change a describe, as a schema deployment would"""
+        self.describes[name].update(changes)
+        self.describe_modified[name] = datetime.now(timezone.utc)
+
+    def add_tooling_records(self, name: str, records: List[Dict[str, Any]]) -> None:
+        self.tooling_records[name] = [
+            {"attributes": {"type": name}, **record} for record in records
+        ]
+
+    def add_flow_metadata(self, developer_name: str, xml: str) -> None:
+        """Make a flow's metadata file retrievable through the Metadata API"""
+        self.metadata[("Flow", developer_name)] = (f"flows/{developer_name}.flow", xml)
+
+    def add_report(
+        self,
+        report_id: str,
+        result: Dict[str, Any],
+        *,
+        name: str = "Report",
+        last_modified: str = "2024-01-01T00:00:00.000+0000",
+    ) -> None:
+        """Make a report runnable: `result` is what its Analytics API instance returns"""
+        self.reports[report_id] = result
+        self.records.setdefault("Report", []).append(
+            {"attributes": {"type": "Report"}, "Id": report_id, "Name": name,
+             "LastModifiedDate": last_modified}
+        )
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.limit_errors:
+                self.limit_errors -= 1
+                response = _error(403, "REQUEST_LIMIT_EXCEEDED", "TotalRequests Limit exceeded.")
+            elif self.server_errors:
+                self.server_errors -= 1
+                response = _error(503, "SERVER_UNAVAILABLE", "Server temporarily unavailable")
+            else:
+                response = await self._dispatch(request)
+        finally:
+            self.in_flight -= 1
+        self.api_usage += 1
+        response.headers["Sforce-Limit-Info"] = f"api-usage={self.api_usage}/{self.api_limit}"
+        return response
+
+    async def _dispatch(self, request: httpx.Request) -> httpx.Response:
+        prefix = f"/services/data/v{self.api_version}"
+        path = request.url.path
+        if path == f"/services/Soap/m/{self.api_version}":
+            return self._metadata_soap(request)
+        if not path.startswith(prefix):
+            return _error(404, "NOT_FOUND", f"Unknown path {path}")
+        path = path[len(prefix) :]
+
+        if path in ("/query", "/tooling/query"):
+            return self._query(request, tooling=path.startswith("/tooling"))
+        if path == "/composite":
+            return await self._composite(request)
+        if match := re.fullmatch(r"/analytics/reports/(\w+)/instances(?:/(\w+))?", path):
+            return self._report_instance(request, match.group(1), match.group(2))
+        if path.startswith("/jobs/query"):
+            return self._bulk(request, path[len("/jobs/query") :])
+        if match := re.fullmatch(r"(?:/tooling)?/query/([\w-]+)", path):
+            return self._query_more(match.group(1))
+        if path == "/sobjects":
+            return httpx.Response(
+                200, json={"sobjects": [{"name": name} for name in self.describes]}
+            )
+        if match := re.fullmatch(r"/sobjects/(\w+)/describe", path):
+            name = next(
+                (known for known in self.describes if known.lower() == match.group(1).lower()),
+                match.group(1),
+            )
+            if name not in self.describes:
+                return _error(404, "NOT_FOUND", f"The requested resource does not exist: {name}")
+            if since := request.headers.get("If-Modified-Since"):
+                # HTTP dates have one-second resolution
+                modified = self.describe_modified[name].replace(microsecond=0)
+                if modified <= parsedate_to_datetime(since):
+                    return httpx.Response(304)
+            return httpx.Response(200, json=self.describes[name])
+        return _error(404, "NOT_FOUND", f"Unknown path {path}")
+
+    def _report_instance(
+        self, request: httpx.Request, report_id: str, instance_id: str | None
+    ) -> httpx.Response:
+        """Analytics API asynchronous runs: POST starts an instance, GET polls it"""
+        if report_id not in self.reports:
+            return _error(404, "NOT_FOUND", f"Report {report_id} not found")
+        if request.method == "POST":
+            body = json.loads(request.content) if request.content else {}
+            self.report_runs.append((report_id, body.get("reportMetadata")))
+            instance_id = f"0LG{len(self._report_instances) + 1:015d}"
+            self._report_instances[instance_id] = {"polls_remaining": self.report_polls}
+            return httpx.Response(200, json={"id": instance_id, "status": "New"})
+
+        instance = self._report_instances.get(instance_id or "")
+        if instance is None:
+            return _error(404, "NOT_FOUND", f"Report instance {instance_id} not found")
+        if instance["polls_remaining"] > 0:
+            instance["polls_remaining"] -= 1
+            return httpx.Response(200, json={"attributes": {"status": "Running"}})
+        result = self.reports[report_id]
+        attributes = {**result.get("attributes", {}), "id": instance_id, "status": "Success"}
+        return httpx.Response(200, json={**result, "attributes": attributes})
+
+    async def _composite(self, request: httpx.Request) -> httpx.Response:
+        """Run each subrequest of a Composite request and collect the responses"""
+        body = json.loads(request.content)
+        subrequests = body.get("compositeRequest", [])
+        if len(subrequests) > 25:
+            return _error(400, "LIMIT_EXCEEDED", "Maximum of 25 subrequests allowed")
+        responses = []
+        for subrequest in subrequests:
+            response = await self._dispatch(
+                httpx.Request(
+                    subrequest["method"],
+                    request.url.join(subrequest["url"]),
+                    headers=subrequest.get("httpHeaders", {}),
+                    json=subrequest.get("body"),
+                )
+            )
+            responses.append(
+                {
+                    "body": response.json() if response.content else None,
+                    "httpHeaders": {},
+                    "httpStatusCode": response.status_code,
+                    "referenceId": subrequest["referenceId"],
+                }
+            )
+        return httpx.Response(200, json={"compositeResponse": responses})
+
+    def _metadata_soap(self, request: httpx.Request) -> httpx.Response:
+        """Metadata API retrieve / checkRetrieveStatus over SOAP"""
+        ns = {"soap": "http://schemas.xmlsoap.org/soap/envelope/", "m": METADATA_NS}
+        body = ElementTree.fromstring(request.content).find("soap:Body", ns)
+        call = body[0] if body is not None and len(body) else None
+        if call is None:
+            return _soap_fault("soapenv:Client", "Missing SOAP body")
+        action = call.tag.split("}")[-1]
+        if action == "retrieve":
+            members = [
+                (types.findtext("m:name", namespaces=ns) or "", member.text or "")
+                for types in call.iterfind("m:retrieveRequest/m:unpackaged/m:types", ns)
+                for member in types.iterfind("m:members", ns)
+            ]
+            retrieve_id = f"09S{next(self._locator_ids):012d}"
+            self.retrieves[retrieve_id] = {"members": members, "polls": 0}
+            return _soap_result(
+                "retrieve", f"<done>false</done><id>{retrieve_id}</id><state>Queued</state>"
+            )
+        if action == "checkRetrieveStatus":
+            retrieve_id = call.findtext("m:asyncProcessId", namespaces=ns) or ""
+            retrieve = self.retrieves.get(retrieve_id)
+            if retrieve is None:
+                return _soap_fault("sf:INVALID_ID_FIELD", f"Invalid retrieve id {retrieve_id}")
+            retrieve["polls"] += 1
+            if retrieve["polls"] < self.retrieve_polls:
+                return _soap_result(
+                    "checkRetrieveStatus",
+                    f"<done>false</done><id>{retrieve_id}</id><status>InProgress</status>",
+                )
+            archive = io.BytesIO()
+            messages = []
+            with zipfile.ZipFile(archive, "w") as zf:
+                zf.writestr("package.xml", "<Package/>")
+                for type_name, member in retrieve["members"]:
+                    if (type_name, member) in self.metadata:
+                        path, content = self.metadata[(type_name, member)]
+                        zf.writestr(path, content)
+                    else:
+                        messages.append(
+                            f"<messages><problem>Entity of type '{type_name}' named "
+                            f"'{member}' cannot be found</problem></messages>"
+                        )
+            return _soap_result(
+                "checkRetrieveStatus",
+                f"<done>true</done><id>{retrieve_id}</id>{''.join(messages)}"
+                f"<status>Succeeded</status><success>true</success>"
+                f"<zipFile>{base64.b64encode(archive.getvalue()).decode()}</zipFile>",
+            )
+        return _soap_fault("soapenv:Client", f"Unsupported call {action}")
+
+    def _select(
+        self, soql: str, *, tooling: bool
+    ) -> List[Dict[str, Any]] | httpx.Response:
+        """Records matched by a query, or the error response Salesforce would send"""
+        from_match = _FROM_RE.search(soql)
+        if not from_match:
+            return _error(400, "MALFORMED_QUERY", f"unexpected token in query: {soql}")
+        store = self.tooling_records if tooling else self.records
+        # SObject names are case-insensitive
+        object_name = next(
+            (name for name in store if name.lower() == from_match.group(1).lower()),
+            from_match.group(1),
+        )
+        if object_name not in store:
+            return _error(
+                400, "INVALID_TYPE", f"sObject type '{object_name}' is not supported."
+            )
+        records = _where(soql, store[object_name])
+        if limit_match := _LIMIT_RE.search(soql):
+            records = records[: int(limit_match.group(1))]
+        return records
+
+    def _query(self, request: httpx.Request, *, tooling: bool) -> httpx.Response:
+        soql = request.url.params.get("q", "")
+        self.queries.append(soql)
+        records = self._select(soql, tooling=tooling)
+        if isinstance(records, httpx.Response):
+            return records
+        select = _SELECT_RE.match(soql)
+        if select and _AGGREGATE_RE.search(select.group(1)):
+            records = [_aggregate(select.group(1), records)]
+        elif select and re.fullmatch(r"\w+(\s*,\s*\w+)*", select.group(1).strip()):
+            # Only the selected fields come back (relationship fields are left alone)
+            columns = [c.strip() for c in select.group(1).split(",")]
+            records = [
+                {key: value for key, value in r.items() if key == "attributes" or key in columns}
+                for r in records
+            ]
+        batch_size = self.batch_size
+        options = request.headers.get("Sforce-Query-Options", "")
+        if match := re.search(r"batchSize=(\d+)", options):
+            batch_size = int(match.group(1))
+        return self._page(records, 0, tooling, batch_size=batch_size)
+
+    def _bulk(self, request: httpx.Request, path: str) -> httpx.Response:
+        if request.method == "POST" and path == "":
+            soql = json.loads(request.content)["query"]
+            records = self._select(soql, tooling=False)
+            if isinstance(records, httpx.Response):
+                return records
+            job_id = f"750{len(self.bulk_jobs) + 1:015d}"
+            self.bulk_jobs[job_id] = {
+                "soql": soql,
+                "records": records,
+                "polls_remaining": self.bulk_polls,
+            }
+            return httpx.Response(200, json={"id": job_id, "state": "UploadComplete"})
+
+        match = re.fullmatch(r"/(\w+)(/results)?", path)
+        if not match or match.group(1) not in self.bulk_jobs:
+            return _error(404, "NOT_FOUND", f"Unknown bulk job {path}")
+        job_id = match.group(1)
+        job = self.bulk_jobs[job_id]
+        if request.method == "PATCH":
+            job["state"] = json.loads(request.content)["state"]
+            return httpx.Response(200, json={"id": job_id, "state": job["state"]})
+        if not match.group(2):
+            if job.get("state") == "Aborted":
+                return httpx.Response(200, json={"id": job_id, "state": "Aborted"})
+            if job["polls_remaining"] > 0:
+                job["polls_remaining"] -= 1
+                return httpx.Response(200, json={"id": job_id, "state": "InProgress"})
+            return httpx.Response(
+                200,
+                json={
+                    "id": job_id,
+                    "state": "JobComplete",
+                    "numberRecordsProcessed": len(job["records"]),
+                },
+            )
+
+        offset = int(request.url.params.get("locator") or 0)
+        chunk_size = int(request.url.params.get("maxRecords") or self.bulk_chunk_size)
+        chunk = job["records"][offset : offset + chunk_size]
+        select = _SELECT_RE.match(job["soql"])
+        columns = [c.strip() for c in select.group(1).split(",")] if select else ["Id"]
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows([[record.get(c, "") for c in columns] for record in chunk])
+        end = offset + len(chunk)
+        return httpx.Response(
+            200,
+            content=out.getvalue().encode(),
+            headers={
+                "Content-Type": "text/csv",
+                "Sforce-NumberOfRecords": str(len(chunk)),
+                "Sforce-Locator": str(end) if end < len(job["records"]) else "null",
+            },
+        )
+
+    def _query_more(self, locator: str) -> httpx.Response:
+        cursor_id, _, offset = locator.rpartition("-")
+        if cursor_id not in self._cursors:
+            return _error(400, "INVALID_QUERY_LOCATOR", "invalid query locator")
+        records, tooling, batch_size = self._cursors[cursor_id]
+        return self._page(
+            records, int(offset), tooling, batch_size=batch_size, cursor_id=cursor_id
+        )
+
+    def _page(
+        self,
+        records: List[Dict[str, Any]],
+        offset: int,
+        tooling: bool,
+        *,
+        batch_size: int,
+        cursor_id: str | None = None,
+    ) -> httpx.Response:
+        end = offset + batch_size
+        body: Dict[str, Any] = {
+            "totalSize": len(records),
+            "done": end >= len(records),
+            "records": records[offset:end],
+        }
+        if not body["done"]:
+            if cursor_id is None:
+                cursor_id = f"01g{next(self._locator_ids):015d}"
+                self._cursors[cursor_id] = (records, tooling, batch_size)
+            base = f"/services/data/v{self.api_version}{'/tooling' if tooling else ''}"
+            body["nextRecordsUrl"] = f"{base}/query/{cursor_id}-{end}"
+        return httpx.Response(200, json=body)
+
+
+def _where(soql: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Apply a WHERE clause of AND-ed comparisons and IN lists; anything else is ignored"""
+    match = _WHERE_RE.search(soql.split(" FROM ", 1)[-1])
+    if not match or re.search(r"\bOR\b|\(\s*SELECT\b", match.group(1), re.IGNORECASE):
+        return records
+    conditions = re.split(r"\s+AND\s+", match.group(1).strip(), flags=re.IGNORECASE)
+    return [r for r in records if all(_matches(r, c) for c in conditions)]
+
+
+def _matches(record: Dict[str, Any], condition: str) -> bool:
+    if match := _LIKE_RE.match(condition):
+        field_name, pattern = match.groups()
+        pattern = re.escape(pattern.replace("\\'", "'")).replace("%", ".*").replace("_", ".")
+        return re.fullmatch(pattern, str(record.get(field_name) or ""), re.IGNORECASE) is not None
+    if match := _IN_RE.match(condition):
+        field_name, negated, values = match.groups()
+        found = record.get(field_name) in _STRING_RE.findall(values)
+        return not found if negated else found
+    if match := _COMPARISON_RE.match(condition):
+        field_name, comparison, literal = match.groups()
+        value, expected = _comparable(record.get(field_name), literal.strip())
+        if comparison in ("=", "!="):
+            return bool(value == expected) == (comparison == "=")
+        if value is None or expected is None:
+            return False
+        return bool(_COMPARISONS[comparison](value, expected))
+    return True
+
+
+def _comparable(value: Any, literal: str) -> Tuple[Any, Any]:
+    """Turn a SOQL literal, and the record value it is compared with, into comparable values"""
+    if string := _STRING_RE.fullmatch(literal):
+        return value, string.group(1).replace("\\'", "'")
+    if literal.lower() in ("true", "false"):
+        return value, literal.lower() == "true"
+    if literal.lower() == "null":
+        return value, None
+    if re.fullmatch(r"\d{4}-\d{2}-\d{2}T[\d:.]+(Z|[+-]\d{2}:?\d{2})", literal):
+        return (
+            datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None,
+            datetime.fromisoformat(literal.replace("Z", "+00:00")),
+        )
+    try:
+        return value, float(literal)
+    except ValueError:
+        return value, literal
+
+
+def _aggregate(select: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The single row of an ungrouped COUNT/MAX/MIN query"""
+    row: Dict[str, Any] = {"attributes": {"type": "AggregateResult"}}
+    for index, match in enumerate(_AGGREGATE_RE.finditer(select)):
+        function, field_name, alias = match.groups()
+        values = [r[field_name] for r in records if r.get(field_name) is not None]
+        if function.upper() == "COUNT":
+            value: Any = len(values) if field_name else len(records)
+        else:
+            value = (max if function.upper() == "MAX" else min)(values, default=None)
+        row[alias or f"expr{index}"] = value
+    return row
+
+
+def _soap_result(action: str, result: str) -> httpx.Response:
+    return httpx.Response(
+        200,
+        content=(
+            '<?xml version="1.0" encoding="UTF-8"?><soapenv:Envelope '
+            'xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">'
+            f'<soapenv:Body><{action}Response xmlns="{METADATA_NS}"><result>{result}</result>'
+            f"</{action}Response></soapenv:Body></soapenv:Envelope>"
+        ).encode(),
+        headers={"Content-Type": "text/xml"},
+    )
+
+
+def _soap_fault(code: str, message: str) -> httpx.Response:
+    return httpx.Response(
+        500,
+        content=(
+            '<?xml version="1.0" encoding="UTF-8"?><soapenv:Envelope '
+            'xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"><soapenv:Body>'
+            f"<soapenv:Fault><faultcode>{code}</faultcode><faultstring>{message}</faultstring>"
+            "</soapenv:Fault></soapenv:Body></soapenv:Envelope>"
+        ).encode(),
+        headers={"Content-Type": "text/xml"},
+    )
+
+
+def _error(status: int, error_code: str, message: str) -> httpx.Response:
+    return httpx.Response(status, json=[{"errorCode": error_code, "message": message}])
@@ -0,0 +1,47 @@
+from __future__ import annotations
+import io
+import zipfile
+from pathlib import PurePosixPath
+from typing import Dict, List, Mapping, Sequence
+from xml.sax.saxutils import escape
+
+METADATA_NS = "http://soap.sforce.com/2006/04/metadata"
+
+
+def package_xml(members: Mapping[str, Sequence[str]], api_version: str | None = None) -> str:
+    """Build a package.xml manifest for {metadata type: [member names]}"""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<Package xmlns="{METADATA_NS}">']
+    for type_name, names in members.items():
+        lines.append("    <types>")
+        lines.extend(f"        <members>{escape(name)}</members>" for name in names)
+        lines.append(f"        <name>{escape(type_name)}</name>")
+        lines.append("    </types>")
+    if api_version:
+        lines.append(f"    <version>{escape(api_version)}</version>")
+    lines.append("</Package>")
+    return "\n".join(lines) + "\n"
+
+
+def member_key(path: str | PurePosixPath) -> str:
+    """Key of a retrieved file: its folder and name, e.g. flows/My_Flow.flow
+
+    Retrieves nest files under a package folder or not depending on how they were run,
+    so only the last two path components are kept.
+    """
+    parts = PurePosixPath(path).parts
+    return "/".join(parts[-2:])
+
+
+def unzip_members(data: bytes) -> Dict[str, bytes]:
+    """Read the files of a retrieve zip, keyed by member_key()"""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {
+            member_key(info.filename): archive.read(info)
+            for info in archive.infolist()
+            if not info.is_dir() and not info.filename.endswith("package.xml")
+        }
+
+
+def flow_file_keys(name: str) -> List[str]:
+    """Keys a flow's file can have: metadata format (.flow) or source format"""
+    return [f"flows/{name}.flow", f"flows/{name}.flow-meta.xml"]
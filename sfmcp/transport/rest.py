@@ -0,0 +1,526 @@
+from __future__ import annotations
+import asyncio
+import base64
+import importlib.util
+import logging
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Mapping, Sequence, Tuple
+from urllib.parse import quote
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+import httpx
+from ..jsonstream import RecordStream, loads
+from ..metrics import JSON_DECODE_SECONDS, track_request
+from ..tracing import span
+from .base import SalesforceAPIError, Transport
+from .metadata import METADATA_NS, unzip_members
+
+logger = logging.getLogger("sfmcp.transport.rest")
+
+# Subrequest limit of the Composite resource
+COMPOSITE_MAX_SUBREQUESTS = 25
+
+SOAP_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+
+
+class RestTransport(Transport):
+    """Transport that calls the Salesforce REST API over one pooled keep-alive connection"""
+
+    name = "rest"
+
+    def __init__(
+        self,
+        *,
+        instance_url: str,
+        access_token: str,
+        api_version: str = "61.0",
+        http2: bool = True,
+        max_connections: int = 10,
+        timeout: float = 120.0,
+        httpx_transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self._instance_url = instance_url.rstrip("/")
+        self._access_token = access_token
+        self._api_version = api_version
+        self._max_connections = max_connections
+        self._timeout = timeout
+        self._httpx_transport = httpx_transport
+        # HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+        self._http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self._http2:
+            logger.debug("h2 is not installed, using HTTP/1.1 for the REST transport")
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def data_path(self) -> str:
+        return f"/services/data/v{self._api_version}"
+
+    def _http(self) -> httpx.AsyncClient:
+        # Created lazily so the pool binds to the event loop that actually uses it
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self._instance_url,
+                headers={
+                    "Authorization": f"Bearer {self._access_token}",
+                    "Accept": "application/json",
+                },
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                timeout=self._timeout,
+                transport=self._httpx_transport,
+            )
+        return self._client
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        return await self._scheduled(lambda: self._send(method, path, **kwargs))
+
+    async def _send(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        logger.debug(f"REST {method} {path}")
+        with track_request("rest", _operation(path)) as track:
+            try:
+                response = await self._http().request(method, path, **kwargs)
+            except httpx.HTTPError as e:
+                logger.error(f"REST request failed: {e}")
+                raise SalesforceAPIError(f"Salesforce REST request failed: {e}") from e
+
+            track.sent = len(response.request.content)
+            track.received = len(response.content)
+            self._track_limits(response)
+            if response.status_code >= 400:
+                raise _api_error(response)
+            return response
+
+    def _track_limits(self, response: httpx.Response) -> None:
+        if self.scheduler is not None and (info := response.headers.get("Sforce-Limit-Info")):
+            self.scheduler.record_limit_info(info)
+
+    async def _get_json(self, path: str, **kwargs: Any) -> Any:
+        response = await self._request("GET", path, **kwargs)
+        with span("json.decode", source="rest"), JSON_DECODE_SECONDS.time(source="rest"):
+            return loads(response.content)
+
+    async def query(
+        self, soql: str, *, tooling: bool = False, batch_size: int | None = None
+    ) -> Dict[str, Any]:
+        endpoint = "tooling/query" if tooling else "query"
+        headers = {}
+        if batch_size is not None:
+            # Salesforce accepts batch sizes between 200 and 2000
+            headers["Sforce-Query-Options"] = f"batchSize={min(max(batch_size, 200), 2000)}"
+        page: Dict[str, Any] = await self._get_json(
+            f"{self.data_path}/{endpoint}", params={"q": soql}, headers=headers
+        )
+        return page
+
+    async def query_more(self, next_records_url: str) -> Dict[str, Any]:
+        page: Dict[str, Any] = await self._get_json(next_records_url)
+        return page
+
+    async def iter_query(
+        self, soql: str, *, tooling: bool = False
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        endpoint = "tooling/query" if tooling else "query"
+        url: str | None = f"{self.data_path}/{endpoint}"
+        params: Dict[str, Any] | None = {"q": soql}
+        attempt = 0
+        while url is not None:
+            stream = RecordStream()
+            logger.debug(f"REST GET {url} (streamed)")
+            try:
+                async with self._slot(), self._http().stream(
+                    "GET", url, params=params
+                ) as response:
+                    with track_request("rest", _operation(url)) as track:
+                        self._track_limits(response)
+                        if response.status_code >= 400:
+                            await response.aread()
+                            raise _api_error(response)
+                        async for data in response.aiter_bytes():
+                            track.received += len(data)
+                            records = stream.feed(data)
+                            if records:
+                                yield records
+            except httpx.HTTPError as e:
+                logger.error(f"REST request failed: {e}")
+                raise SalesforceAPIError(f"Salesforce REST request failed: {e}") from e
+            except SalesforceAPIError as e:
+                # Error responses come before any record, so the page can be asked again
+                if not self._should_retry(e, attempt):
+                    raise
+                attempt += 1
+                continue
+            attempt = 0
+            page = stream.close()
+            if "records" not in page:
+                raise SalesforceAPIError("Unexpected response format from Salesforce")
+            url = None if page.get("done", True) else page.get("nextRecordsUrl")
+            params = None
+
+    async def list_sobjects(self) -> List[str]:
+        result = await self._get_json(f"{self.data_path}/sobjects")
+        return [sobject["name"] for sobject in result.get("sobjects", [])]
+
+    async def describe_sobject(
+        self, object_name: str, *, if_modified_since: str | None = None
+    ) -> Dict[str, Any] | None:
+        headers = {"If-Modified-Since": if_modified_since} if if_modified_since else {}
+        response = await self._request(
+            "GET", f"{self.data_path}/sobjects/{quote(object_name)}/describe", headers=headers
+        )
+        if response.status_code == 304:
+            return None
+        describe: Dict[str, Any] = loads(response.content)
+        return describe
+
+    async def describe_sobjects(
+        self, requests: Sequence[Tuple[str, str | None]], *, concurrency: int = 4
+    ) -> List[Dict[str, Any] | None | BaseException]:
+        """Describe several SObjects through the Composite resource, 25 per round trip"""
+        chunks = [
+            requests[start : start + COMPOSITE_MAX_SUBREQUESTS]
+            for start in range(0, len(requests), COMPOSITE_MAX_SUBREQUESTS)
+        ]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(chunk: Sequence[Tuple[str, str | None]]) -> List[Any]:
+            async with semaphore:
+                try:
+                    return await self._composite_describe(chunk)
+                except Exception as e:
+                    return [e] * len(chunk)
+
+        results: List[Dict[str, Any] | None | BaseException] = []
+        for chunk_results in await asyncio.gather(*(send(chunk) for chunk in chunks)):
+            results.extend(chunk_results)
+        return results
+
+    async def _composite_describe(
+        self, requests: Sequence[Tuple[str, str | None]]
+    ) -> List[Dict[str, Any] | None | BaseException]:
+        subrequests = []
+        for index, (name, since) in enumerate(requests):
+            subrequest: Dict[str, Any] = {
+                "method": "GET",
+                "url": f"{self.data_path}/sobjects/{quote(name)}/describe",
+                "referenceId": f"describe{index}",
+            }
+            if since:
+                subrequest["httpHeaders"] = {"If-Modified-Since": since}
+            subrequests.append(subrequest)
+        response = await self._request(
+            "POST",
+            f"{self.data_path}/composite",
+            json={"allOrNone": False, "compositeRequest": subrequests},
+        )
+
+        by_reference = {
+            item.get("referenceId"): item
+            for item in loads(response.content).get("compositeResponse", [])
+        }
+        results: List[Dict[str, Any] | None | BaseException] = []
+        for index, (name, _) in enumerate(requests):
+            item = by_reference.get(f"describe{index}", {})
+            status = item.get("httpStatusCode", 500)
+            body = item.get("body")
+            if status == 304:
+                results.append(None)
+            elif status < 400 and isinstance(body, dict):
+                results.append(body)
+            else:
+                error = body[0] if isinstance(body, list) and body else {}
+                results.append(
+                    SalesforceAPIError(
+                        f"Salesforce describe of {name} failed ({status} "
+                        f"{error.get('errorCode')}): {error.get('message')}",
+                        status=status,
+                        error_code=error.get("errorCode"),
+                    )
+                )
+        return results
+
+    async def create_bulk_query(self, soql: str) -> str:
+        """Create a Bulk API 2.0 query job and return its id"""
+        response = await self._request(
+            "POST",
+            f"{self.data_path}/jobs/query",
+            json={"operation": "query", "query": soql, "contentType": "CSV", "lineEnding": "LF"},
+        )
+        job_id: str = loads(response.content)["id"]
+        return job_id
+
+    async def wait_bulk_query(
+        self, job_id: str, *, poll_interval: float = 1.0, timeout: float = 3600.0
+    ) -> Dict[str, Any]:
+        """Poll a query job without blocking the event loop until it completes"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = poll_interval
+        while True:
+            job: Dict[str, Any] = await self._get_json(f"{self.data_path}/jobs/query/{job_id}")
+            state = job.get("state")
+            if state == "JobComplete":
+                return job
+            if state in ("Failed", "Aborted"):
+                raise SalesforceAPIError(
+                    f"Bulk query job {job_id} {state.lower()}: {job.get('errorMessage')}"
+                )
+            if loop.time() + interval > deadline:
+                raise SalesforceAPIError(f"Bulk query job {job_id} did not finish in {timeout}s")
+            await asyncio.sleep(interval)
+            # Back off gently: long extracts do not need sub-second polling
+            interval = min(interval * 1.5, 10.0)
+
+    async def _abort_bulk_query(self, job_id: str) -> None:
+        try:
+            # Sent outside the scheduler and briefly: the caller is already going away
+            async with asyncio.timeout(10):
+                await self._send(
+                    "PATCH", f"{self.data_path}/jobs/query/{job_id}", json={"state": "Aborted"}
+                )
+        except Exception as e:
+            logger.debug(f"Could not abort bulk query job {job_id}: {e}")
+
+    async def iter_bulk_results(
+        self, job_id: str, *, max_records: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """Stream the CSV result of a completed job as one CSV (a single header row)
+
+        Salesforce splits results into locator-addressed chunks, each with its own
+        header row; the headers of every chunk after the first are dropped.
+        """
+        locator: str | None = None
+        first_chunk = True
+        attempt = 0
+        while True:
+            params: Dict[str, Any] = {}
+            if max_records is not None:
+                params["maxRecords"] = max_records
+            if locator:
+                params["locator"] = locator
+            async with self._slot(), self._http().stream(
+                "GET",
+                f"{self.data_path}/jobs/query/{job_id}/results",
+                params=params,
+                headers={"Accept": "text/csv"},
+            ) as response:
+                with track_request("rest", "bulk_results") as track:
+                    self._track_limits(response)
+                    if response.status_code >= 400:
+                        await response.aread()
+                        error = _api_error(response)
+                        if not self._should_retry(error, attempt):
+                            raise error
+                        attempt += 1
+                        continue
+                    attempt = 0
+                    skip_header = not first_chunk
+                    async for data in response.aiter_bytes():
+                        track.received += len(data)
+                        if skip_header:
+                            newline = data.find(b"\n")
+                            if newline < 0:
+                                continue
+                            data = data[newline + 1 :]
+                            skip_header = False
+                        if data:
+                            yield data
+                    locator = response.headers.get("Sforce-Locator")
+            first_chunk = False
+            if not locator or locator == "null":
+                return
+
+    async def bulk_query(
+        self,
+        soql: str,
+        destination: Path,
+        *,
+        poll_interval: float = 1.0,
+        timeout: float = 3600.0,
+    ) -> Dict[str, Any]:
+        job_id = await self.create_bulk_query(soql)
+        # Results go to a temporary file next to the destination, written off the event
+        # loop, which replaces the destination only once the download is complete
+        partial = destination.with_name(f".{destination.name}.{job_id}.part")
+        try:
+            job = await self.wait_bulk_query(
+                job_id, poll_interval=poll_interval, timeout=timeout
+            )
+            f = await asyncio.to_thread(open, partial, "wb")
+            try:
+                async for data in self.iter_bulk_results(job_id):
+                    await asyncio.to_thread(f.write, data)
+            finally:
+                f.close()
+            await asyncio.to_thread(os.replace, partial, destination)
+        except BaseException:
+            # Nobody will collect the results: drop the partial file and the job
+            partial.unlink(missing_ok=True)
+            await self._abort_bulk_query(job_id)
+            raise
+        return {"jobId": job_id, "rowCount": job.get("numberRecordsProcessed", 0)}
+
+    async def _metadata_call(self, action: str, body: str) -> ElementTree.Element:
+        """Call the Metadata SOAP API and return the `result` element of its response"""
+        envelope = (
+            f'<?xml version="1.0" encoding="UTF-8"?><Envelope xmlns="{SOAP_NS}">'
+            f'<Header><SessionHeader xmlns="{METADATA_NS}">'
+            f"<sessionId>{escape(self._access_token)}</sessionId></SessionHeader></Header>"
+            f'<Body><{action} xmlns="{METADATA_NS}">{body}</{action}></Body></Envelope>'
+        )
+        logger.debug(f"Metadata API {action}")
+        content = envelope.encode()
+        try:
+            async with self._slot():
+                with track_request("rest", f"metadata_{action}", sent=len(content)) as track:
+                    response = await self._http().post(
+                        f"/services/Soap/m/{self._api_version}",
+                        content=content,
+                        headers={"Content-Type": "text/xml; charset=UTF-8", "SOAPAction": action},
+                    )
+                    track.received = len(response.content)
+            root = ElementTree.fromstring(response.content)
+        except (httpx.HTTPError, ElementTree.ParseError) as e:
+            logger.error(f"Metadata API {action} failed: {e}")
+            raise SalesforceAPIError(f"Salesforce Metadata API {action} failed: {e}") from e
+
+        fault = root.find(f".//{{{SOAP_NS}}}Fault")
+        if fault is not None:
+            error_code = fault.findtext("faultcode")
+            message = fault.findtext("faultstring")
+            logger.error(f"Metadata API {action} fault {error_code}: {message}")
+            raise SalesforceAPIError(
+                f"Salesforce Metadata API {action} failed ({error_code}): {message}",
+                status=response.status_code,
+                error_code=error_code,
+            )
+        result = root.find(f".//{{{METADATA_NS}}}result")
+        if result is None:
+            raise SalesforceAPIError(f"Unexpected Metadata API {action} response")
+        return result
+
+    async def retrieve_metadata(
+        self,
+        members: Mapping[str, Sequence[str]],
+        *,
+        poll_interval: float = 1.0,
+        timeout: float = 600.0,
+    ) -> Dict[str, bytes]:
+        """Retrieve through the Metadata API and unpack the zip in memory, without files"""
+        types = "".join(
+            "<types>"
+            + "".join(f"<members>{escape(name)}</members>" for name in names)
+            + f"<name>{escape(type_name)}</name></types>"
+            for type_name, names in members.items()
+        )
+        result = await self._metadata_call(
+            "retrieve",
+            f"<retrieveRequest><apiVersion>{self._api_version}</apiVersion>"
+            f"<singlePackage>true</singlePackage><unpackaged>{types}</unpackaged>"
+            "</retrieveRequest>",
+        )
+        process_id = result.findtext(f"{{{METADATA_NS}}}id")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = poll_interval
+        while True:
+            status = await self._metadata_call(
+                "checkRetrieveStatus",
+                f"<asyncProcessId>{process_id}</asyncProcessId><includeZip>true</includeZip>",
+            )
+            if status.findtext(f"{{{METADATA_NS}}}done") == "true":
+                break
+            if loop.time() + interval > deadline:
+                raise SalesforceAPIError(f"Retrieve {process_id} did not finish in {timeout}s")
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, 10.0)
+
+        state = status.findtext(f"{{{METADATA_NS}}}status")
+        if state != "Succeeded":
+            raise SalesforceAPIError(
+                f"Retrieve {process_id} {(state or 'failed').lower()}: "
+                f"{status.findtext(f'{{{METADATA_NS}}}errorMessage')}"
+            )
+        for message in status.findall(f"{{{METADATA_NS}}}messages"):
+            logger.debug(f"Retrieve {process_id}: {message.findtext(f'{{{METADATA_NS}}}problem')}")
+        return unzip_members(base64.b64decode(status.findtext(f"{{{METADATA_NS}}}zipFile") or ""))
+
+    async def run_report(
+        self,
+        report_id: str,
+        *,
+        report_metadata: Dict[str, Any] | None = None,
+        include_details: bool = False,
+        poll_interval: float = 1.0,
+        timeout: float = 600.0,
+    ) -> Dict[str, Any]:
+        path = f"{self.data_path}/analytics/reports/{quote(report_id)}/instances"
+        response = await self._request(
+            "POST",
+            path,
+            params={"includeDetails": "true" if include_details else "false"},
+            json={"reportMetadata": report_metadata} if report_metadata else None,
+        )
+        instance_id = loads(response.content)["id"]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = poll_interval
+        while True:
+            await asyncio.sleep(interval)
+            result: Dict[str, Any] = await self._get_json(f"{path}/{quote(instance_id)}")
+            attributes = result.get("attributes") or {}
+            if attributes.get("status") == "Success":
+                return result
+            if attributes.get("status") == "Error":
+                raise SalesforceAPIError(
+                    f"Report {report_id} failed: {attributes.get('errorMessage')}"
+                )
+            if loop.time() + interval > deadline:
+                raise SalesforceAPIError(f"Report {report_id} did not finish in {timeout}s")
+            interval = min(interval * 1.5, 10.0)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _operation(path: str) -> str:
+    """Metric label for a REST path: the kind of resource, without ids or names"""
+    path = path.split("?", 1)[0]
+    if "/services/data/" in path:
+        path = path.split("/services/data/", 1)[1].partition("/")[2]
+    parts = path.strip("/").split("/")
+    if parts[0] == "tooling":
+        return "tooling_query" if parts[1:2] == ["query"] else "tooling"
+    if parts[0] == "sobjects":
+        return "describe" if parts[-1] == "describe" else "sobjects"
+    if parts[0] == "jobs":
+        return "bulk_job"
+    if parts[0] == "analytics":
+        return "report"
+    return parts[0] or "other"
+
+
+def _api_error(response: httpx.Response) -> SalesforceAPIError:
+    """Build an error from a Salesforce REST error body ([{message, errorCode}])"""
+    error_code = None
+    message = response.text or response.reason_phrase
+    try:
+        body = loads(response.content)
+    except ValueError:
+        body = None
+    if isinstance(body, list) and body and isinstance(body[0], dict):
+        error_code = body[0].get("errorCode")
+        message = body[0].get("message", message)
+    logger.error(f"Salesforce REST error {response.status_code} {error_code}: {message}")
+    return SalesforceAPIError(
+        f"Salesforce REST request failed ({response.status_code} {error_code}): {message}",
+        status=response.status_code,
+        error_code=error_code,
+    )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from typing import Any, Callable
+import pytest
+from sfmcp.client_registry import ClientRegistry
+from sfmcp.salesforce_client import SalesforceClient
+from sfmcp.transport import RestTransport
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+INSTANCE_URL = "https://example.my.salesforce.com"
+
+
+@pytest.fixture
+def env_setup(monkeypatch: pytest.MonkeyPatch) -> bool:
+    # Provide dummy env so settings load; replace with real values in dev
+    monkeypatch.setenv("SF_INSTANCE_URL", INSTANCE_URL)
+    monkeypatch.setenv("SF_ACCESS_TOKEN", "REPLACE_ME")
+    return True
+
+
+@pytest.fixture
+def org(request: pytest.FixtureRequest) -> FakeSalesforceOrg:
+    """The fake org the clients below talk to
+
+    Parametrize it indirectly with FakeSalesforceOrg keyword arguments, e.g.
+    `@pytest.mark.parametrize("org", [{"latency": 0.01}], indirect=True)`.
+    """
+    return FakeSalesforceOrg(**getattr(request, "param", {}))
+
+
+@pytest.fixture
+def rest_transport(org: FakeSalesforceOrg) -> Callable[[], RestTransport]:
+    """Build a RestTransport served by `org`"""
+
+    def make() -> RestTransport:
+        return RestTransport(
+            instance_url=INSTANCE_URL, access_token="token", httpx_transport=org.transport()
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_client(rest_transport: Callable[[], RestTransport]) -> Callable[..., SalesforceClient]:
+    """Build a SalesforceClient on the REST transport served by `org`
+
+    Keyword arguments (catalog, query_cache, org_alias, ...) go to SalesforceClient.
+    """
+
+    def make(**kwargs: Any) -> SalesforceClient:
+        kwargs.setdefault("org_alias", "fake")
+        return SalesforceClient(
+            instance_url=INSTANCE_URL, access_token="token", transport=rest_transport(), **kwargs
+        )
+
+    return make
+
+
+@pytest.fixture
+def clients(make_client: Callable[..., SalesforceClient]) -> ClientRegistry:
+    """A ClientRegistry whose clients all talk to `org`"""
+    return ClientRegistry(lambda org_alias: make_client(org_alias=org_alias or "fake"))
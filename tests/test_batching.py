@@ -0,0 +1,94 @@
+from __future__ import annotations
+import asyncio
+from typing import Callable
+import pytest
+from sfmcp.batching import DescribeBatcher
+from sfmcp.transport import RestTransport, SalesforceAPIError
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+@pytest.mark.parametrize("org", [{"latency": 0.01}], indirect=True)
+def test_concurrent_describes_are_sent_as_composite_batches(
+    org: FakeSalesforceOrg, rest_transport: Callable[[], RestTransport]
+):
+    names = [f"Object{i}__c" for i in range(30)]
+    for name in names:
+        org.add_sobject(name)
+    transport = rest_transport()
+    batcher = DescribeBatcher(transport, window=0.01)
+
+    async def run() -> None:
+        results = await asyncio.gather(
+            *(batcher.describe(name) for name in names),
+            batcher.describe("Missing__c"),
+            return_exceptions=True,
+        )
+        assert [r["name"] for r in results[:30] if isinstance(r, dict)] == names
+        assert isinstance(results[30], SalesforceAPIError) and results[30].status == 404
+        await transport.aclose()
+
+    asyncio.run(run())
+    # 31 describes: a full batch of 25 sent early, then the remaining 6 after the window
+    assert org.requests == [("POST", "/services/data/v61.0/composite")] * 2
+    assert batcher.stats()["batches"] == 2 and batcher.stats()["largest_batch"] == 25
+
+
+def test_batched_describe_honours_if_modified_since(
+    org: FakeSalesforceOrg, rest_transport: Callable[[], RestTransport]
+):
+    org.add_sobject("Account")
+    transport = rest_transport()
+    batcher = DescribeBatcher(transport)
+
+    async def run() -> None:
+        future = "Fri, 01 Jan 2100 00:00:00 GMT"
+        assert await batcher.describe("Account", if_modified_since=future) is None
+        with pytest.raises(SalesforceAPIError):
+            await batcher.describe("Nope")
+        await transport.aclose()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("org", [{"latency": 0.02}], indirect=True)
+def test_cancelling_the_first_caller_does_not_fail_coalesced_callers(
+    org: FakeSalesforceOrg, rest_transport: Callable[[], RestTransport]
+):
+    org.add_sobject("Account")
+    transport = rest_transport()
+    batcher = DescribeBatcher(transport)
+
+    async def run() -> None:
+        leader = asyncio.ensure_future(batcher.describe("Account"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(batcher.describe("account"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        result = await follower
+        assert result is not None and result["name"] == "Account"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        await transport.aclose()
+
+    asyncio.run(run())
+    assert batcher.stats()["deduplicated"] == 1 and len(org.requests) == 1
+
+
+def test_describes_abandoned_before_their_batch_is_sent_are_dropped(
+    org: FakeSalesforceOrg, rest_transport: Callable[[], RestTransport]
+):
+    org.add_sobject("Account")
+    transport = rest_transport()
+    batcher = DescribeBatcher(transport, window=0.02)
+
+    async def run() -> None:
+        abandoned = asyncio.ensure_future(batcher.describe("Contact"))
+        kept = asyncio.ensure_future(batcher.describe("Account"))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        result = await kept
+        assert result is not None and result["name"] == "Account"
+        await transport.aclose()
+
+    asyncio.run(run())
+    assert batcher.stats()["largest_batch"] == 1
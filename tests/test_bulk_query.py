@@ -0,0 +1,67 @@
+from __future__ import annotations
+import asyncio
+import csv
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+import pytest
+from sfmcp.config.settings import settings
+from sfmcp.salesforce_client import SalesforceClient
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+@pytest.mark.parametrize("org", [{"bulk_polls": 2, "bulk_chunk_size": 40}], indirect=True)
+def test_bulk_query_streams_chunks_to_one_csv(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    org: FakeSalesforceOrg,
+    make_client: Callable[..., SalesforceClient],
+):
+    monkeypatch.setattr(settings, "bulk_poll_interval", 0.01)
+    org.add_sobject(
+        "Contact", records=[{"Id": f"003{i}", "Email": f"c{i}@example.com"} for i in range(100)]
+    )
+    sf = make_client()
+    destination = tmp_path / "out" / "contacts.csv"
+
+    async def run() -> None:
+        result = await sf.bulk_query("SELECT Id, Email FROM Contact", destination)
+        assert result["rowCount"] == 100 and result["path"] == str(destination)
+        await sf.aclose()
+
+    asyncio.run(run())
+    with open(destination, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Id", "Email"]
+    assert [row[0] for row in rows[1:]] == [f"003{i}" for i in range(100)]
+    assert len([path for _, path in org.requests if path.endswith("/results")]) == 3
+
+
+@pytest.mark.parametrize("org", [{"bulk_chunk_size": 40}], indirect=True)
+def test_failed_bulk_download_leaves_no_file_and_aborts_the_job(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    org: FakeSalesforceOrg,
+    make_client: Callable[..., SalesforceClient],
+):
+    monkeypatch.setattr(settings, "bulk_poll_interval", 0.01)
+    org.add_sobject("Contact", records=[{"Id": f"003{i}"} for i in range(100)])
+    sf = make_client()
+    download = sf.transport.iter_bulk_results
+
+    async def failing_download(job_id: str, **kwargs: Any) -> AsyncIterator[bytes]:
+        async for data in download(job_id, **kwargs):
+            yield data
+            org.server_errors = 1  # the next chunk fails
+
+    monkeypatch.setattr(sf.transport, "iter_bulk_results", failing_download)
+    destination = tmp_path / "contacts.csv"
+
+    async def run() -> None:
+        with pytest.raises(Exception, match="SERVER_UNAVAILABLE"):
+            await sf.bulk_query("SELECT Id FROM Contact", destination)
+        await sf.aclose()
+
+    asyncio.run(run())
+    assert list(tmp_path.iterdir()) == []
+    [job] = org.bulk_jobs.values()
+    assert job["state"] == "Aborted"
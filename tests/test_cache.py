@@ -0,0 +1,50 @@
+from __future__ import annotations
+import asyncio
+from typing import Any, Dict, List
+from sfmcp.cache import ByteLRU, DescribeCache
+
+
+def test_byte_lru_evicts_least_recently_used():
+    lru: ByteLRU[str] = ByteLRU(max_bytes=10)
+    lru.put("a", "a", 4)
+    lru.put("b", "b", 4)
+    lru.get("a")
+    lru.put("c", "c", 4)
+    assert "a" in lru and "c" in lru and "b" not in lru
+    assert lru.total_bytes == 8
+    assert lru.put("huge", "x", 11) is None
+
+
+def test_describe_cache_serves_stale_and_revalidates():
+    calls: List[str | None] = []
+    describe: Dict[str, Any] = {"name": "Account", "fields": []}
+    changed = False
+
+    async def loader(if_modified_since: str | None) -> Dict[str, Any] | None:
+        calls.append(if_modified_since)
+        if if_modified_since and not changed:
+            return None
+        return dict(describe, changed=changed)
+
+    cache = DescribeCache(ttl=0.05, stale_ttl=10, max_bytes=1 << 20)
+
+    async def run() -> None:
+        nonlocal changed
+        assert (await cache.get_or_load("org", "Account", loader))["changed"] is False
+        await cache.get_or_load("org", "account", loader)
+        assert len(calls) == 1
+
+        # Past the TTL: served stale, revalidated in the background with a 304
+        await asyncio.sleep(0.06)
+        await cache.get_or_load("org", "Account", loader)
+        await asyncio.sleep(0)
+        assert calls[-1] is not None and cache.not_modified == 1
+
+        changed = True
+        await asyncio.sleep(0.06)
+        await cache.get_or_load("org", "Account", loader)
+        await asyncio.sleep(0)
+        assert (await cache.get_or_load("org", "Account", loader))["changed"] is True
+
+    asyncio.run(run())
+    assert cache.hits >= 1 and cache.stale_hits == 2
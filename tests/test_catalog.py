@@ -0,0 +1,99 @@
+from __future__ import annotations
+import asyncio
+from pathlib import Path
+from typing import Callable
+import pytest
+from sfmcp.catalog import SchemaCatalog
+from sfmcp.config.settings import settings
+from sfmcp.salesforce_client import SalesforceClient
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+def test_catalog_serves_cold_start_from_disk(
+    tmp_path: Path, org: FakeSalesforceOrg, make_client: Callable[..., SalesforceClient]
+):
+    org.add_sobject(
+        "Account",
+        fields=[
+            {"name": "Id", "type": "id"},
+            {"name": "OwnerId", "type": "reference", "referenceTo": ["User"],
+             "relationshipName": "Owner"},
+            {"name": "Type", "type": "picklist",
+             "picklistValues": [{"value": "Customer", "active": True}]},
+        ],
+    )
+    path = tmp_path / "catalog.sqlite3"
+
+    async def first_process() -> None:
+        sf = make_client(catalog=SchemaCatalog(path))
+        assert await sf.list_objects() == ["Account"]
+        await sf.describe_object("Account")
+        await sf.aclose()
+
+    asyncio.run(first_process())
+    requests_before = len(org.requests)
+
+    catalog = SchemaCatalog(path)
+
+    async def second_process() -> None:
+        sf = make_client(catalog=catalog)
+        assert await sf.list_objects() == ["Account"]
+        describe = await sf.describe_object("Account")
+        assert [f["name"] for f in describe["fields"]] == ["Id", "OwnerId", "Type"]
+        # Served from disk immediately; the conditional revalidation runs behind it
+        assert len(org.requests) == requests_before
+        await asyncio.sleep(0.01)
+        assert sf.describe_cache.not_modified == 1
+        await sf.aclose()
+
+    asyncio.run(second_process())
+    assert catalog.describe_names("fake") == ["Account"]
+
+
+def test_flow_catalog_syncs_incrementally(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    org: FakeSalesforceOrg,
+    make_client: Callable[..., SalesforceClient],
+):
+    monkeypatch.setattr(settings, "flow_sync_interval", 0)
+    org.add_tooling_records("FlowDefinition", [
+        {"Id": "300A", "DeveloperName": "Alpha", "ActiveVersionId": "301A1",
+         "LatestVersionId": "301A2", "LastModifiedDate": "2024-01-02T00:00:00.000+0000"},
+        {"Id": "300B", "DeveloperName": "Beta", "ActiveVersionId": "301B1",
+         "LatestVersionId": "301B1", "LastModifiedDate": "2024-01-01T00:00:00.000+0000"},
+    ])
+    org.add_tooling_records("Flow", [
+        {"Id": f"301{d}{n}", "DefinitionId": f"300{d}", "MasterLabel": d, "Status": "Active",
+         "VersionNumber": n, "LastModifiedDate": f"2024-01-0{n}T00:00:00.000+0000"}
+        for d, n in [("A", 1), ("A", 2), ("B", 1)]
+    ])
+    sf = make_client(catalog=SchemaCatalog(tmp_path / "catalog.sqlite3"))
+
+    async def run() -> None:
+        flows = await sf.list_flows()
+        assert [(f["developerName"], f["versionNumber"], f["isActive"]) for f in flows] == [
+            ("Alpha", 2, False), ("Beta", 1, True)
+        ]
+        # Only the two latest versions were fetched, not the whole version history
+        assert len(org.requests) == 2
+
+        # Alpha gets a third, active version and Beta is deleted
+        org.tooling_records["Flow"].append(
+            {"attributes": {"type": "Flow"}, "Id": "301A3", "DefinitionId": "300A",
+             "MasterLabel": "Alpha v3", "Status": "Active", "VersionNumber": 3,
+             "LastModifiedDate": "2024-02-01T00:00:00.000+0000"}
+        )
+        org.tooling_records["FlowDefinition"] = [
+            {**org.tooling_records["FlowDefinition"][0], "ActiveVersionId": "301A3",
+             "LatestVersionId": "301A3", "LastModifiedDate": "2024-02-01T00:00:00.000+0000"}
+        ]
+        flows = await sf.list_flows()
+        assert [(f["masterLabel"], f["versionNumber"], f["isActive"]) for f in flows] == [
+            ("Alpha v3", 3, True)
+        ]
+        # Three concurrent delta queries; the new version came with the delta
+        assert len(org.requests) == 5
+        await sf.aclose()
+
+    asyncio.run(run())
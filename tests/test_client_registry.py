@@ -0,0 +1,24 @@
+from __future__ import annotations
+import asyncio
+from sfmcp.client_registry import ClientRegistry
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+def test_registry_shares_client_and_warms_up(org: FakeSalesforceOrg, clients: ClientRegistry):
+    org.add_sobject("Account")
+    org.add_sobject("Contact")
+
+    async def run() -> None:
+        async with clients.session(warm_up=True, hot_objects=["Account", "Contact"]):
+            assert clients.get() is clients.get()
+            batcher = clients.get().describe_batcher
+            # A second concurrent session must not re-run warm-up
+            async with clients.session(warm_up=True, hot_objects=["Account"]):
+                pass
+            await asyncio.sleep(0.05)
+            assert batcher is not None and batcher.stats()["requests"] == 2
+
+    asyncio.run(run())
+    # Both warm-up describes go out in a single Composite request
+    describes = [path for _, path in org.requests if path.endswith(("/describe", "/composite"))]
+    assert len(describes) == 1
@@ -0,0 +1,122 @@
+from __future__ import annotations
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+import pytest
+from sfmcp.batching import DescribeBatcher
+from sfmcp.client_registry import ClientRegistry
+from sfmcp.deadlines import DeadlineExceeded, ToolDeadlines, remaining
+from sfmcp.transport import CliTransport, RestTransport
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+@pytest.mark.parametrize("org", [{"latency": 5.0}], indirect=True)
+def test_slow_calls_are_cancelled_at_the_tool_deadline(
+    org: FakeSalesforceOrg, rest_transport: Callable[[], RestTransport]
+):
+    transport = rest_transport()
+    clients = ClientRegistry()
+    clients.deadlines = ToolDeadlines(default=0.05, timeouts={"list_objects": 0})
+
+    @clients.tool("query")
+    async def query() -> None:
+        assert (remaining() or 0) <= 0.05
+        await transport.query("SELECT Id FROM Account")
+
+    @clients.tool("list_objects")
+    async def list_objects() -> float | None:
+        return remaining()
+
+    async def run() -> None:
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded, match="query did not finish within 0.05s"):
+            await query()
+        assert time.monotonic() - started < 1
+        assert await list_objects() is None
+        await transport.aclose()
+
+    asyncio.run(run())
+    # The request was abandoned rather than left running
+    assert org.in_flight == 0
+    stats = clients.stats()["deadlines"]
+    assert stats["timeouts"] == 1
+    assert stats["by_tool"]["list_objects"] == {"calls": 1, "timeouts": 0, "cancelled": 0}
+
+
+def test_cancelled_cli_calls_kill_the_sf_process(tmp_path: Path):
+    transport = CliTransport(org_alias="fake")
+    deadlines = ToolDeadlines(default=0.2)
+    pid_file = tmp_path / "pid"
+    # Stands in for a hung `sf` command
+    command = [
+        sys.executable,
+        "-c",
+        f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); "
+        "time.sleep(30)",
+    ]
+
+    async def run() -> None:
+        async with deadlines.limit("describe_flow"):
+            await transport._run_cli_command(command)
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+    assert transport.killed == 1
+    pid = int(pid_file.read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_deadlines_kill_the_sf_process_of_a_batched_describe(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    pid_file = tmp_path / "pid"
+    # A hung `sf` on PATH
+    sf = tmp_path / "sf"
+    sf.write_text(
+        f"#!{sys.executable}\n"
+        f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); "
+        "time.sleep(30)\n"
+    )
+    sf.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    transport = CliTransport(org_alias="fake")
+    batcher = DescribeBatcher(transport)
+    deadlines = ToolDeadlines(default=0.5)
+
+    async def run() -> None:
+        with pytest.raises(DeadlineExceeded):
+            async with deadlines.limit("describe"):
+                await batcher.describe("Account")
+        # The batch lost its only caller: its dispatch is cancelled and unwinds
+        for _ in range(100):
+            if transport.killed:
+                break
+            await asyncio.sleep(0.01)
+        assert transport.killed == 1
+
+    asyncio.run(run())
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+
+
+
+def test_tools_without_a_limit_report_the_deadline_they_inherit():
+    deadlines = ToolDeadlines(default=0.05, timeouts={"describe": 0})
+
+    async def describe() -> None:
+        async with deadlines.limit("describe"):
+            await asyncio.sleep(1)
+
+    async def run() -> None:
+        # The task inherits run_report's deadline and outlives its block
+        async with deadlines.limit("run_report"):
+            task = asyncio.create_task(describe())
+        await task
+
+    with pytest.raises(DeadlineExceeded, match=r"describe did not finish within 0\.0\d*s"):
+        asyncio.run(run())
+    assert deadlines.stats()["by_tool"]["describe"]["timeouts"] == 1
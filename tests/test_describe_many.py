@@ -0,0 +1,38 @@
+from __future__ import annotations
+import asyncio
+from mcp.server.fastmcp import FastMCP
+from sfmcp.client_registry import ClientRegistry
+from sfmcp.tools import describe_many
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+def test_describe_many_projects_fields_and_reports_errors(
+    org: FakeSalesforceOrg, clients: ClientRegistry
+):
+    fields = [
+        {"name": "Id", "type": "id", "label": "Record ID", "nillable": False},
+        {"name": "Name", "type": "string", "label": "Name", "nillable": False},
+    ]
+    org.add_sobject("Account", fields=fields)
+    org.add_sobject("Contact", fields=fields)
+    mcp = FastMCP("test")
+    describe_many.register(mcp, clients)
+
+    async def run() -> dict:
+        args = {
+            "object_api_names": ["Account", "contact", "ACCOUNT", "Missing__c"],
+            "fields": ["name"],
+            "attributes": ["type"],
+        }
+        _, result = await mcp.call_tool("salesforce_describe_many", {"args": args})
+        await clients.aclose()
+        return result  # type: ignore[return-value]
+
+    result = asyncio.run(run())
+    assert result["objects"] == [
+        {"object_api_name": "Account", "fields": [{"name": "Name", "type": "string"}]},
+        {"object_api_name": "Contact", "fields": [{"name": "Name", "type": "string"}]},
+    ]
+    assert list(result["errors"]) == ["Missing__c"]
+    # All three describes went out together
+    assert len(org.requests) == 1
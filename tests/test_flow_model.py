@@ -0,0 +1,167 @@
+from __future__ import annotations
+from sfmcp.automation import flow_dependencies
+from sfmcp.flow_model import parse_flow
+
+FLOW_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Flow xmlns="http://soap.sforce.com/2006/04/metadata">
+    <apiVersion>60.0</apiVersion>
+    <decisions>
+        <name>Is_Closed</name>
+        <label>Is Closed</label>
+        <defaultConnector><targetReference>Find_Contact</targetReference></defaultConnector>
+        <rules>
+            <name>Closed</name>
+            <conditions>
+                <leftValueReference>$Record.Status</leftValueReference>
+                <operator>EqualTo</operator>
+            </conditions>
+            <connector><targetReference>Close_Tasks</targetReference></connector>
+            <label>Closed</label>
+        </rules>
+    </decisions>
+    <label>Case Closed</label>
+    <processType>AutoLaunchedFlow</processType>
+    <recordLookups>
+        <name>Find_Contact</name>
+        <filters><field>Id</field><value><elementReference>$Record.ContactId</elementReference></value></filters>
+        <object>Contact</object>
+        <queriedFields>Email</queriedFields>
+    </recordLookups>
+    <recordUpdates>
+        <name>Close_Tasks</name>
+        <faultConnector><targetReference>Find_Contact</targetReference></faultConnector>
+        <inputAssignments><field>Status</field></inputAssignments>
+        <object>Task</object>
+    </recordUpdates>
+    <start>
+        <connector><targetReference>Is_Closed</targetReference></connector>
+        <object>Case</object>
+        <recordTriggerType>Update</recordTriggerType>
+        <triggerType>RecordAfterSave</triggerType>
+    </start>
+    <status>Active</status>
+    <variables><name>count</name></variables>
+</Flow>
+"""
+
+
+def test_parse_flow_builds_graph_and_touched_objects():
+    flow = parse_flow(FLOW_XML)
+    assert flow["label"] == "Case Closed" and flow["status"] == "Active"
+    assert flow["start"] == {
+        "object": "Case",
+        "triggerType": "RecordAfterSave",
+        "recordTriggerType": "Update",
+        "connectors": [{"kind": "connector", "target": "Is_Closed"}],
+        "fields": ["ContactId", "Status"],
+    }
+    assert flow["counts"] == {
+        "decisions": 1, "recordLookups": 1, "recordUpdates": 1, "variables": 1
+    }
+    assert flow["objects"] == {
+        "Case": {"operations": ["trigger"], "fields": ["ContactId", "Status"]},
+        "Contact": {"operations": ["read"], "fields": ["Email", "Id"]},
+        "Task": {"operations": ["update"], "fields": ["Status"]},
+    }
+    decision = flow["elements"][0]
+    assert decision["connectors"] == [
+        {"kind": "defaultConnector", "target": "Find_Contact"},
+        {"kind": "Closed:connector", "target": "Close_Tasks"},
+    ]
+    assert decision["outcomes"] == [{"name": "Closed", "label": "Closed", "conditions": 1}]
+
+
+def test_parse_flow_summary_and_element_filter():
+    assert "elements" not in parse_flow(FLOW_XML, include_elements=False)
+    flow = parse_flow(FLOW_XML.encode(), element_types=["recordUpdates"])
+    assert [e["name"] for e in flow["elements"]] == ["Close_Tasks"]
+    assert flow["counts"]["decisions"] == 1
+
+
+def test_record_variables_resolve_to_their_objects():
+    flow_xml = """<?xml version="1.0" encoding="UTF-8"?>
+<Flow xmlns="http://soap.sforce.com/2006/04/metadata">
+    <assignments>
+        <name>Set_Status</name>
+        <assignmentItems>
+            <assignToReference>$Record.Status__c</assignToReference>
+            <operator>Assign</operator>
+        </assignmentItems>
+        <assignmentItems>
+            <assignToReference>account.Rating</assignToReference>
+            <operator>Assign</operator>
+        </assignmentItems>
+    </assignments>
+    <recordCreates>
+        <name>Create_Account</name>
+        <inputReference>account</inputReference>
+    </recordCreates>
+    <recordLookups>
+        <name>Get_Contact</name>
+        <object>Contact</object>
+        <storeOutputAutomatically>true</storeOutputAutomatically>
+    </recordLookups>
+    <recordUpdates>
+        <name>Update_Case</name>
+        <inputReference>$Record</inputReference>
+    </recordUpdates>
+    <recordUpdates>
+        <name>Update_Contact</name>
+        <inputReference>Get_Contact</inputReference>
+    </recordUpdates>
+    <recordDeletes>
+        <name>Delete_Unknown</name>
+        <inputReference>loopItem</inputReference>
+    </recordDeletes>
+    <start>
+        <object>Case</object>
+        <triggerType>RecordAfterSave</triggerType>
+    </start>
+    <variables>
+        <name>account</name>
+        <dataType>SObject</dataType>
+        <isCollection>false</isCollection>
+        <objectType>Account</objectType>
+    </variables>
+</Flow>
+"""
+    model, dependencies = flow_dependencies(flow_xml)
+    assert dependencies == [
+        ("Account", None, "create"),
+        ("Account", "Rating", "create"),
+        ("Case", None, "trigger"),
+        ("Case", None, "update"),
+        ("Case", "Status__c", "trigger"),
+        ("Case", "Status__c", "update"),
+        ("Contact", None, "read"),
+        ("Contact", None, "update"),
+    ]
+    assert model["objects"]["Case"] == {
+        "operations": ["trigger", "update"], "fields": ["Status__c"]
+    }
+    [unresolved] = [e for e in model["elements"] if e["name"] == "Delete_Unknown"]
+    assert "object" not in unresolved
+
+
+def test_trigger_dependencies_leave_out_writes_to_the_trigger_object():
+    flow_xml = """<?xml version="1.0" encoding="UTF-8"?>
+<Flow xmlns="http://soap.sforce.com/2006/04/metadata">
+    <recordUpdates>
+        <name>Close_Children</name>
+        <filters><field>ParentId</field></filters>
+        <inputAssignments><field>Status</field></inputAssignments>
+        <object>Case</object>
+    </recordUpdates>
+    <start>
+        <filters><field>Priority</field></filters>
+        <object>Case</object>
+        <triggerType>RecordAfterSave</triggerType>
+    </start>
+</Flow>
+"""
+    model, dependencies = flow_dependencies(flow_xml)
+    assert model["start"]["fields"] == ["Priority"]
+    assert [d for d in dependencies if d[2] == "trigger"] == [
+        ("Case", None, "trigger"), ("Case", "Priority", "trigger")
+    ]
+    assert ("Case", "Status", "update") in dependencies
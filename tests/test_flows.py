@@ -0,0 +1,164 @@
+from __future__ import annotations
+import asyncio
+from pathlib import Path
+from typing import Callable
+import pytest
+from sfmcp.catalog import SchemaCatalog
+from sfmcp.config.settings import settings
+from sfmcp.salesforce_client import SalesforceClient
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+FLOW_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Flow xmlns="http://soap.sforce.com/2006/04/metadata">
+    <label>{label}</label>
+    <processType>AutoLaunchedFlow</processType>
+</Flow>
+"""
+
+pytestmark = pytest.mark.parametrize("org", [{"retrieve_polls": 2}], indirect=True)
+
+
+@pytest.fixture
+def flow_org(org: FakeSalesforceOrg) -> FakeSalesforceOrg:
+    """The fake org with one active flow, Alpha"""
+    org.add_tooling_records("FlowDefinition", [
+        {"Id": "300A", "DeveloperName": "Alpha", "ActiveVersionId": "301A1",
+         "LatestVersionId": "301A1", "LastModifiedDate": "2024-01-01T00:00:00.000+0000"},
+    ])
+    org.add_tooling_records("Flow", [
+        {"Id": "301A1", "DefinitionId": "300A", "MasterLabel": "Alpha", "Status": "Active",
+         "VersionNumber": 1, "LastModifiedDate": "2024-01-01T00:00:00.000+0000"},
+    ])
+    org.add_flow_metadata("Alpha", FLOW_XML.format(label="Alpha"))
+    return org
+
+
+def _retrieves(org: FakeSalesforceOrg) -> int:
+    return len([path for _, path in org.requests if "/Soap/m/" in path])
+
+
+def test_describe_flow_is_cached_by_version(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    flow_org: FakeSalesforceOrg,
+    make_client: Callable[..., SalesforceClient],
+):
+    monkeypatch.setattr(settings, "retrieve_poll_interval", 0.01)
+    monkeypatch.setattr(settings, "flow_sync_interval", 0)
+    org = flow_org
+    catalog = SchemaCatalog(tmp_path / "catalog.sqlite3")
+
+    async def run() -> None:
+        sf = make_client(catalog=catalog)
+        flow = await sf.describe_flow("Alpha")
+        assert "<label>Alpha</label>" in flow["flowContent"]
+        assert flow["versionId"] == "301A1" and not flow["cached"]
+        # retrieve + two status checks
+        assert _retrieves(org) == 3
+        await sf.aclose()
+
+        # A new process reads the unchanged version from the catalog
+        sf = make_client(catalog=catalog)
+        assert (await sf.describe_flow("Alpha"))["cached"]
+        assert _retrieves(org) == 3
+
+        # A new version is retrieved again
+        org.tooling_records["Flow"].append(
+            {"Id": "301A2", "DefinitionId": "300A", "MasterLabel": "Alpha", "Status": "Draft",
+             "VersionNumber": 2, "LastModifiedDate": "2024-02-01T00:00:00.000+0000"}
+        )
+        org.tooling_records["FlowDefinition"][0]["LatestVersionId"] = "301A2"
+        org.add_flow_metadata("Alpha", FLOW_XML.format(label="Alpha v2"))
+        flow = await sf.describe_flow("Alpha")
+        assert "Alpha v2" in flow["flowContent"] and flow["versionId"] == "301A2"
+        assert _retrieves(org) == 6
+        await sf.aclose()
+
+    asyncio.run(run())
+
+
+def test_describe_flow_reports_missing_flow(
+    monkeypatch: pytest.MonkeyPatch,
+    flow_org: FakeSalesforceOrg,
+    make_client: Callable[..., SalesforceClient],
+):
+    monkeypatch.setattr(settings, "retrieve_poll_interval", 0.01)
+    sf = make_client()
+
+    async def run() -> None:
+        with pytest.raises(Exception, match="Flow file not found"):
+            await sf.describe_flow("Nope")
+        await sf.aclose()
+
+    asyncio.run(run())
+
+
+def test_describe_flows_uses_one_retrieve(
+    monkeypatch: pytest.MonkeyPatch,
+    flow_org: FakeSalesforceOrg,
+    make_client: Callable[..., SalesforceClient],
+):
+    monkeypatch.setattr(settings, "retrieve_poll_interval", 0.01)
+    org = flow_org
+    for name in ["Beta", "Gamma"]:
+        org.add_flow_metadata(name, FLOW_XML.format(label=name))
+    sf = make_client()
+
+    async def run() -> list:
+        flows = [
+            flow async for flow in sf.iter_describe_flows(["Alpha", "Beta", "Gamma", "Nope"])
+        ]
+        # The second time Alpha's version is known and cached
+        again = [flow async for flow in sf.iter_describe_flows(["Alpha"])]
+        assert again[0]["cached"]
+        await sf.aclose()
+        return flows
+
+    flows = asyncio.run(run())
+    assert [f["flowDeveloperName"] for f in flows] == ["Alpha", "Beta", "Gamma", "Nope"]
+    assert "<label>Gamma</label>" in flows[2]["flowContent"] and "error" in flows[3]
+    # One version lookup, then one retrieve (submit + two status checks), then one lookup
+    assert _retrieves(org) == 3 and len(org.requests) == 5
+
+
+def test_automation_index_is_refreshed_by_version(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    flow_org: FakeSalesforceOrg,
+    make_client: Callable[..., SalesforceClient],
+):
+    monkeypatch.setattr(settings, "retrieve_poll_interval", 0.01)
+    monkeypatch.setattr(settings, "flow_sync_interval", 0)
+    org = flow_org
+    org.add_flow_metadata("Alpha", FLOW_XML.replace("</Flow>", """
+    <recordUpdates><name>Close</name><object>Case</object>
+        <inputAssignments><field>Status</field></inputAssignments></recordUpdates>
+</Flow>""").format(label="Alpha"))
+    catalog = SchemaCatalog(tmp_path / "catalog.sqlite3")
+
+    async def run() -> None:
+        sf = make_client(catalog=catalog)
+        index = await sf.automation_index()
+        [match] = index.find("case", "status")
+        assert match.flow.developer_name == "Alpha" and match.operations == {"update"}
+        assert match.flow.is_active and index.find("Case", "Subject") == []
+        assert _retrieves(org) == 3
+        await sf.aclose()
+
+        # A new process starts from the stored index
+        sf = make_client(catalog=catalog)
+        assert len(await sf.automation_index()) == 1 and _retrieves(org) == 3
+
+        # Only a changed flow is retrieved and re-indexed
+        org.tooling_records["Flow"].append(
+            {"Id": "301A2", "DefinitionId": "300A", "MasterLabel": "Alpha", "Status": "Draft",
+             "VersionNumber": 2, "LastModifiedDate": "2024-02-01T00:00:00.000+0000"}
+        )
+        org.tooling_records["FlowDefinition"][0]["LatestVersionId"] = "301A2"
+        org.add_flow_metadata("Alpha", FLOW_XML.format(label="Alpha v2"))
+        index = await sf.automation_index()
+        assert index.find("Case") == [] and _retrieves(org) == 6
+        assert index.get("Alpha").version_id == "301A2"
+        await sf.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,83 @@
+from __future__ import annotations
+import asyncio
+from typing import Callable
+import pytest
+from sfmcp.batching import DescribeBatcher
+from sfmcp.hedging import ReadPolicy
+from sfmcp.salesforce_client import SalesforceClient
+from sfmcp.transport import RestTransport
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+def test_slow_reads_are_hedged_and_the_first_answer_wins():
+    policy = ReadPolicy(hedge=True, min_samples=5, retries=0)
+    delays = [0.01] * 5 + [5.0, 0.01]
+    cancelled = []
+
+    async def read() -> str:
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return f"slept {delay}"
+
+    async def run() -> None:
+        for _ in range(5):
+            await policy.run("query", read)
+        assert await policy.run("query", read) == "slept 0.01"
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert cancelled == [5.0]
+    stats = policy.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+    assert stats["by_operation"]["query"]["hedge_delay"] is not None
+
+
+@pytest.mark.parametrize("org", [{"latency": 0.01}], indirect=True)
+def test_the_losing_batched_describe_is_dropped(
+    org: FakeSalesforceOrg, rest_transport: Callable[[], RestTransport]
+):
+    org.add_sobject("Account")
+    transport = rest_transport()
+    batcher = DescribeBatcher(transport)
+    policy = ReadPolicy(hedge=True, min_samples=5, retries=0)
+
+    async def run() -> None:
+        for _ in range(5):
+            await policy.run("describe", lambda: batcher.describe("Account"))
+        org.latency = 0.3
+        result = await policy.run("describe", lambda: batcher.describe("Account"))
+        assert result is not None and result["name"] == "Account"
+        await asyncio.sleep(0.01)
+        # The hedge's request was dropped rather than left running
+        assert org.in_flight == 0
+        await transport.aclose()
+
+    asyncio.run(run())
+    assert policy.stats()["hedged"] == 1
+
+
+
+def test_transient_errors_are_retried_and_soql_errors_are_not(
+    org: FakeSalesforceOrg, make_client: Callable[..., SalesforceClient]
+):
+    org.add_sobject("Account", records=[{"Id": "001"}])
+    sf = make_client()
+    sf.reads.retry_backoff = 0.001
+
+    async def run() -> None:
+        org.server_errors = 1
+        assert await sf.run_soql("SELECT Id FROM Account") == [
+            {"attributes": {"type": "Account"}, "Id": "001"}
+        ]
+        with pytest.raises(Exception, match="MALFORMED_QUERY"):
+            await sf.run_soql("SELECT Id FROM")
+        await sf.aclose()
+
+    asyncio.run(run())
+    stats = sf.reads.stats()
+    assert stats["calls"] == 2
+    assert stats["retries"] == 1
@@ -0,0 +1,82 @@
+from __future__ import annotations
+import asyncio
+from mcp.server.fastmcp import FastMCP
+from sfmcp.client_registry import ClientRegistry
+from sfmcp.tools import list_dashboards, list_reports
+from sfmcp.tools.list_dashboards import DashboardInfo
+from sfmcp.tools.list_reports import ReportInfo
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+def test_list_reports_pushes_filters_into_soql_and_pages(
+    org: FakeSalesforceOrg, clients: ClientRegistry
+):
+    org.add_sobject("Report", records=[
+        {"Id": f"00O{i:03d}", "Name": f"{kind} report {i}", "FolderName": folder,
+         "OwnerId": "005A", "Format": "Tabular"}
+        for i, (kind, folder) in enumerate(
+            [("Pipeline", "Sales")] * 3 + [("Pipeline", "Service")] + [("Case", "Sales")]
+        )
+    ])
+    mcp = FastMCP("test")
+    list_reports.register(mcp, clients)
+
+    async def run() -> list:
+        args = {"folder": "Sales", "search": "pipeline", "fields": ["name"], "limit": 2}
+        _, first = await mcp.call_tool("salesforce_list_reports", {"args": args})
+        cursor = first["next_cursor"]  # type: ignore[index]
+        _, second = await mcp.call_tool(
+            "salesforce_list_reports", {"args": {"cursor": cursor}}
+        )
+        _, everything = await mcp.call_tool("salesforce_list_reports", {})
+        _, columnar = await mcp.call_tool(
+            "salesforce_list_reports",
+            {"args": {"search": "case", "fields": ["name"], "format": "columnar"}},
+        )
+        await clients.aclose()
+        return [first, second, everything, columnar]
+
+    first, second, everything, columnar = asyncio.run(run())
+    assert columnar["reports"] == [] and columnar["columnar"] == {
+        "columns": ["id", "name"], "values": [["00O004"], ["Case report 4"]], "row_count": 1
+    }
+    assert [r["name"] for r in first["reports"]] == ["Pipeline report 0", "Pipeline report 1"]
+    assert first["total_count"] == 3 and first["reports"][0]["folderName"] is None
+    assert [r["id"] for r in second["reports"]] == ["00O002"] and second["next_cursor"] is None
+    assert everything["total_count"] == 5 and everything["reports"][4]["folderName"] == "Sales"
+    assert org.queries[0] == (
+        "SELECT Id, Name FROM Report WHERE FolderName = 'Sales' AND Name LIKE '%pipeline%' "
+        "ORDER BY FolderName, Name, Id"
+    )
+
+
+def test_unfiled_reports_and_dashboards_keep_their_default_folder(
+    org: FakeSalesforceOrg, clients: ClientRegistry
+):
+    org.add_sobject("Report", records=[{"Id": "00O001", "Name": "Loose", "FolderName": None}])
+    org.add_sobject("Dashboard", records=[{"Id": "01Z001", "Title": "Loose"}])
+    mcp = FastMCP("test")
+    list_reports.register(mcp, clients)
+    list_dashboards.register(mcp, clients)
+
+    async def run() -> list:
+        _, reports = await mcp.call_tool("salesforce_list_reports", {})
+        _, columnar = await mcp.call_tool(
+            "salesforce_list_reports",
+            {"args": {"fields": ["folderName"], "format": "columnar"}},
+        )
+        _, dashboards = await mcp.call_tool("salesforce_list_dashboards", {})
+        await clients.aclose()
+        return [reports, columnar, dashboards]
+
+    reports, columnar, dashboards = asyncio.run(run())
+    assert reports["reports"][0]["folderName"] == "Unfiled Public Reports"
+    assert columnar["columnar"]["values"] == [["00O001"], ["Unfiled Public Reports"]]
+    assert dashboards["dashboards"][0]["folderName"] == "Unfiled Public Dashboards"
+
+
+def test_report_and_dashboard_info_build_from_field_names_or_records():
+    assert ReportInfo(id="00O001", folderName="Sales") == ReportInfo.model_validate(
+        {"Id": "00O001", "FolderName": "Sales"}
+    )
+    assert DashboardInfo(id="01Z001", title="Pipeline").title == "Pipeline"
@@ -0,0 +1,55 @@
+from __future__ import annotations
+import asyncio
+from pathlib import Path
+from typing import Any, Dict
+from mcp.server.fastmcp import FastMCP
+from sfmcp.client_registry import ClientRegistry
+from sfmcp.metrics import REGISTRY, Histogram
+from sfmcp.profiling import ToolProfiler
+from sfmcp.tools import query, server_stats
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = Histogram("latency", "test", ("tool",), buckets=(1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value, tool="query")
+    [series] = histogram.snapshot()
+    assert series["count"] == 4 and series["sum"] == 6.5
+    assert series["p50"] == 1.5  # halfway through the (1, 2] bucket
+    assert 'latency_bucket{tool="query",le="2"} 3' in list(histogram.render())
+
+
+def test_tool_calls_and_salesforce_requests_are_measured(
+    org: FakeSalesforceOrg, clients: ClientRegistry, tmp_path: Path
+):
+    org.add_sobject("Account", records=[{"Id": "001"}, {"Id": "002"}])
+    clients.profiler = ToolProfiler(tools=["query"], directory=str(tmp_path))
+    mcp = FastMCP("test")
+    query.register(mcp, clients)
+    server_stats.register(mcp, clients)
+
+    async def run() -> Dict[str, Any]:
+        await mcp.call_tool("salesforce_query", {"args": {"soql": "SELECT Id FROM Account"}})
+        _, stats = await mcp.call_tool("salesforce_server_stats", {})
+        return stats  # type: ignore[return-value]
+
+    stats = asyncio.run(run())
+    metrics = stats["metrics"]
+    assert any(
+        series["tool"] == "query" and series["outcome"] == "ok" and series["count"] >= 1
+        for series in metrics["sfmcp_tool_duration_seconds"]
+    )
+    assert any(
+        series["transport"] == "rest" and series["operation"] == "query"
+        for series in metrics["sfmcp_salesforce_request_duration_seconds"]
+    )
+    assert any(series["source"] == "stream" for series in metrics["sfmcp_json_decode_seconds"])
+    client_stats = stats["clients"][next(iter(stats["clients"]))]
+    assert client_stats["reads"]["calls"] == 1
+    assert client_stats["singleflight"]["by_operation"]["query"]["calls"] == 1
+    assert stats["profiles"] == {"saved": 1}
+
+    text = REGISTRY.render(clients.stats())
+    assert 'sfmcp_tool_duration_seconds_count{tool="query",outcome="ok"}' in text
+    assert 'sfmcp_describe_cache_hits{org="' in text
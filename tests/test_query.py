@@ -1,8 +1,100 @@
 from __future__ import annotations
+import asyncio
+from typing import Callable
 import pytest
 from pydantic import ValidationError
+from sfmcp.cache import QueryCache
+from sfmcp.columnar import to_columnar
+from sfmcp.salesforce_client import SalesforceClient
+from sfmcp.soql import apply_limit, from_object, normalize
 from sfmcp.tools.query import QueryArgs
+from sfmcp.transport.fake import FakeSalesforceOrg
 
 def test_query_args_validation():
     with pytest.raises(ValidationError):
         QueryArgs.model_validate({"soql": 123})  # must be str
+    with pytest.raises(ValidationError):
+        QueryArgs.model_validate({"max_records": 10})  # needs soql or cursor
+
+
+def test_apply_limit_pushes_limit_into_soql():
+    assert apply_limit("SELECT Id FROM Account", 100) == "SELECT Id FROM Account LIMIT 100"
+    assert apply_limit("SELECT Id FROM Account LIMIT 5", 100) == "SELECT Id FROM Account LIMIT 5"
+    assert apply_limit("select Id from Account limit 500;", 10) == "select Id from Account LIMIT 10"
+    assert (
+        apply_limit("SELECT Id FROM Account ORDER BY Name OFFSET 10", 50)
+        == "SELECT Id FROM Account ORDER BY Name LIMIT 50 OFFSET 10"
+    )
+    # LIMIT inside a subquery or a string literal is not the statement's LIMIT
+    assert apply_limit(
+        "SELECT Id, (SELECT Id FROM Contacts LIMIT 1) FROM Account WHERE Name = 'limit 3'", 10
+    ).endswith("WHERE Name = 'limit 3' LIMIT 10")
+
+
+def test_query_page_resumes_from_cursor(
+    org: FakeSalesforceOrg, make_client: Callable[..., SalesforceClient]
+):
+    org.add_sobject("Account", records=[{"Id": f"{i:03d}"} for i in range(450)])
+    sf = make_client()
+
+    async def run() -> None:
+        seen = []
+        page = await sf.query_page("SELECT Id FROM Account", page_size=150)
+        seen.extend(page["records"])
+        while page["cursor"]:
+            page = await sf.query_page(cursor=page["cursor"])
+            seen.extend(page["records"])
+        assert [r["Id"] for r in seen] == [f"{i:03d}" for i in range(450)]
+        assert page["totalSize"] == 450 and page["done"]
+        await sf.aclose()
+
+    asyncio.run(run())
+    # batchSize is clamped to Salesforce's minimum of 200: one query plus two queryMore calls
+    assert len(org.requests) == 3
+
+
+def test_normalize_and_from_object():
+    assert normalize("SELECT  Id\nFROM Account WHERE Name = 'Acme  Inc';") == (
+        "select id from account where name = 'Acme  Inc'"
+    )
+    assert from_object("SELECT Id, (SELECT Id FROM Contacts) FROM Account LIMIT 1") == "Account"
+
+
+def test_query_cache_serves_until_the_object_changes(
+    org: FakeSalesforceOrg, make_client: Callable[..., SalesforceClient]
+):
+    org.add_sobject(
+        "Account", records=[{"Id": "001A", "SystemModstamp": "2024-01-01T00:00:00.000+0000"}]
+    )
+    sf = make_client(
+        query_cache=QueryCache(default_ttl=300, max_bytes=1 << 20, probe_interval=0)
+    )
+
+    async def run() -> None:
+        assert len(await sf.run_soql("SELECT Id FROM Account")) == 1
+        assert len(await sf.run_soql("select id  from ACCOUNT")) == 1
+        org.records["Account"].append(
+            {"Id": "001B", "SystemModstamp": "2024-02-01T00:00:00.000+0000"}
+        )
+        assert len(await sf.run_soql("SELECT Id FROM Account")) == 2
+        await sf.aclose()
+
+    asyncio.run(run())
+    stats = sf.query_cache.stats() if sf.query_cache else {}
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["invalidations"] == 1
+    # Three probes, but only two full queries
+    assert len(org.requests) == 5
+
+
+def test_to_columnar_flattens_relationships_and_aligns_columns():
+    rows = [
+        {"attributes": {"type": "Contact"}, "Id": "003A",
+         "Account": {"attributes": {"type": "Account"}, "Name": "Acme"},
+         "Cases": {"totalSize": 1, "done": True,
+                   "records": [{"attributes": {"type": "Case"}, "Subject": "Help"}]}},
+        {"attributes": {"type": "Contact"}, "Id": "003B", "Account": None, "Cases": None},
+    ]
+    columnar = to_columnar(rows)
+    assert columnar.columns == ["Id", "Account.Name", "Cases"]
+    assert columnar.values == [["003A", "003B"], ["Acme", None], [[{"Subject": "Help"}], None]]
+    assert columnar.row_count == 2
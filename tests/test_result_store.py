@@ -0,0 +1,51 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+import pytest
+from sfmcp.result_store import ResultStore, ResultStoreError
+
+
+def _rows(n: int):
+    return [
+        {"attributes": {"type": "Contact"}, "Id": f"003{i:04d}", "Account": {"Name": f"A{i}"}}
+        for i in range(n)
+    ]
+
+
+def test_result_store_pages_projects_and_samples(tmp_path: Path):
+    store = ResultStore(max_bytes=1 << 20, directory=tmp_path)
+    stored = store.put(_rows(500))
+    assert stored.row_count == 500 and stored.columns == ["Id", "Account"]
+
+    page = store.read(stored.handle, offset=490, limit=20, columns=["Id", "Account.Name"])
+    assert page[0] == {"Id": "0030490", "Account.Name": "A490"} and len(page) == 10
+
+    sample = store.sample(stored.handle, 5, seed=1)
+    assert len(sample) == 5 and sample == sorted(sample, key=lambda r: r["Id"])
+
+
+def test_result_store_evicts_least_recently_used(tmp_path: Path):
+    store = ResultStore(max_bytes=60_000, directory=tmp_path)
+    first = store.put(_rows(300))
+    second = store.put(_rows(300))
+    store.get(first.handle)
+    store.put(_rows(300))
+    assert store.total_bytes <= store.max_bytes
+    with pytest.raises(ResultStoreError, match="Unknown or evicted result handle"):
+        store.get(second.handle)
+    assert not second.path.exists()
+    with pytest.raises(ResultStoreError, match="exceeds the result store budget"):
+        store.put(_rows(5000))
+
+
+def test_result_evicted_during_a_read_stays_readable_until_it_ends(tmp_path: Path):
+    store = ResultStore(max_bytes=60_000, directory=tmp_path)
+    first = store.put(_rows(300))
+    with store._reading(first.handle) as reading:
+        store.put(_rows(300))
+        store.put(_rows(300))  # evicts `first`
+        with pytest.raises(ResultStoreError, match="Unknown or evicted result handle"):
+            store.get(first.handle)
+        assert json.loads(reading.row_bytes(299))["Id"] == "0030299"
+        assert first.path.exists()
+    assert not first.path.exists()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import asyncio
+from typing import Callable
+import pytest
+from sfmcp.config.settings import settings
+from sfmcp.reports import summarize_report
+from sfmcp.salesforce_client import SalesforceClient
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+RESULT = {
+    "attributes": {"reportId": "00OR", "reportName": "Pipeline"},
+    "allData": True,
+    "hasDetailRows": True,
+    "reportMetadata": {
+        "reportFormat": "SUMMARY",
+        "aggregates": ["s!AMOUNT", "RowCount"],
+        "groupingsDown": [{"name": "STAGE_NAME"}],
+        "groupingsAcross": [],
+        "detailColumns": ["OPPORTUNITY_NAME"],
+    },
+    "reportExtendedMetadata": {
+        "aggregateColumnInfo": {"s!AMOUNT": {"label": "Sum of Amount"},
+                                "RowCount": {"label": "Record Count"}},
+        "groupingColumnInfo": {"STAGE_NAME": {"label": "Stage"}},
+        "detailColumnInfo": {"OPPORTUNITY_NAME": {"label": "Opportunity Name"}},
+    },
+    "groupingsDown": {"groupings": [
+        {"key": "0", "label": "Prospecting", "value": "Prospecting", "groupings": []},
+        {"key": "1", "label": "Closed Won", "value": "Closed Won", "groupings": []},
+    ]},
+    "groupingsAcross": {"groupings": []},
+    "factMap": {
+        "0!T": {"aggregates": [{"value": 100}, {"value": 1}],
+                "rows": [{"dataCells": [{"label": "Big deal"}]}]},
+        "1!T": {"aggregates": [{"value": 250}, {"value": 2}], "rows": []},
+        "T!T": {"aggregates": [{"value": 350}, {"value": 3}]},
+    },
+}
+
+
+def test_summarize_report_flattens_groupings():
+    summary = summarize_report(RESULT, include_details=True)
+    assert summary["groupingsDown"] == ["Stage"]
+    assert summary["total"] == {"Sum of Amount": 350, "Record Count": 3}
+    assert summary["rows"][1] == {
+        "groupings": ["Closed Won"], "aggregates": {"Sum of Amount": 250, "Record Count": 2}
+    }
+    assert summary["details"] == [{"Opportunity Name": "Big deal", "groupings": ["Prospecting"]}]
+
+
+@pytest.mark.parametrize("org", [{"report_polls": 2}], indirect=True)
+def test_run_report_polls_and_caches_by_filters_and_modification(
+    monkeypatch: pytest.MonkeyPatch,
+    org: FakeSalesforceOrg,
+    make_client: Callable[..., SalesforceClient],
+):
+    monkeypatch.setattr(settings, "report_poll_interval", 0.01)
+    org.add_report("00OR", RESULT)
+    sf = make_client()
+    stage = [{"column": "STAGE_NAME", "operator": "equals", "value": "Closed Won"}]
+
+    async def run() -> None:
+        first = await sf.run_report("00OR")
+        assert first["total"]["Sum of Amount"] == 350 and not first["cached"]
+        assert (await sf.run_report("00OR"))["cached"]
+        assert not (await sf.run_report("00OR", filters=stage))["cached"]
+        # Editing the report invalidates its results
+        org.records["Report"][0]["LastModifiedDate"] = "2024-02-01T00:00:00.000+0000"
+        assert not (await sf.run_report("00OR"))["cached"]
+        await sf.aclose()
+
+    asyncio.run(run())
+    assert org.report_runs == [
+        ("00OR", None), ("00OR", {"reportFilters": stage}), ("00OR", None)
+    ]
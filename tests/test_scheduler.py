@@ -0,0 +1,75 @@
+from __future__ import annotations
+import asyncio
+from typing import Callable
+import pytest
+from sfmcp.salesforce_client import SalesforceClient
+from sfmcp.scheduler import RequestScheduler, background
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+def test_interactive_requests_go_ahead_of_background_work():
+    scheduler = RequestScheduler(max_concurrency=1, background_concurrency=1)
+    order = []
+
+    async def request(name: str) -> None:
+        async with scheduler.slot():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run() -> None:
+        first = asyncio.create_task(request("first"))
+        await asyncio.sleep(0)
+        with background():
+            refresh = asyncio.create_task(request("refresh"))
+        await asyncio.sleep(0)
+        tool_call = asyncio.create_task(request("tool call"))
+        await asyncio.gather(first, refresh, tool_call)
+
+    asyncio.run(run())
+    assert order == ["first", "tool call", "refresh"]
+    assert scheduler.stats()["queued"] == 2
+
+
+@pytest.mark.parametrize("org", [{"latency": 0.01, "api_limit": 100}], indirect=True)
+def test_requests_are_capped_and_retried_after_limit_errors(
+    org: FakeSalesforceOrg, make_client: Callable[..., SalesforceClient]
+):
+    org.add_sobject("Account", records=[{"Id": "001"}])
+    sf = make_client()
+    sf.scheduler.max_concurrency = 2
+    sf.scheduler.backoff = 0.01
+
+    async def run() -> None:
+        await asyncio.gather(
+            *(sf.run_soql(f"SELECT Id FROM Account LIMIT {n}") for n in range(1, 7))
+        )
+        org.limit_errors = 1
+        result = await sf.run_soql("SELECT Id FROM Account")
+        assert result[0]["Id"] == "001"
+        await sf.aclose()
+
+    asyncio.run(run())
+    assert org.max_in_flight == 2
+    stats = sf.scheduler.stats()
+    assert stats["limit_errors"] == 1 and stats["retries"] == 1
+    assert stats["api_usage"] == [8, 100]
+
+
+@pytest.mark.parametrize("org", [{"api_limit": 10}], indirect=True)
+def test_background_requests_are_deferred_when_the_allowance_is_low(
+    org: FakeSalesforceOrg, make_client: Callable[..., SalesforceClient]
+):
+    org.add_sobject("Account")
+    org.api_usage = 9
+    sf = make_client()
+
+    async def run() -> None:
+        await sf.run_soql("SELECT Id FROM Account")
+        with background(), pytest.raises(Exception, match="background request deferred"):
+            await sf.run_soql("SELECT Id FROM Account")
+        # Interactive calls keep using the reserve
+        await sf.run_soql("SELECT Id FROM Account")
+        await sf.aclose()
+
+    asyncio.run(run())
+    assert sf.scheduler.stats()["deferred"] == 1
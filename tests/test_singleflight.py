@@ -0,0 +1,79 @@
+from __future__ import annotations
+import asyncio
+from typing import Callable
+import pytest
+from sfmcp.salesforce_client import SalesforceClient
+from sfmcp.singleflight import Singleflight
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+@pytest.mark.parametrize("org", [{"latency": 0.02}], indirect=True)
+def test_concurrent_identical_calls_share_one_request(
+    org: FakeSalesforceOrg, make_client: Callable[..., SalesforceClient]
+):
+    org.add_sobject("Account")
+    org.add_sobject("Contact")
+    sf = make_client()
+
+    async def run() -> None:
+        results = await asyncio.gather(
+            *(sf.describe_object(name) for name in ["Account", "account", "Contact", "Account"])
+        )
+        assert [r["name"] for r in results] == ["Account", "Account", "Contact", "Account"]
+        await sf.aclose()
+
+    asyncio.run(run())
+    # Two distinct describes reach the batcher and share one Composite request
+    assert len(org.requests) == 1
+    assert sf.describe_batcher is not None and sf.describe_batcher.requests == 2
+    stats = sf.inflight.stats()
+    assert stats["by_operation"]["describe"] == {"calls": 2, "coalesced": 2}
+    assert stats["in_flight"] == 0
+
+
+def test_cancelling_the_first_caller_does_not_restart_the_shared_call():
+    inflight = Singleflight()
+    started = []
+
+    async def call() -> str:
+        started.append(1)
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run() -> None:
+        leader = asyncio.ensure_future(inflight.do("op", "k", call))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(inflight.do("op", "k", call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await waiter == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    asyncio.run(run())
+    assert len(started) == 1
+    assert len(inflight) == 0
+
+
+def test_the_shared_call_is_cancelled_once_every_caller_has_gone():
+    inflight = Singleflight()
+    cancelled = []
+
+    async def call() -> str:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return "done"
+
+    async def run() -> None:
+        callers = [asyncio.ensure_future(inflight.do("op", "k", call)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert cancelled == [1] and len(inflight) == 0
+
+    asyncio.run(run())
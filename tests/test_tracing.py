@@ -0,0 +1,44 @@
+from __future__ import annotations
+import asyncio
+import json
+from pathlib import Path
+from sfmcp import tracing
+from sfmcp.client_registry import ClientRegistry
+from sfmcp.profiling import ToolProfiler
+from sfmcp.tools import query
+from sfmcp.tracing import TracedFastMCP
+from sfmcp.transport.fake import FakeSalesforceOrg
+
+
+def test_tool_calls_are_traced_and_profiled(
+    tmp_path: Path, org: FakeSalesforceOrg, clients: ClientRegistry
+):
+    org.add_sobject("Account", records=[{"Id": "001"}, {"Id": "002"}])
+    clients.profiler = ToolProfiler(tools=["query"], interval=0.001, directory=str(tmp_path))
+    mcp = TracedFastMCP("test")
+    query.register(mcp, clients)
+
+    trace_file = tmp_path / "trace.jsonl"
+    tracing.configure(str(trace_file))
+    try:
+        asyncio.run(
+            mcp.call_tool("salesforce_query", {"args": {"soql": "SELECT Id FROM Account"}})
+        )
+    finally:
+        tracing.configure(None)
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    by_name = {span["name"]: span for span in spans}
+    assert {"mcp.call_tool", "tool", "client.query", "salesforce.request", "mcp.serialize"} <= set(
+        by_name
+    )
+    assert len({span["trace_id"] for span in spans}) == 1
+    root = by_name["mcp.call_tool"]
+    assert root["parent_id"] is None
+    assert by_name["tool"]["parent_id"] == root["span_id"]
+    assert by_name["mcp.serialize"]["parent_id"] == root["span_id"]
+    assert by_name["salesforce.request"]["attributes"]["bytes_received"] > 0
+
+    [profile] = tmp_path.glob("query-*.folded")
+    assert by_name["tool"]["attributes"]["profile"] == str(profile)
+    assert clients.profiler.profiles == 1